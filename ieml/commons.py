@@ -1,8 +1,11 @@
+import copy
 import functools
 import glob
+import importlib
 import logging
 import os
 import pickle
+import threading
 from collections import OrderedDict
 from enum import Enum
 from itertools import chain
@@ -11,7 +14,10 @@ from typing import List
 import hashlib
 from time import time
 
+import ply.yacc as yacc
+
 from ieml import logger
+from ieml.constants import CACHE_VERSIONS_FOLDER, CACHE_VERSIONS_MAX_BYTES
 
 
 class cached_property:
@@ -33,6 +39,8 @@ class LastUpdatedOrderedDict(OrderedDict):
 
 
 class TreeStructure:
+    __slots__ = ('_str', '_paths', 'children')
+
     def __init__(self, *args, **kwargs):
         self._str = None
         self._paths = None
@@ -65,6 +73,24 @@ class TreeStructure:
             yield from c.tree_iter()
 
 
+def file_stat(path):
+    """
+    :return: the (size, mtime_ns, inode) of the file at path, used as a cheap fingerprint of its content
+    """
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def stat_fingerprint(folder, pattern):
+    """
+    :return: the md5 of the relative paths and the stats of the files of folder that match the glob pattern
+    """
+    res = hashlib.md5()
+    for file in sorted(glob.glob(os.path.join(folder, pattern), recursive=True)):
+        res.update("{}:{}:{}:{};".format(os.path.relpath(file, folder), *file_stat(file)).encode('utf8'))
+    return res.hexdigest()
+
+
 def fullname(cls):
     return cls.__module__ + '.' + cls.__qualname__
 
@@ -84,20 +110,111 @@ class Singleton(type):
         return cls._instances[cls]
 
 
+class ThreadLocalParser(threading.local):
+    def __init__(self, lexer, parser):
+        """
+        Per thread copies of a ply lexer and parser. The ply objects keep the state of the current parse, the
+        copies only duplicate that state and share the LR tables and the lexer regexes of the originals, so the
+        threads parse concurrently without a lock. The copies of a thread are made at its first access.
+
+        :param lexer: the ply lexer
+        :param parser: the ply LRParser
+        """
+        self.lexer = lexer.clone()
+        self.parser = copy.copy(parser)
+
+
+class LazyPlyParser:
+    def __init__(self, build):
+        """
+        The ply lexer and parser of a parser object, built at the first parse and not at the construction of the
+        object, and their per thread copies.
+
+        :param build: a function that returns the ply (lexer, parser), called once
+        """
+        self._build = build
+        self._lock = threading.Lock()
+        self._local = None
+
+    @property
+    def local(self) -> ThreadLocalParser:
+        if self._local is None:
+            with self._lock:
+                if self._local is None:
+                    self._local = ThreadLocalParser(*self._build())
+        return self._local
+
+
+def build_ply_parser(module, start, tabmodule, write_tables=False):
+    """
+    Build the ply LR parser of the grammar of module from the parse tables of the python module tabmodule. The
+    table modules are generated by scripts/build_parser_tables.py and shipped in the package. If the tables are
+    missing or do not match the grammar, they are generated in memory and only written if write_tables is set.
+
+    :param module: the object with the grammar rules
+    :param start: the start symbol
+    :param tabmodule: the full name of the table module
+    :param write_tables: write the generated tables to tabmodule
+    :return: the ply LRParser
+    """
+    package = importlib.import_module(tabmodule.rsplit('.', 1)[0])
+    parser = yacc.yacc(module=module, errorlog=logging, start=start, debug=False, optimize=False,
+                       tabmodule=tabmodule, write_tables=write_tables, outputdir=os.path.dirname(package.__file__))
+    # ply keeps the last built parser in a module global, that would keep module (and its dictionary) alive
+    yacc.parse = None
+    return parser
+
+
+def ply_tables_up_to_date(module, start, tabmodule) -> bool:
+    """
+    :return: True if the parse tables of the python module tabmodule match the grammar of module
+    """
+    pdict = {k: getattr(module, k) for k in dir(module)}
+    pdict['start'] = start
+    pinfo = yacc.ParserReflect(pdict, log=yacc.NullLogger())
+    pinfo.get_all()
+    try:
+        return yacc.LRTable().read_table(tabmodule) == pinfo.signature()
+    except (ImportError, yacc.VersionError):
+        return False
+
+
+def _md5_file(path):
+    h = hashlib.md5()
+    with open(path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(1 << 16), b''):
+            h.update(chunk)
+    return h.digest()
+
+
 class FolderWatcherCache:
-    def __init__(self, db_path: str, pattern: str, cache_folder: str, name: str):
+    # fingerprint modes
+    STAT = 'stat'
+    CONTENT = 'content'
+
+    def __init__(self, db_path: str, pattern: str, cache_folder: str, name: str, mode: str = STAT):
         """
         Cache that check if `folder` content has changed. Compute a hash of the files in the folder and
         get pruned if the content of this folder change.
 
+        In 'stat' mode, the digest of each file is kept in a manifest with the (size, mtime_ns, inode) of
+        the file, a file is only read and hashed again if its stat changed. In 'content' mode, all the files
+        are hashed.
+
         :param folder: the folder to watch
         :param cache_folder: the folder to put the cache file
+        :param mode: the fingerprint mode, 'stat' or 'content'
         """
+        if mode not in (self.STAT, self.CONTENT):
+            raise ValueError("Invalid fingerprint mode {}".format(mode))
+
         self.db_path = db_path
         self.pattern = pattern
         self.files = sorted([os.path.abspath(ff) for ff in glob.glob(os.path.join(self.db_path, self.pattern), recursive=True)])
         self.cache_folder = os.path.abspath(cache_folder)
         self.name = name
+        self.mode = mode
+        self._cache_file = None
 
     def update(self, obj) -> None:
         """
@@ -134,14 +251,59 @@ class FolderWatcherCache:
     @property
     def cache_file(self) -> str:
         """
+        The fingerprint of the watched files is computed once per instance.
         :return: The cache file absolute path
         """
-        res = b""
+        if self._cache_file is None:
+            self._cache_file = os.path.join(self.cache_folder, ".{}-cache.{}".format(self.name, self.fingerprint()))
+
+        return self._cache_file
+
+    def fingerprint(self) -> str:
+        """
+        :return: the md5 of the relative paths and the content digests of the watched files
+        """
+        if self.mode == self.STAT:
+            digests = self._stat_digests()
+        else:
+            digests = [_md5_file(file) for file in self.files]
+
+        res = hashlib.md5()
+        for file, digest in zip(self.files, digests):
+            res.update(file[len(self.db_path)+1:].encode('utf8') + b":" + digest)
+
+        return res.hexdigest()
+
+    @property
+    def manifest_file(self) -> str:
+        return os.path.join(self.cache_folder, ".{}-manifest".format(self.name))
+
+    def _stat_digests(self) -> List[bytes]:
+        try:
+            with open(self.manifest_file, 'rb') as fp:
+                manifest = pickle.load(fp)
+        except Exception:
+            manifest = {}
+
+        new_manifest = {}
+        digests = []
         for file in self.files:
-            with open(file, 'rb') as fp:
-                res += file[len(self.db_path)+1:].encode('utf8') + b":" + fp.read()
+            st = file_stat(file)
+            if file in manifest and manifest[file][0] == st:
+                digest = manifest[file][1]
+            else:
+                digest = _md5_file(file)
+
+            new_manifest[file] = (st, digest)
+            digests.append(digest)
 
-        return os.path.join(self.cache_folder, ".{}-cache.{}".format(self.name, hashlib.md5(res).hexdigest()))
+        if new_manifest != manifest:
+            tmp = self.manifest_file + '.tmp'
+            with open(tmp, 'wb') as fp:
+                pickle.dump(new_manifest, fp, protocol=4)
+            os.replace(tmp, self.manifest_file)
+
+        return digests
 
     def _cache_candidates(self) -> List[str]:
         """
@@ -151,6 +313,83 @@ class FolderWatcherCache:
         return [os.path.join(self.cache_folder, n) for n in os.listdir(self.cache_folder)
                 if n.startswith('.{}-cache.'.format(self.name))]
 
+class VersionedCacheStore:
+    def __init__(self, folder: str = None, max_bytes: int = None):
+        """
+        Keep several versions of the cached objects side by side, each one keyed by a name and a version id
+        (the git tree id of the watched files). When the total size of the stored versions exceeds max_bytes,
+        the least recently used ones are deleted.
+
+        :param folder: the folder of the stored versions, default to CACHE_VERSIONS_FOLDER
+        :param max_bytes: the size budget, default to CACHE_VERSIONS_MAX_BYTES
+        """
+        self.folder = folder if folder is not None else CACHE_VERSIONS_FOLDER
+        self.max_bytes = max_bytes if max_bytes is not None else CACHE_VERSIONS_MAX_BYTES
+        os.makedirs(self.folder, exist_ok=True)
+
+    def path(self, name: str, version: str) -> str:
+        return os.path.join(self.folder, "{}-{}.pickle".format(name, version))
+
+    def get(self, name: str, version: str) -> object:
+        """
+        :return: the object stored for this version, raise a KeyError if there is none
+        """
+        path = self.path(name, version)
+        try:
+            with open(path, 'rb') as fp:
+                obj = pickle.load(fp)
+        except FileNotFoundError:
+            raise KeyError((name, version))
+        except Exception as e:
+            logger.info("VersionedCacheStore: unable to read {}: {}".format(path, repr(e)))
+            raise KeyError((name, version))
+
+        # the modification time is the last use time of the version
+        os.utime(path)
+        return obj
+
+    def __contains__(self, item):
+        return os.path.isfile(self.path(*item))
+
+    def put(self, name: str, version: str, obj: object) -> None:
+        path = self.path(name, version)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as fp:
+            pickle.dump(obj, fp, protocol=4)
+        os.replace(tmp, path)
+
+        self.evict(keep=path)
+
+    def evict(self, keep: str = None) -> None:
+        """
+        Delete the least recently used versions until the total size is under the budget.
+        :param keep: a path that is never deleted
+        """
+        files = []
+        for n in os.listdir(self.folder):
+            if not n.endswith('.pickle'):
+                continue
+            path = os.path.join(self.folder, n)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime_ns, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
 def monitor_decorator(name):
     def decorator(f):
         def wrapper(*args, **kwargs):
@@ -166,7 +405,14 @@ def monitor_decorator(name):
     return decorator
 
 
-def cache_results_watch_files(path, name):
+def cache_results_watch_files(path, name, subtree=None):
+    """
+    :param path: the glob pattern of the watched files
+    :param name: the name of the cache
+    :param subtree: the folder of the watched files in the git repository. If set and the instance has a
+    `tree_version` method that returns the git tree id of the subtree, the result is also stored in its
+    `cache_versions` VersionedCacheStore, and reused when this tree is checked out again.
+    """
     def decorator(f):
         def wrapper(*args, **kwargs):
             use_cache = args[0].use_cache
@@ -174,6 +420,15 @@ def cache_results_watch_files(path, name):
             cache_folder = self.cache_folder
             db_path = self.folder
 
+            version = None
+            if use_cache and subtree is not None and hasattr(self, 'tree_version'):
+                version = self.tree_version(subtree)
+                if version is not None:
+                    try:
+                        return self.cache_versions.get(name, version)
+                    except KeyError:
+                        pass
+
             if use_cache:
                 cache = FolderWatcherCache(db_path, path, cache_folder=cache_folder, name=name)
                 if not cache.is_pruned():
@@ -194,11 +449,13 @@ def cache_results_watch_files(path, name):
             instance = f(*args, **kwargs)
 
             if use_cache and cache_folder:
-                cache = FolderWatcherCache(db_path, path, cache_folder=cache_folder, name=name)
-
+                # the fingerprint computed before the call is reused
                 logger.info("read_{}.cache: Updating cache at {}".format(name, cache.cache_file))
                 cache.update(instance)
 
+            if version is not None:
+                self.cache_versions.put(name, version, instance)
+
             return instance
 
         functools.wraps(wrapper)
@@ -208,23 +465,71 @@ def cache_results_watch_files(path, name):
     return decorator
 
 
+class FreezableComponent:
+    __slots__ = ()
+
+    # the attributes computed at their first access, they can still be set once the component is frozen
+    LAZY_ATTRIBUTES = frozenset()
+
+    def __setattr__(self, name, value):
+        if '_frozen' in self.__dict__ and name not in self.LAZY_ATTRIBUTES:
+            raise AttributeError("Can't set the attribute {} of the frozen {}".format(name, self.__class__.__name__))
+        object.__setattr__(self, name, value)
+
+    def freeze(self):
+        """
+        Make the component and its sub components read-only, setting one of their attributes then raises an
+        AttributeError. The usls shared by the parse cache are frozen.
+
+        :return: the component
+        """
+        if '_frozen' not in self.__dict__:
+            # set first, the components can reference each other
+            object.__setattr__(self, '_frozen', True)
+            for value in list(self.__dict__.values()):
+                for component in _freezable_components(value):
+                    component.freeze()
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        return '_frozen' in self.__dict__
+
+
+def _freezable_components(value):
+    if isinstance(value, FreezableComponent):
+        yield value
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _freezable_components(item)
+    elif isinstance(value, dict):
+        for item in value.items():
+            yield from _freezable_components(item)
+
+
 class DecoratedComponent:
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
-        self._literal = None
+    # the literals are kept by the literal context of the thread that set them and not on the components, that
+    # can be shared between the usls parsed by several threads (the Script objects are cached).
 
     def clear_literal(self):
-        self._literal = None
+        from ieml.usl.decoration.instance import literal_context
+
+        literal_context().literals.pop(id(self), None)
 
     def set_literal(self, value):
         from ieml.usl.decoration.instance import literal_context
 
-        literal_context().push(self)
-        self._literal = value
+        context = literal_context()
+        context.push(self)
+        context.literals[id(self)] = (self, value)
 
     def get_literal(self):
-        return self._literal
+        from ieml.usl.decoration.instance import literal_context
+
+        entry = literal_context().literals.get(id(self))
+        return entry[1] if entry is not None else None
 
 class OrderedEnum(Enum):
     def __ge__(self, other):
@@ -15,10 +15,10 @@ IEMLDB_DEFAULT_GIT_ADDRESS='https://github.com/IEMLdev/ieml-language.git'
 
 VERSIONS_FOLDER = os.path.join(user_data_dir(appname='ieml', appauthor=False, version=LIBRARY_VERSION), 'dictionary_versions')
 CACHE_VERSIONS_FOLDER = os.path.join(user_cache_dir(appname='ieml', appauthor=False, version=LIBRARY_VERSION), 'cached_dictionary_versions')
-PARSER_FOLDER = os.path.join(user_cache_dir(appname='ieml', appauthor=False, version=LIBRARY_VERSION), 'parsers')
+# maximum total size of the cached versions in CACHE_VERSIONS_FOLDER
+CACHE_VERSIONS_MAX_BYTES = 1 << 30
 
 os.makedirs(VERSIONS_FOLDER, exist_ok=True)
-os.makedirs(PARSER_FOLDER, exist_ok=True)
 os.makedirs(CACHE_VERSIONS_FOLDER, exist_ok=True)
 
 
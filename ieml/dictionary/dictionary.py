@@ -1,70 +1,141 @@
+import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from operator import attrgetter
+from time import time
 
 from tqdm import tqdm
 
 from ieml.dictionary.relation.relations import RelationsGraph
 from ieml.dictionary.script import script
+from ieml.dictionary.singular_sequences import SingularSequenceIndex
 import numpy as np
 
 from ieml.dictionary.table.table_structure import TableStructure
 
+# the minimal number of paradigms to load them in a process pool
+LOAD_PARALLEL_MIN_SIZE = 500
 
-class Dictionary:
-    def __init__(self, paradigms, structure):
-        scripts = {s: script(s, factorize=False) for s in tqdm(paradigms, "Loading dictionary")}
 
-        root_paradigms = []
-        inhibitions = defaultdict(list)
-        ignored = []
-        for (p, key), (value,) in structure.df.iterrows():
-            if p not in scripts:
-                # print(p)
-                continue
-            p = scripts[p]
-
-            for ss in p.singular_sequences:
-                scripts[str(ss)] = ss
+def _expand_chunk(paradigms):
+    res = []
+    for s in paradigms:
+        p = script(s, factorize=False)
+        # computed in the worker, sent with the script
+        p.singular_sequences
+        res.append(p)
+    return res
 
 
-            if key == 'inhibition':
-                inhibitions[p].append(value)
-            elif key == 'is_root' and value[0].lower() == 't':
-                root_paradigms.append(p)
-            elif key == 'is_ignored' and value[0].lower() == 't':
-                ignored.append(p)
+class Dictionary:
+    def __init__(self, paradigms, structure, previous: 'Dictionary' = None, bitsets=True, workers=1):
+        """
+        :param paradigms: the paradigms of the dictionary
+        :param structure: the Structure of the database
+        :param previous: if set, a previously loaded version of the dictionary. The tables and the relations
+        internal to the root paradigms whose paradigms and inhibitions did not change are reused from it.
+        :param bitsets: if set, the singular sequences of the root paradigms are numbered in a
+        SingularSequenceIndex (self.singular_sequence_index), used for the containment tests, the root
+        assignment and the relations instead of the sets of singular sequences of the scripts.
+
+        :param workers: the number of processes, None for the number of cpus. If greater than 1 and if there are
+        enough paradigms, the paradigms are parsed with their singular sequences and the tables of the root paradigms
+        are defined in process pools. The relations are computed in the current process.
+
+        The duration of each stage of the construction (parse, structure, singular_sequences, ignored, tables
+        and relations) is stored in self.timings.
+        """
+        # duration in seconds of each stage of the construction
+        self.timings = {}
+        before = time()
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        paradigms = list(paradigms)
+        if len(paradigms) < LOAD_PARALLEL_MIN_SIZE:
+            workers = 1
+
+        if workers > 1:
+            chunk_size = -(-len(paradigms) // (workers * 4))
+            chunks = [paradigms[i:i + chunk_size] for i in range(0, len(paradigms), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                scripts = dict(zip(paradigms, chain.from_iterable(executor.map(_expand_chunk, chunks))))
+        else:
+            scripts = {s: script(s, factorize=False) for s in tqdm(paradigms, "Loading dictionary")}
+        self._timing('parse', before)
+
+        # the structure rows of the paradigms, grouped per paradigm
+        before = time()
+        df = structure.df.reset_index()
+        df = df[df['ieml'].isin(scripts.keys())]
+        flag = df['value'].str[:1].str.lower() == 't'
+
+        root_paradigms = [scripts[p] for p in df.loc[(df['key'] == 'is_root') & flag, 'ieml'].drop_duplicates()]
+        ignored = {scripts[p] for p in df.loc[(df['key'] == 'is_ignored') & flag, 'ieml']}
+        inhibitions = defaultdict(list)
+        for p, values in df[df['key'] == 'inhibition'].groupby('ieml', sort=False)['value']:
+            inhibitions[scripts[p]] = values.to_list()
+        self._timing('structure', before)
+
+        # the singular sequences of the paradigms of the structure, expanded once per paradigm
+        before = time()
+        for p in df['ieml'].unique():
+            for ss in scripts[p].singular_sequences:
+                scripts[str(ss)] = ss
+        self._timing('singular_sequences', before)
 
         # ignore all scripts that are not in a root paradigm
-        singular_sequences = set()
-        for r in root_paradigms:
-            if any(ss in singular_sequences for ss in r.singular_sequences):
-                raise ValueError("Root paradigms overlap with {}".format(str(r)))
-            singular_sequences |= r.singular_sequences_set
-
-        for s in scripts.values():
-            if not s.singular_sequences_set.issubset(singular_sequences):
-                ignored.append(s)
-
+        before = time()
+        if bitsets:
+            self.singular_sequence_index = SingularSequenceIndex(root_paradigms)
+            # singular sequence -> number in the root paradigms
+            covered = self.singular_sequence_index.numbers
+        else:
+            self.singular_sequence_index = None
+            # singular sequence -> root paradigm
+            covered = {}
+            for r in root_paradigms:
+                for ss in r.singular_sequences:
+                    if ss in covered:
+                        raise ValueError("Root paradigms overlap with {}".format(str(r)))
+                    covered[ss] = r
+
+        ignored.update(s for s in scripts.values() if not all(ss in covered for ss in s.singular_sequences))
         for s in ignored:
-            del scripts[str(s)]
-            if s in root_paradigms:
-                root_paradigms.remove(s)
-            if s in inhibitions:
-                del inhibitions[s]
+            scripts.pop(str(s), None)
+            inhibitions.pop(s, None)
+        root_paradigms = [r for r in root_paradigms if r not in ignored]
+        self._timing('ignored', before)
 
         # map of root paradigm script -> inhibitions list values
         self._inhibitions = inhibitions
 
-        self.scripts = np.array(sorted(scripts.values()))
-
-        self.tables = TableStructure(self.scripts, root_paradigms)
+        before = time()
+        scripts = sorted(scripts.values(), key=attrgetter('sort_key'))
+        self.tables = TableStructure(scripts, root_paradigms,
+                                     previous=previous.tables if previous is not None else None,
+                                     index=self.singular_sequence_index, workers=workers)
+        self._timing('tables', before)
 
-        self.scripts = np.array([s for s in self.scripts if len(s) == 1 or s in self.tables.tables])
+        before = time()
+        self.scripts = np.array([s for s in scripts if len(s) == 1 or s in self.tables.tables])
         self.index = {e: i for i, e in enumerate(self.scripts)}
 
         self.roots_idx = np.zeros((len(self.scripts),), dtype=int)
         self.roots_idx[[self.index[r] for r in root_paradigms]] = 1
 
-        self.relations = RelationsGraph(dictionary=self)
+        # the roots whose tables and relations are taken from previous
+        reused = set()
+        if previous is not None:
+            reused = {r for r in self.tables.reused
+                      if sorted(inhibitions.get(r, [])) == sorted(previous._inhibitions.get(r, []))}
+
+        self.relations = RelationsGraph(dictionary=self, previous=previous, reused=reused)
+        self._timing('relations', before)
+
+    def _timing(self, stage, before):
+        self.timings[stage] = time() - before
 
     # def __new__(cls, *args, **kwargs):
     #     """
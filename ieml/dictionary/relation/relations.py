@@ -10,12 +10,22 @@ from scipy.sparse.dok import dok_matrix
 from ieml.constants import RELATIONS
 from ieml.dictionary.script.script import MultiplicativeScript, AdditiveScript, NullScript
 
+# relations between the scripts of a same root paradigm, they can be reused from a previous version of the root
+INTRA_ROOT_RELATIONS = ['contains', 'opposed', 'associated', 'crossed', 'twin'] + ['table_%d'%i for i in range(6)]
+
+
 class RelationsGraph:
-    def __init__(self, dictionary):
+    def __init__(self, dictionary, previous=None, reused=()):
+        """
+        :param dictionary: the dictionary
+        :param previous: if set, a previous version of the dictionary
+        :param reused: the roots of dictionary whose intra-root relations are copied from previous instead of
+        being computed. The father relations span the roots and are always computed.
+        """
         super().__init__()
 
         # dictionary = dictionary
-        self.relations = self._compute_relations(dictionary)
+        self.relations = self._compute_relations(dictionary, previous=previous, reused=reused)
 
         self.matrix = np.matrix(sum(self.relations.values()).todense())
 
@@ -58,7 +68,27 @@ class RelationsGraph:
         return np.matrix(self.matrix, dtype=bool)
 
     @staticmethod
-    def _compute_relations(dictionary):
+    def _reused_relations(dictionary, previous, reused):
+        """
+        :return: map relation -> coo matrix of the previous intra-root relations of the reused roots, with the
+        indexes of dictionary.
+        """
+        old_to_new = np.full(len(previous), -1, dtype=int)
+        for root in reused:
+            for t in previous.tables.roots[root]:
+                old_to_new[previous.index[t.script]] = dictionary.index.get(t.script, -1)
+
+        shape = [len(dictionary)] * 2
+        res = {}
+        for reltype in INTRA_ROOT_RELATIONS:
+            m = previous.relations.relations[reltype].tocoo()
+            i, j = old_to_new[m.row], old_to_new[m.col]
+            keep = (i != -1) & (j != -1)
+            res[reltype] = coo_matrix((np.ones(keep.sum(), dtype=bool), (i[keep], j[keep])), shape=shape)
+        return res
+
+    @staticmethod
+    def _compute_relations(dictionary, previous=None, reused=()):
         # print("Computing relations", file=sys.stderr)
         # logger.log(logging.DEBUG, "Computing tables relations")
         # logger.log(logging.DEBUG, "Computing contains/contained relations")
@@ -66,8 +96,16 @@ class RelationsGraph:
         # print("Computing siblings relations", sys.stderr)
 
         relations = {}
-        contains = RelationsGraph._compute_contains(dictionary)
-        relations['contains'] = csr_matrix(contains)
+        roots = [r for r in dictionary.tables.roots if r not in reused]
+        previous_relations = RelationsGraph._reused_relations(dictionary, previous, reused) if reused else {}
+
+        def _with_reused(reltype, m):
+            if reltype in previous_relations:
+                return m + previous_relations[reltype]
+            return m
+
+        contains = RelationsGraph._compute_contains(dictionary, roots)
+        relations['contains'] = csr_matrix(_with_reused('contains', contains))
         relations['contained'] = csr_matrix(relations['contains'].transpose())
 
         father = RelationsGraph._compute_father(dictionary)
@@ -75,11 +113,9 @@ class RelationsGraph:
         for i, r in enumerate(['_substance', '_attribute', '_mode']):
             relations['father' + r] = dok_matrix(father[i])
 
-        siblings = RelationsGraph._compute_siblings(dictionary)
-        relations['opposed'] = dok_matrix(siblings[0])
-        relations['associated'] = dok_matrix(siblings[1])
-        relations['crossed'] = dok_matrix(siblings[2])
-        relations['twin'] = dok_matrix(siblings[3])
+        siblings = RelationsGraph._compute_siblings(dictionary, roots)
+        for i, r in enumerate(['opposed', 'associated', 'crossed', 'twin']):
+            relations[r] = dok_matrix(_with_reused(r, siblings[i]))
 
         # self._do_inhibitions()
 
@@ -96,9 +132,9 @@ class RelationsGraph:
         #                           self.relations['child_mode']
         # self.relations['etymology'] = self.relations['father'] + self.relations['child']
 
-        table = RelationsGraph._compute_table_rank(dictionary, relations['contained'])
+        table = RelationsGraph._compute_table_rank(dictionary, relations['contained'], roots)
         for i in range(6):
-            relations['table_%d'%i] = table[i]
+            relations['table_%d'%i] = _with_reused('table_%d'%i, table[i])
 
         relations['identity'] = csr_matrix(np.eye(len(dictionary)))
 
@@ -109,7 +145,7 @@ class RelationsGraph:
         return {reltype: csr_matrix(relations[reltype]) for reltype in RELATIONS}
 
     @staticmethod
-    def _compute_table_rank(dictionary, contained):
+    def _compute_table_rank(dictionary, contained, roots):
 
         tables_rank = [([], []) for _ in range(6)]
 
@@ -117,7 +153,7 @@ class RelationsGraph:
             set(l) for l in np.split(contained.indices, contained.indptr)[1:-1]
         ]
 
-        for root in dictionary.tables.roots:
+        for root in roots:
 
             for t0, t1 in combinations(dictionary.tables.roots[root], 2):
                 i0 = dictionary.index[t0.script]
@@ -129,7 +165,7 @@ class RelationsGraph:
                     tables_rank[rank][0].extend((i0, i1))
                     tables_rank[rank][1].extend((i1, i0))
 
-        for t in dictionary.scripts:
+        for t in (t.script for root in roots for t in dictionary.tables.roots[root]):
             idx = dictionary.index[t]
 
             try:
@@ -145,19 +181,27 @@ class RelationsGraph:
         return [coo_matrix(([True]*len(i), (i, j)), shape=shape, dtype=np.bool) for i, j in tables_rank]
 
     @staticmethod
-    def _compute_contains(dictionary):
+    def _compute_contains(dictionary, roots):
         # contain/contained
         shape = [len(dictionary)] * 2
 
         i = list(range(shape[0]))
         j = list(range(shape[1]))
 
-        for r_p, v in dictionary.tables.roots.items():
+        index = getattr(dictionary, 'singular_sequence_index', None)
+        if index is not None:
+            contains = index.contains
+        else:
+            def contains(container, s):
+                return s in container
+
+        for r_p in roots:
+            v = dictionary.tables.roots[r_p]
             paradigms = {t for t in v if t.script.paradigm}
 
             for p in paradigms:
                 _contains = [dictionary.index[ss] for ss in p.script.singular_sequences] + \
-                            [dictionary.index[k.script] for k in paradigms if k.script in p.script]
+                            [dictionary.index[k.script] for k in paradigms if contains(p.script, k.script)]
                 i.extend(repeat(dictionary.index[p.script], len(_contains)))
                 j.extend(_contains)
 
@@ -203,7 +247,7 @@ class RelationsGraph:
         return [coo_matrix(([True] * len(i), (i, j)), shape=shape, dtype=np.bool) for i, j in father]
 
     @staticmethod
-    def _compute_siblings(dictionary):
+    def _compute_siblings(dictionary, roots):
         # siblings
         # 1 dim => the sibling type
         #  -0 opposed
@@ -229,7 +273,7 @@ class RelationsGraph:
 
         siblings = [([], []) for _ in range(4)]
 
-        for root in dictionary.tables.roots:
+        for root in roots:
             _inhib_opposed = 'opposed' not in dictionary._inhibitions[root]
             _inhib_associated = 'associated' not in dictionary._inhibitions[root]
             _inhib_crossed = 'crossed' not in dictionary._inhibitions[root]
@@ -0,0 +1,127 @@
+from ieml.constants import PRIMITIVES, REMARKABLE_ADDITION
+from ieml.dictionary.script import AdditiveScript, MultiplicativeScript, NullScript
+from ieml.exceptions import InvalidScript, TooManySingularSequences
+
+# Single pass recursive descent parser of the script grammar of ScriptParser. It builds the same trees as the
+# ply parser, but does not report errors: it returns None for any input it does not handle, and ScriptParser
+# parses it again with ply to get the error or the behaviour of the ply lexer (skipped characters, etc.).
+
+_MARKS = {':': 0, '.': 1, '-': 2, "'": 3, '’': 3, ',': 4, '_': 5, ';': 6}
+_REMARKABLE_MULTIPLICATION = {'y', 'o', 'e', 'u', 'a', 'i', 'j', 'g', 's', 'b', 't', 'h', 'c', 'k', 'm', 'n', 'p',
+                              'x', 'd', 'f', 'l'}
+_W_MULTIPLICATION = {'o', 'a', 'u', 'e'}
+_IGNORED = ' \t\n'
+
+# token kinds
+_MARK = 0
+_CHARACTER = 1
+_MULTIPLICATION = 2
+_PLUS = 3
+
+# the scripts of the layer 0 characters and of the remarkable multiplications, shared by the parsed trees
+_leaves = {}
+
+
+class _SyntaxError(Exception):
+    pass
+
+
+def _tokenize(s):
+    tokens = []
+    i = 0
+    n = len(s)
+    while i < n:
+        c = s[i]
+        if c in _MARKS:
+            tokens.append((_MARK, _MARKS[c]))
+        elif c in PRIMITIVES or c in REMARKABLE_ADDITION:
+            tokens.append((_CHARACTER, c))
+        elif c == '+':
+            tokens.append((_PLUS, None))
+        elif c == 'w' and i + 1 < n and s[i + 1] in _W_MULTIPLICATION:
+            tokens.append((_MULTIPLICATION, s[i:i + 2]))
+            i += 1
+        elif c in _REMARKABLE_MULTIPLICATION:
+            tokens.append((_MULTIPLICATION, c))
+        elif c in _IGNORED:
+            pass
+        else:
+            raise _SyntaxError()
+        i += 1
+    return tokens
+
+
+def _leaf(kind, character):
+    key = (kind, character)
+    if key not in _leaves:
+        if kind == _MULTIPLICATION:
+            _leaves[key] = MultiplicativeScript(character=character)
+        elif character == 'E':
+            _leaves[key] = NullScript(layer=0)
+        elif character in REMARKABLE_ADDITION:
+            _leaves[key] = AdditiveScript(character=character)
+        else:
+            _leaves[key] = MultiplicativeScript(character=character)
+    return _leaves[key]
+
+
+def _additive(scripts):
+    # MultiplicativeScript unwraps the additions of a single script that is not an addition
+    if len(scripts) == 1 and not isinstance(scripts[0], AdditiveScript):
+        return scripts[0]
+    return AdditiveScript(children=scripts)
+
+
+def _script(tokens, i, layer):
+    kind, value = tokens[i]
+    if layer == 0:
+        if kind != _CHARACTER or tokens[i + 1] != (_MARK, 0):
+            raise _SyntaxError()
+        return _leaf(kind, value), i + 2
+
+    if kind == _MULTIPLICATION and layer == 1:
+        if tokens[i + 1] != (_MARK, 1):
+            raise _SyntaxError()
+        return _leaf(kind, value), i + 2
+
+    children = []
+    while True:
+        scripts, i = _sum(tokens, i, layer - 1)
+        children.append(_additive(scripts))
+        if tokens[i] == (_MARK, layer):
+            return MultiplicativeScript(*children), i + 1
+        if len(children) == 3:
+            raise _SyntaxError()
+
+
+def _sum(tokens, i, layer):
+    s, i = _script(tokens, i, layer)
+    scripts = [s]
+    while i < len(tokens) and tokens[i][0] == _PLUS:
+        s, i = _script(tokens, i + 1, layer)
+        scripts.append(s)
+    return scripts, i
+
+
+def parse(s: str):
+    """
+    :param s: the string of a script
+    :return: the Script, or None if the string is not a valid script or cannot be parsed by this parser
+    """
+    try:
+        tokens = _tokenize(s)
+        if not tokens or tokens[-1][0] != _MARK:
+            return None
+
+        scripts, i = _sum(tokens, 0, tokens[-1][1])
+        if i != len(tokens):
+            return None
+
+        if len(scripts) == 1:
+            return scripts[0]
+        return AdditiveScript(children=scripts)
+    except (_SyntaxError, IndexError):
+        return None
+    except (InvalidScript, TooManySingularSequences, ValueError, KeyError):
+        # invalid script (too many singular sequences, incompatible layers...), the error is raised by ply
+        return None
@@ -0,0 +1,86 @@
+
+# morpheme_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'termLAYER0_MARK LAYER1_MARK LAYER2_MARK LAYER3_MARK LAYER4_MARK LAYER5_MARK LAYER6_MARK PLUS PRIMITIVE REMARKABLE_ADDITION REMARKABLE_MULTIPLICATION term : script_lvl_0\n                | additive_script_lvl_0\n                | script_lvl_1\n                | additive_script_lvl_1\n                | script_lvl_2\n                | additive_script_lvl_2\n                | script_lvl_3\n                | additive_script_lvl_3\n                | script_lvl_4\n                | additive_script_lvl_4\n                | script_lvl_5\n                | additive_script_lvl_5\n                | script_lvl_6\n                | additive_script_lvl_6  script_lvl_0 : PRIMITIVE LAYER0_MARK\n                            | REMARKABLE_ADDITION LAYER0_MARK additive_script_lvl_0 : sum_lvl_0 sum_lvl_0 : script_lvl_0\n                    | script_lvl_0 PLUS sum_lvl_0 script_lvl_1 : additive_script_lvl_0 LAYER1_MARK\n                        | additive_script_lvl_0 additive_script_lvl_0 LAYER1_MARK\n                        | additive_script_lvl_0 additive_script_lvl_0 additive_script_lvl_0 LAYER1_MARK\n                        | REMARKABLE_MULTIPLICATION LAYER1_MARK sum_lvl_1 : script_lvl_1\n                    |  script_lvl_1 PLUS sum_lvl_1 additive_script_lvl_1 : sum_lvl_1 sum_lvl_2 : script_lvl_2\n                                            | script_lvl_2 PLUS sum_lvl_2sum_lvl_3 : script_lvl_3\n                                            | script_lvl_3 PLUS sum_lvl_3sum_lvl_4 : script_lvl_4\n                                            | script_lvl_4 PLUS sum_lvl_4sum_lvl_5 : script_lvl_5\n                                            | script_lvl_5 PLUS sum_lvl_5sum_lvl_6 : script_lvl_6\n                                            | script_lvl_6 PLUS sum_lvl_6additive_script_lvl_2 : sum_lvl_2 additive_script_lvl_3 : sum_lvl_3 additive_script_lvl_4 : sum_lvl_4 additive_script_lvl_5 : sum_lvl_5 additive_script_lvl_6 : sum_lvl_6 script_lvl_2 : sum_lvl_1 LAYER2_MARK\n                                    | sum_lvl_1 sum_lvl_1 LAYER2_MARK\n                                    | sum_lvl_1 sum_lvl_1 sum_lvl_1 LAYER2_MARK script_lvl_3 : sum_lvl_2 LAYER3_MARK\n                                    | sum_lvl_2 sum_lvl_2 LAYER3_MARK\n                                    | sum_lvl_2 sum_lvl_2 sum_lvl_2 LAYER3_MARK script_lvl_4 : sum_lvl_3 LAYER4_MARK\n                                    | sum_lvl_3 sum_lvl_3 LAYER4_MARK\n                                    | sum_lvl_3 sum_lvl_3 sum_lvl_3 LAYER4_MARK script_lvl_5 : sum_lvl_4 LAYER5_MARK\n                                    | sum_lvl_4 sum_lvl_4 LAYER5_MARK\n                                    | sum_lvl_4 sum_lvl_4 sum_lvl_4 LAYER5_MARK script_lvl_6 : sum_lvl_5 LAYER6_MARK\n                                    | sum_lvl_5 sum_lvl_5 LAYER6_MARK\n                                    | sum_lvl_5 sum_lvl_5 sum_lvl_5 LAYER6_MARK '
+    
+_lr_action_items = {'PRIMITIVE':([0,2,3,4,6,8,10,12,18,20,21,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,59,61,62,63,64,65,66,69,71,73,75,77,80,81,82,83,84,],[16,-18,16,-24,-27,-29,-31,-33,-17,16,16,16,16,16,16,16,-20,-18,16,16,16,16,16,16,-15,-16,-23,16,-42,-24,16,16,-45,-27,16,16,-48,-29,16,16,-51,-31,16,16,-33,16,-19,-21,-25,-28,-30,-32,-34,16,-43,-46,-49,-52,-22,-44,-47,-50,-53,]),'REMARKABLE_ADDITION':([0,2,3,4,6,8,10,12,18,20,21,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,59,61,62,63,64,65,66,69,71,73,75,77,80,81,82,83,84,],[17,-18,17,-24,-27,-29,-31,-33,-17,17,17,17,17,17,17,17,-20,-18,17,17,17,17,17,17,-15,-16,-23,17,-42,-24,17,17,-45,-27,17,17,-48,-29,17,17,-51,-31,17,17,-33,17,-19,-21,-25,-28,-30,-32,-34,17,-43,-46,-49,-52,-22,-44,-47,-50,-53,]),'REMARKABLE_MULTIPLICATION':([0,4,6,8,10,12,20,21,22,23,24,28,30,31,32,33,34,35,38,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,63,64,65,66,69,71,73,75,77,80,81,82,83,84,],[19,-24,-27,-29,-31,-33,19,19,19,19,19,-20,19,19,19,19,19,19,-23,19,-42,-24,19,-45,-27,19,19,-48,-29,19,19,-51,-31,19,19,-33,19,-21,-25,-28,-30,-32,-34,19,-43,-46,-49,-52,-22,-44,-47,-50,-53,]),'$end':([1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,20,21,22,23,24,25,28,29,36,37,38,40,41,44,45,48,49,52,53,56,57,59,61,62,63,64,65,66,67,68,71,73,75,77,79,80,81,82,83,84,85,],[0,-1,-2,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-17,-26,-37,-38,-39,-40,-41,-20,-18,-15,-16,-23,-42,-24,-45,-27,-48,-29,-51,-31,-54,-33,-19,-21,-25,-28,-30,-32,-34,-35,-36,-43,-46,-49,-52,-55,-22,-44,-47,-50,-53,-56,]),'LAYER1_MARK':([2,3,18,19,27,29,36,37,42,59,60,],[-18,28,-17,38,61,-18,-15,-16,28,-19,80,]),'PLUS':([2,4,6,8,10,12,14,28,29,36,37,38,40,41,44,45,48,49,52,53,56,57,61,67,71,73,75,77,79,80,81,82,83,84,85,],[26,30,31,32,33,34,35,-20,26,-15,-16,-23,-42,30,-45,31,-48,32,-51,33,-54,34,-21,35,-43,-46,-49,-52,-55,-22,-44,-47,-50,-53,-56,]),'LAYER2_MARK':([4,20,28,38,39,41,46,61,62,70,80,],[-24,40,-20,-23,71,-24,40,-21,-25,81,-22,]),'LAYER3_MARK':([6,21,40,43,45,50,63,71,72,81,],[-27,44,-42,73,-27,44,-28,-43,82,-44,]),'LAYER4_MARK':([8,22,44,47,49,54,64,73,74,82,],[-29,48,-45,75,-29,48,-30,-46,83,-47,]),'LAYER5_MARK':([10,23,48,51,53,58,65,75,76,83,],[-31,52,-48,77,-31,52,-32,-49,84,-50,]),'LAYER6_MARK':([12,24,52,55,57,66,69,77,78,84,],[-33,56,-51,79,-33,-34,56,-52,85,-53,]),'LAYER0_MARK':([16,17,],[36,37,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'term':([0,],[1,]),'script_lvl_0':([0,3,20,21,22,23,24,26,27,30,31,32,33,34,35,39,42,43,46,47,50,51,54,55,58,69,],[2,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,]),'additive_script_lvl_0':([0,3,20,21,22,23,24,27,30,31,32,33,34,35,39,42,43,46,47,50,51,54,55,58,69,],[3,27,42,42,42,42,42,60,42,42,42,42,42,42,42,27,42,42,42,42,42,42,42,42,42,]),'script_lvl_1':([0,20,21,22,23,24,30,31,32,33,34,35,39,43,46,47,50,51,54,55,58,69,],[4,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,]),'additive_script_lvl_1':([0,],[5,]),'script_lvl_2':([0,21,22,23,24,31,32,33,34,35,43,47,50,51,54,55,58,69,],[6,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'additive_script_lvl_2':([0,],[7,]),'script_lvl_3':([0,22,23,24,32,33,34,35,47,51,54,55,58,69,],[8,49,49,49,49,49,49,49,49,49,49,49,49,49,]),'additive_script_lvl_3':([0,],[9,]),'script_lvl_4':([0,23,24,33,34,35,51,55,58,69,],[10,53,53,53,53,53,53,53,53,53,]),'additive_script_lvl_4':([0,],[11,]),'script_lvl_5':([0,24,34,35,55,69,],[12,57,57,57,57,57,]),'additive_script_lvl_5':([0,],[13,]),'script_lvl_6':([0,35,],[14,67,]),'additive_script_lvl_6':([0,],[15,]),'sum_lvl_0':([0,3,20,21,22,23,24,26,27,30,31,32,33,34,35,39,42,43,46,47,50,51,54,55,58,69,],[18,18,18,18,18,18,18,59,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,]),'sum_lvl_1':([0,20,21,22,23,24,30,31,32,33,34,35,39,43,46,47,50,51,54,55,58,69,],[20,39,46,46,46,46,62,46,46,46,46,46,70,46,39,46,46,46,46,46,46,46,]),'sum_lvl_2':([0,21,22,23,24,31,32,33,34,35,43,47,50,51,54,55,58,69,],[21,43,50,50,50,63,50,50,50,50,72,50,43,50,50,50,50,50,]),'sum_lvl_3':([0,22,23,24,32,33,34,35,47,51,54,55,58,69,],[22,47,54,54,64,54,54,54,74,54,47,54,54,54,]),'sum_lvl_4':([0,23,24,33,34,35,51,55,58,69,],[23,51,58,65,58,58,76,58,51,58,]),'sum_lvl_5':([0,24,34,35,55,69,],[24,55,66,69,78,55,]),'sum_lvl_6':([0,35,],[25,68,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> term","S'",1,None,None,None),
+  ('term -> script_lvl_0','term',1,'p_term','parser.py',57),
+  ('term -> additive_script_lvl_0','term',1,'p_term','parser.py',58),
+  ('term -> script_lvl_1','term',1,'p_term','parser.py',59),
+  ('term -> additive_script_lvl_1','term',1,'p_term','parser.py',60),
+  ('term -> script_lvl_2','term',1,'p_term','parser.py',61),
+  ('term -> additive_script_lvl_2','term',1,'p_term','parser.py',62),
+  ('term -> script_lvl_3','term',1,'p_term','parser.py',63),
+  ('term -> additive_script_lvl_3','term',1,'p_term','parser.py',64),
+  ('term -> script_lvl_4','term',1,'p_term','parser.py',65),
+  ('term -> additive_script_lvl_4','term',1,'p_term','parser.py',66),
+  ('term -> script_lvl_5','term',1,'p_term','parser.py',67),
+  ('term -> additive_script_lvl_5','term',1,'p_term','parser.py',68),
+  ('term -> script_lvl_6','term',1,'p_term','parser.py',69),
+  ('term -> additive_script_lvl_6','term',1,'p_term','parser.py',70),
+  ('script_lvl_0 -> PRIMITIVE LAYER0_MARK','script_lvl_0',2,'p_script_lvl_0','parser.py',74),
+  ('script_lvl_0 -> REMARKABLE_ADDITION LAYER0_MARK','script_lvl_0',2,'p_script_lvl_0','parser.py',75),
+  ('additive_script_lvl_0 -> sum_lvl_0','additive_script_lvl_0',1,'p_additive_script_lvl_0','parser.py',85),
+  ('sum_lvl_0 -> script_lvl_0','sum_lvl_0',1,'p_sum_lvl_0','parser.py',89),
+  ('sum_lvl_0 -> script_lvl_0 PLUS sum_lvl_0','sum_lvl_0',3,'p_sum_lvl_0','parser.py',90),
+  ('script_lvl_1 -> additive_script_lvl_0 LAYER1_MARK','script_lvl_1',2,'p_script_lvl_1','parser.py',98),
+  ('script_lvl_1 -> additive_script_lvl_0 additive_script_lvl_0 LAYER1_MARK','script_lvl_1',3,'p_script_lvl_1','parser.py',99),
+  ('script_lvl_1 -> additive_script_lvl_0 additive_script_lvl_0 additive_script_lvl_0 LAYER1_MARK','script_lvl_1',4,'p_script_lvl_1','parser.py',100),
+  ('script_lvl_1 -> REMARKABLE_MULTIPLICATION LAYER1_MARK','script_lvl_1',2,'p_script_lvl_1','parser.py',101),
+  ('sum_lvl_1 -> script_lvl_1','sum_lvl_1',1,'p_sum_lvl_1','parser.py',116),
+  ('sum_lvl_1 -> script_lvl_1 PLUS sum_lvl_1','sum_lvl_1',3,'p_sum_lvl_1','parser.py',117),
+  ('additive_script_lvl_1 -> sum_lvl_1','additive_script_lvl_1',1,'p_additive_script_lvl_1','parser.py',125),
+  ('sum_lvl_2 -> script_lvl_2','sum_lvl_2',1,'p_sum_lvl_2','parser.py',131),
+  ('sum_lvl_2 -> script_lvl_2 PLUS sum_lvl_2','sum_lvl_2',3,'p_sum_lvl_2','parser.py',132),
+  ('sum_lvl_3 -> script_lvl_3','sum_lvl_3',1,'p_sum_lvl_3','parser.py',131),
+  ('sum_lvl_3 -> script_lvl_3 PLUS sum_lvl_3','sum_lvl_3',3,'p_sum_lvl_3','parser.py',132),
+  ('sum_lvl_4 -> script_lvl_4','sum_lvl_4',1,'p_sum_lvl_4','parser.py',131),
+  ('sum_lvl_4 -> script_lvl_4 PLUS sum_lvl_4','sum_lvl_4',3,'p_sum_lvl_4','parser.py',132),
+  ('sum_lvl_5 -> script_lvl_5','sum_lvl_5',1,'p_sum_lvl_5','parser.py',131),
+  ('sum_lvl_5 -> script_lvl_5 PLUS sum_lvl_5','sum_lvl_5',3,'p_sum_lvl_5','parser.py',132),
+  ('sum_lvl_6 -> script_lvl_6','sum_lvl_6',1,'p_sum_lvl_6','parser.py',131),
+  ('sum_lvl_6 -> script_lvl_6 PLUS sum_lvl_6','sum_lvl_6',3,'p_sum_lvl_6','parser.py',132),
+  ('additive_script_lvl_2 -> sum_lvl_2','additive_script_lvl_2',1,'p_additive_script_lvl_2','parser.py',138),
+  ('additive_script_lvl_3 -> sum_lvl_3','additive_script_lvl_3',1,'p_additive_script_lvl_3','parser.py',138),
+  ('additive_script_lvl_4 -> sum_lvl_4','additive_script_lvl_4',1,'p_additive_script_lvl_4','parser.py',138),
+  ('additive_script_lvl_5 -> sum_lvl_5','additive_script_lvl_5',1,'p_additive_script_lvl_5','parser.py',138),
+  ('additive_script_lvl_6 -> sum_lvl_6','additive_script_lvl_6',1,'p_additive_script_lvl_6','parser.py',138),
+  ('script_lvl_2 -> sum_lvl_1 LAYER2_MARK','script_lvl_2',2,'p_script_lvl_2','parser.py',141),
+  ('script_lvl_2 -> sum_lvl_1 sum_lvl_1 LAYER2_MARK','script_lvl_2',3,'p_script_lvl_2','parser.py',142),
+  ('script_lvl_2 -> sum_lvl_1 sum_lvl_1 sum_lvl_1 LAYER2_MARK','script_lvl_2',4,'p_script_lvl_2','parser.py',143),
+  ('script_lvl_3 -> sum_lvl_2 LAYER3_MARK','script_lvl_3',2,'p_script_lvl_3','parser.py',141),
+  ('script_lvl_3 -> sum_lvl_2 sum_lvl_2 LAYER3_MARK','script_lvl_3',3,'p_script_lvl_3','parser.py',142),
+  ('script_lvl_3 -> sum_lvl_2 sum_lvl_2 sum_lvl_2 LAYER3_MARK','script_lvl_3',4,'p_script_lvl_3','parser.py',143),
+  ('script_lvl_4 -> sum_lvl_3 LAYER4_MARK','script_lvl_4',2,'p_script_lvl_4','parser.py',141),
+  ('script_lvl_4 -> sum_lvl_3 sum_lvl_3 LAYER4_MARK','script_lvl_4',3,'p_script_lvl_4','parser.py',142),
+  ('script_lvl_4 -> sum_lvl_3 sum_lvl_3 sum_lvl_3 LAYER4_MARK','script_lvl_4',4,'p_script_lvl_4','parser.py',143),
+  ('script_lvl_5 -> sum_lvl_4 LAYER5_MARK','script_lvl_5',2,'p_script_lvl_5','parser.py',141),
+  ('script_lvl_5 -> sum_lvl_4 sum_lvl_4 LAYER5_MARK','script_lvl_5',3,'p_script_lvl_5','parser.py',142),
+  ('script_lvl_5 -> sum_lvl_4 sum_lvl_4 sum_lvl_4 LAYER5_MARK','script_lvl_5',4,'p_script_lvl_5','parser.py',143),
+  ('script_lvl_6 -> sum_lvl_5 LAYER6_MARK','script_lvl_6',2,'p_script_lvl_6','parser.py',141),
+  ('script_lvl_6 -> sum_lvl_5 sum_lvl_5 LAYER6_MARK','script_lvl_6',3,'p_script_lvl_6','parser.py',142),
+  ('script_lvl_6 -> sum_lvl_5 sum_lvl_5 sum_lvl_5 LAYER6_MARK','script_lvl_6',4,'p_script_lvl_6','parser.py',143),
+]
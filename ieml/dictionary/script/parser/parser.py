@@ -1,41 +1,48 @@
-import logging
 import types
 from functools import lru_cache
-import os
-import ply.yacc as yacc
 
 from ieml.exceptions import InvalidScript, CannotParse
 from ieml.dictionary.script import AdditiveScript, MultiplicativeScript, NullScript
-from ieml.constants import REMARKABLE_ADDITION, PARSER_FOLDER
-from ieml.commons import Singleton
+from ieml.constants import REMARKABLE_ADDITION
+from ieml.commons import Singleton, LazyPlyParser, build_ply_parser
 from ieml.dictionary.script.parser.lexer import get_script_lexer, tokens
+from ieml.dictionary.script.parser import fast_parser
 
-import threading
+
+# the module of the parse tables, generated by scripts/build_parser_tables.py
+TABLES_MODULE = 'ieml.dictionary.script.parser.morpheme_parsetab'
 
 
 class ScriptParser(metaclass=Singleton):
     tokens = tokens
 
-    # ply have an internal state , then we forbid two thread try to parse a string simultaneously
-    lock = threading.Lock()
-
     def __init__(self):
         self.t_add_rules()
 
-        self.lexer = get_script_lexer()
-        self.parser = yacc.yacc(module=self, errorlog=logging, start='term',
-                                debug=False, optimize=True,
-                                picklefile=os.path.join(PARSER_FOLDER, "morpheme_parser.pickle"))
-        # rename the parsing method (can't name it directly parse with lru_cache due to ply checking)
-        self.parse = self.t_parse
+        # the ply lexer and parser are only built if a script is not handled by the fast parser. ply have an
+        # internal state, each thread parses with its own copy of the lexer and the parser
+        self._ply = LazyPlyParser(lambda: (get_script_lexer(), build_ply_parser(self, 'term', TABLES_MODULE)))
+        # cache of the parsed scripts. It is not an lru_cache decorated method, that ply rejects when it checks
+        # the methods of the grammar
+        self.parse = lru_cache(maxsize=10000)(self.t_parse)
 
-    @lru_cache(maxsize=10000)
     def t_parse(self, s):
-        with self.lock:
-            try:
-                return self.parser.parse(s, lexer=self.lexer)
-            except InvalidScript as e:
-                raise CannotParse(s, str(e))
+        res = fast_parser.parse(s)
+        if res is not None:
+            return res
+
+        # invalid or unusual script, ply reports the error
+        return self.ply_parse(s)
+
+    def ply_parse(self, s):
+        """
+        Parse s with the ply parser, without the cache and the fast parser.
+        """
+        local = self._ply.local
+        try:
+            return local.parser.parse(s, lexer=local.lexer)
+        except InvalidScript as e:
+            raise CannotParse(s, str(e))
 
     def p_error(self, p):
         if p:
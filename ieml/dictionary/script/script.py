@@ -1,4 +1,10 @@
+import io
 import itertools
+import pickle
+import threading
+import weakref
+from operator import attrgetter
+
 import numpy as np
 
 from ieml.exceptions import InvalidScriptCharacter, InvalidScript, IncompatiblesScriptsLayers, TooManySingularSequences
@@ -9,11 +15,97 @@ from ieml.constants import MAX_LAYER, MAX_SINGULAR_SEQUENCES, MAX_SIZE_HEADER, L
 from itertools import chain
 
 
-
-class Script(TreeStructure, DecoratedComponent):
+# the scripts alive by (class, string), all the equal scripts are the same object
+_interned = weakref.WeakValueDictionary()
+# the scripts alive by the arguments of their constructor, a known script is not built again
+_by_arguments = weakref.WeakValueDictionary()
+_intern_lock = threading.Lock()
+
+
+class InternedScriptType(type):
+    """
+    Metaclass of the scripts, that hash-conses them: the construction of a script returns the script already
+    alive with the same class and string if there is one.
+    """
+    def __call__(cls, *args, **kwargs):
+        key = cls._arguments_key(*args, **kwargs)
+        if key is not None:
+            s = _by_arguments.get(key)
+            if s is not None:
+                return s
+
+        s = super().__call__(*args, **kwargs)
+        with _intern_lock:
+            s = _interned.setdefault((cls, s._str), s)
+            if key is not None:
+                _by_arguments[key] = s
+        return s
+
+
+def _unpickle_script(cls, string):
+    # the interned script, or an empty script that is interned by __setstate__ once its state is set
+    s = _interned.get((cls, string))
+    if s is None:
+        s = object.__new__(cls)
+        s._str = string
+    return s
+
+
+class _ReferencesPickler(pickle.Pickler):
+    def __init__(self, file, known):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.known = known
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Script) and (self.known is None or obj in self.known):
+            return obj.__class__, obj._str
+        return None
+
+
+class _ReferencesUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        cls, string = pid
+        s = _interned.get((cls, string))
+        if s is None:
+            from ieml.dictionary.script.parser import ScriptParser
+            s = ScriptParser().parse(string)
+        return s
+
+
+def dumps_references(obj, known=None):
+    """
+    Pickle obj with the scripts as references: only their class and string are written, and they are resolved to
+    the interned scripts of the process that loads them with loads_references, parsed if they are not alive.
+
+    :param obj: the object to pickle
+    :param known: the scripts pickled as references, all the scripts if None. The other scripts are pickled with
+    their state.
+    :return: the pickle bytes
+    """
+    file = io.BytesIO()
+    _ReferencesPickler(file, known).dump(obj)
+    return file.getvalue()
+
+
+def loads_references(data):
+    """
+    :param data: bytes produced by dumps_references
+    :return: the unpickled object
+    """
+    return _ReferencesUnpickler(io.BytesIO(data)).load()
+
+
+class Script(TreeStructure, DecoratedComponent, metaclass=InternedScriptType):
     """ A parser is defined by a character (PRIMITIVES, REMARKABLE_ADDITION OR REMARKABLE_MULTIPLICATION)
      or a list of parser children. All the element in the children list must be an AdditiveScript or
-     a MultiplicativeScript."""
+     a MultiplicativeScript.
+
+     The scripts are interned: the equal scripts are the same object (except for a script unpickled while
+     the same script is built in another thread), they must not be modified after their construction."""
+    __slots__ = ('character', 'layer', 'is_paradigm', 'paradigm', 'empty', 'cardinal',
+                 '_singular_sequences', '_singular_sequences_set', '_tables', '_cells', '_tables_script', '_headers',
+                 'canonical', 'sort_key', 'script_class', 'grammatical_class', '__weakref__')
+
     def __init__(self, children=None, character=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -32,6 +124,7 @@ class Script(TreeStructure, DecoratedComponent):
 
         # If the script is a paradigm
         self.is_paradigm = None
+        self.paradigm = None
 
         # If the script is the empty script
         self.empty = None
@@ -51,26 +144,40 @@ class Script(TreeStructure, DecoratedComponent):
 
         # The canonical string to compare same layer and cardinal parser (__lt__)
         self.canonical = None
+        # The key of the order of the scripts (__lt__)
+        self.sort_key = None
 
         # class of the parser, one of the following : VERB (1), AUXILIARY (0), and NOUN (2)
         self.script_class = None
         self.grammatical_class = None
 
-    def __new__(cls, *args, **kwargs):
+    @classmethod
+    def _arguments_key(cls, *args, **kwargs):
         """
-        Need this to pickle scripts, the pickler use __hash__ method before unpickling the
-        object attribute. Then need to pass the _str.
+        :return: a hashable key of the arguments of the constructor, None if the script can't be looked up by them
         """
-        instance = super(Script, cls).__new__(cls)
-        if 'str' in kwargs:
-            instance._str = kwargs['str']
+        return None
+
+    def __reduce__(self):
+        # the unpickled scripts are interned, the state is only set on a script that was not already alive
+        return _unpickle_script, (self.__class__, self._str), self.__getstate__()
+
+    def __getstate__(self):
+        # the values of _STATE_SLOTS, in order
+        return tuple(getattr(self, name) for name in _STATE_SLOTS)
+
+    def __setstate__(self, state):
+        if getattr(self, 'layer', None) is not None:
+            # alive and initialized, its attributes and lazy caches are kept
+            return
 
-        return instance
+        for name, value in zip(_STATE_SLOTS, state):
+            setattr(self, name, value)
 
-    def __getnewargs_ex__(self):
-        return ((), {
-            'str': str(self)
-        })
+        # published only once initialized. If the same script was built meanwhile, this one stays a distinct
+        # but equal object.
+        with _intern_lock:
+            _interned.setdefault((self.__class__, self._str), self)
 
     def __add__(self, other):
         if not isinstance(other, Script):
@@ -79,10 +186,13 @@ class Script(TreeStructure, DecoratedComponent):
         return AdditiveScript(children=[self, other])
 
     def __eq__(self, other):
+        if self is other:
+            return True
+
         if isinstance(other, Script):
             return self._str == other._str
-        else:
-            return super().__eq__(other)
+
+        return super().__eq__(other)
 
     def __hash__(self):
         """Since the IEML string for a script is its definition, it can be used as a hash"""
@@ -92,63 +202,28 @@ class Script(TreeStructure, DecoratedComponent):
         if not isinstance(self, Script) or not isinstance(other, Script):
             return NotImplemented
 
-        if self == other:
-            return False
+        return self.sort_key < other.sort_key
 
-        if self.layer != other.layer:
-            # order by layer
-            return self.layer < other.layer
-        else:
-            # Cardinal of 1 the minimum, null_script is minimum
-            if isinstance(self, NullScript):
-                return True
-
-            if isinstance(other, NullScript):
-                return False
+    def _compute_sort_key(self):
+        """
+        The order of the scripts as a tuple, compared in C by sorted(..., key=attrgetter('sort_key')): by layer,
+        the null script first, then by cardinal and canonical form. The layer 0 scripts are then compared by the
+        value of their character (the sum for an addition), the other ones put the multiplications first and
+        compare the children in order.
+        """
+        if isinstance(self, NullScript):
+            return self.layer, 0
 
-            if self.cardinal != other.cardinal:
-                # then by number of singular sequence
-                return self.cardinal < other.cardinal
+        if self.layer == 0:
+            if isinstance(self, AdditiveScript):
+                value = sum(character_value[c.character] for c in self.children)
             else:
-                # Compare the canonical form
-                if self.canonical != other.canonical:
-                    return self.canonical < other.canonical
-                elif self.layer != 0:
-                    # layer != 0 => children is set, no children are for layer 0 (MultiplicativeScript)
-                    if isinstance(self, other.__class__):
-                        # if they are the same class
-                        # Compare the children in alphabetical order
-                        iterator = iter(other.children)
-                        for s in self.children:
-                            try:
-                                o = iterator.__next__()
-                                if o != s:
-                                    return s < o
-                            except StopIteration:
-                                return False
-                        # self have fewer elements, all equals to the first of other's children, self is lower.
-                        return True
-                    else:
-                        # not an instance, one is multiplicative, other one is additive
-                        # They have the same number of singular sequence so the multiplicative is fewer :
-                        # each variable of the addition have less singular sequence than the multiplication parser
-                        return isinstance(self, MultiplicativeScript)
-                else:
-                    # Layer 0
-                    # Compare the value of the character or the sum
-                    if isinstance(self, AdditiveScript):
-                        # The character value is the sum of all character of the addition
-                        self_char_value = sum((character_value[c.character] for c in self.children))
-                    else:
-                        self_char_value = character_value[self.character]
-
-                    if isinstance(other, AdditiveScript):
-                        # The character value is the sum of all character of the addition
-                        other_char_value = sum((character_value[c.character] for c in other.children))
-                    else:
-                        other_char_value = character_value[other.character]
-
-                    return self_char_value < other_char_value
+                value = character_value[self.character]
+
+            return self.layer, 1, self.cardinal, self.canonical, value
+
+        return self.layer, 1, self.cardinal, self.canonical, \
+            0 if isinstance(self, MultiplicativeScript) else 1, tuple(c.sort_key for c in self.children)
 
     # def __getitem__(self, index):
     #     return self.children[index]
@@ -232,6 +307,15 @@ class Script(TreeStructure, DecoratedComponent):
 
 class AdditiveScript(Script):
     """ Represent an addition of same layer scripts."""
+    __slots__ = ()
+
+    @classmethod
+    def _arguments_key(cls, children=None, character=None):
+        if children is not None and not isinstance(children, (list, tuple)):
+            # an iterator would be consumed by the key
+            return None
+        return cls, character, tuple(children) if children else None
+
     def __init__(self, children=None, character=None):
         _character = None
         _children = []
@@ -305,7 +389,7 @@ class AdditiveScript(Script):
 
     def __order(self):
         # Ordering of the children
-        self.children.sort()
+        self.children.sort(key=attrgetter('sort_key'))
 
         if self.layer == 0:
             value = 0b0
@@ -315,6 +399,8 @@ class AdditiveScript(Script):
         else:
             self.canonical = b''.join([child.canonical for child in self])
 
+        self.sort_key = self._compute_sort_key()
+
     def _compute_singular_sequences(self):
         # Generating the singular sequence
         if not self.paradigm:
@@ -322,7 +408,7 @@ class AdditiveScript(Script):
         else:
             # additive proposition has always children set
             s = [sequence for child in self.children for sequence in child.singular_sequences]
-            s.sort()
+            s.sort(key=attrgetter('sort_key'))
             return s
 
     def _compute_cells(self):
@@ -344,6 +430,17 @@ class AdditiveScript(Script):
 
 class MultiplicativeScript(Script):
     """ Represent a multiplication of three scripts of the same layer."""
+    __slots__ = ()
+
+    @classmethod
+    def _arguments_key(cls, substance=None, attribute=None, mode=None, children=None, character=None):
+        if children is None:
+            return cls, character, (substance, attribute, mode)
+        if not isinstance(children, (list, tuple)):
+            # an iterator would be consumed by the key
+            return None
+        return cls, character, tuple(children)
+
     def __init__(self, substance=None, attribute=None, mode=None, children=None, character=None):
         if not (substance or children or character):
             raise InvalidScript()
@@ -464,6 +561,8 @@ class MultiplicativeScript(Script):
         else:
             self.canonical = b''.join([child.canonical for child in self])
 
+        self.sort_key = self._compute_sort_key()
+
     def _compute_singular_sequences(self):
         # Generate the singular sequence
         if not self.paradigm:
@@ -483,7 +582,7 @@ class MultiplicativeScript(Script):
                 sequence = MultiplicativeScript(children=children)
                 s.append(sequence)
 
-            s.sort()
+            s.sort(key=attrgetter('sort_key'))
             return s
 
     def _compute_cells(self):
@@ -548,6 +647,12 @@ class MultiplicativeScript(Script):
 
 
 class NullScript(Script):
+    __slots__ = ()
+
+    @classmethod
+    def _arguments_key(cls, layer):
+        return cls, layer
+
     def __init__(self, layer):
         super().__init__(children=[])
         self.layer = layer
@@ -558,6 +663,7 @@ class NullScript(Script):
 
         self._do_precompute_str()
         self.canonical = bytes([character_value[self.character]] * pow(3, self.layer))
+        self.sort_key = self._compute_sort_key()
         self.script_class = AUXILIARY_CLASS
         self.grammatical_class = self.script_class
 
@@ -578,6 +684,9 @@ class NullScript(Script):
         return [self]
 
 
+# the pickled attributes of the scripts
+_STATE_SLOTS = [name for name in TreeStructure.__slots__ + Script.__slots__ if name not in ('_str', '__weakref__')]
+
 NULL_SCRIPTS = [NullScript(level) for level in range(0, MAX_LAYER)]
 
 # Building the remarkable multiplication to parser
@@ -0,0 +1,133 @@
+from bisect import bisect_right
+from typing import Iterable, Optional
+
+from ieml.dictionary.script import Script
+
+
+class SingularSequenceMask:
+    __slots__ = ('offset', 'bits')
+
+    def __init__(self, offset: int, bits: int):
+        """
+        A set of singular sequences as a bitmask over the global numbering of a SingularSequenceIndex. The mask
+        is stored shifted to its lowest bit, so its size is the span of its singular sequences (at most the size
+        of a root paradigm) and not the total number of singular sequences.
+
+        :param offset: the number of the lowest singular sequence of the set
+        :param bits: the bitmask of the set, shifted by offset
+        """
+        if bits == 0:
+            raise ValueError("Empty singular sequence mask")
+
+        low = (bits & -bits).bit_length() - 1
+        self.offset = offset + low
+        self.bits = bits >> low
+
+    def issubset(self, other: 'SingularSequenceMask') -> bool:
+        shift = self.offset - other.offset
+        if shift < 0:
+            return False
+        return (self.bits << shift) & ~other.bits == 0
+
+    def isdisjoint(self, other: 'SingularSequenceMask') -> bool:
+        if self.offset < other.offset:
+            return (self.bits >> (other.offset - self.offset)) & other.bits == 0
+        return (other.bits >> (self.offset - other.offset)) & self.bits == 0
+
+    def __or__(self, other: 'SingularSequenceMask') -> 'SingularSequenceMask':
+        offset = min(self.offset, other.offset)
+        return SingularSequenceMask(offset,
+                                    (self.bits << (self.offset - offset)) | (other.bits << (other.offset - offset)))
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __eq__(self, other):
+        return isinstance(other, SingularSequenceMask) and self.offset == other.offset and self.bits == other.bits
+
+    def __hash__(self):
+        return hash((self.offset, self.bits))
+
+    def __repr__(self):
+        return "SingularSequenceMask({}, {})".format(self.offset, bin(self.bits))
+
+
+class SingularSequenceIndex:
+    def __init__(self, roots: Iterable[Script]):
+        """
+        Global numbering of the singular sequences of the root paradigms of a dictionary. The singular sequences
+        of each root are numbered consecutively, so a script is a SingularSequenceMask and the containment, the
+        overlap and the root of the scripts are integer operations instead of set operations.
+
+        :param roots: the root paradigms, they must not overlap
+        """
+        self.roots = []
+        # singular sequence -> number
+        self.numbers = {}
+        # number of the first singular sequence of each root, in the order of self.roots
+        self._starts = []
+        # script -> mask, None if the script has a singular sequence out of the roots
+        self._masks = {}
+
+        for r in roots:
+            start = len(self.numbers)
+            for ss in r.singular_sequences:
+                if ss in self.numbers:
+                    raise ValueError("Root paradigms overlap with {}".format(str(r)))
+                self.numbers[ss] = len(self.numbers)
+
+            self.roots.append(r)
+            self._starts.append(start)
+            self._masks[r] = SingularSequenceMask(start, (1 << (len(self.numbers) - start)) - 1)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def mask(self, s: Script) -> Optional[SingularSequenceMask]:
+        """
+        :return: the mask of the singular sequences of s, None if one of them is not in a root paradigm
+        """
+        try:
+            return self._masks[s]
+        except KeyError:
+            pass
+
+        numbers = [self.numbers.get(ss) for ss in s.singular_sequences]
+        if None in numbers:
+            mask = None
+        else:
+            offset = min(numbers)
+            bits = 0
+            for n in numbers:
+                bits |= 1 << (n - offset)
+            mask = SingularSequenceMask(offset, bits)
+
+        self._masks[s] = mask
+        return mask
+
+    def covered(self, s: Script) -> bool:
+        """
+        :return: True if all the singular sequences of s are in the root paradigms
+        """
+        return self.mask(s) is not None
+
+    def contains(self, container: Script, s: Script) -> bool:
+        """
+        :return: True if the singular sequences of s are singular sequences of container, as s in container
+        """
+        if s.layer != container.layer:
+            return False
+
+        mask, container_mask = self.mask(s), self.mask(container)
+        if mask is None or container_mask is None:
+            return s in container
+        return mask.issubset(container_mask)
+
+    def root(self, s: Script) -> Optional[Script]:
+        """
+        :return: the root paradigm of the first singular sequence of s, None if it is not in a root paradigm
+        """
+        n = self.numbers.get(s.singular_sequences[0])
+        if n is None:
+            return None
+        return self.roots[bisect_right(self._starts, n) - 1]
@@ -0,0 +1,220 @@
+import json
+import os
+from typing import List, Dict, Tuple, Union
+
+import numpy as np
+
+from ieml.constants import RELATIONS
+from ieml.dictionary.script import script, Script
+
+SNAPSHOT_VERSION = 1
+
+# arrays of the snapshot, one .npy file each
+_ARRAYS = ['strings', 'offsets', 'roots_idx', 'table_parent', 'table_rank', 'table_root']
+
+
+class LazyScripts:
+    """
+    Sequence of the dictionary scripts, a Script is only parsed from its string the first time it is accessed.
+    """
+    def __init__(self, snapshot: 'DictionarySnapshot'):
+        self.snapshot = snapshot
+        self._scripts = [None] * len(snapshot)
+
+    def __len__(self):
+        return len(self._scripts)
+
+    def __getitem__(self, i):
+        if isinstance(i, (list, np.ndarray)):
+            return [self[j] for j in i]
+
+        if self._scripts[i] is None:
+            self._scripts[i] = script(self.snapshot.string(i))
+        return self._scripts[i]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class DictionarySnapshot:
+    def __init__(self, arrays: Dict[str, np.ndarray], relations: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        """
+        Compact, read only representation of a loaded Dictionary: a string table of the scripts, integer
+        arrays for the roots, the tables parents, ranks and roots, and the CSR arrays (indptr, indices) of
+        each relation. Loaded with `load(folder, mmap=True)`, the arrays are memory mapped and the queries work
+        on indexes and strings, the Script objects are only parsed when accessed.
+
+        :param arrays: the arrays named in _ARRAYS
+        :param relations: map relation name -> (indptr, indices)
+        """
+        self.strings = arrays['strings']
+        self.offsets = arrays['offsets']
+        self.roots_idx = arrays['roots_idx']
+        self.table_parent = arrays['table_parent']
+        self.table_rank = arrays['table_rank']
+        self.table_root = arrays['table_root']
+        self.relations = relations
+
+        self._index = None
+        self._scripts = None
+
+    @staticmethod
+    def from_dictionary(dictionary) -> 'DictionarySnapshot':
+        encoded = [str(s).encode('utf8') for s in dictionary.scripts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(s) for s in encoded])
+
+        table_parent = np.full(len(dictionary), -1, dtype=np.int32)
+        table_rank = np.full(len(dictionary), -1, dtype=np.int8)
+        table_root = np.full(len(dictionary), -1, dtype=np.int32)
+        for i, s in enumerate(dictionary.scripts):
+            table = dictionary.tables.tables.get(s)
+            if table is None:
+                continue
+
+            if table.parent is not None:
+                table_parent[i] = dictionary.index.get(table.parent.script, -1)
+            table_rank[i] = table.rank
+
+            root = dictionary.tables.table_to_root.get(table)
+            if root is not None:
+                table_root[i] = dictionary.index.get(root, -1)
+
+        arrays = {
+            'strings': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'offsets': offsets,
+            'roots_idx': np.asarray(dictionary.roots_idx, dtype=np.int8),
+            'table_parent': table_parent,
+            'table_rank': table_rank,
+            'table_root': table_root,
+        }
+
+        relations = {}
+        for reltype in RELATIONS:
+            m = dictionary.relations.relations[reltype].tocsr()
+            m.sort_indices()
+            relations[reltype] = (m.indptr.astype(np.int32), m.indices.astype(np.int32))
+
+        return DictionarySnapshot(arrays, relations)
+
+    def save(self, folder: str) -> None:
+        """
+        Write the snapshot in folder, as a set of .npy files and a meta.json file.
+        :param folder: the snapshot folder, created if needed
+        """
+        os.makedirs(os.path.join(folder, 'relations'), exist_ok=True)
+
+        for name in _ARRAYS:
+            np.save(os.path.join(folder, name + '.npy'), getattr(self, name))
+
+        for reltype, (indptr, indices) in self.relations.items():
+            np.save(os.path.join(folder, 'relations', reltype + '.indptr.npy'), indptr)
+            np.save(os.path.join(folder, 'relations', reltype + '.indices.npy'), indices)
+
+        with open(os.path.join(folder, 'meta.json'), 'w') as fp:
+            json.dump({'version': SNAPSHOT_VERSION, 'size': len(self), 'relations': sorted(self.relations)}, fp)
+
+    @staticmethod
+    def load(folder: str, mmap: bool = True) -> 'DictionarySnapshot':
+        """
+        Open a snapshot written by `save`.
+        :param folder: the snapshot folder
+        :param mmap: if True the arrays are memory mapped instead of read
+        :return: the snapshot
+        """
+        with open(os.path.join(folder, 'meta.json')) as fp:
+            meta = json.load(fp)
+
+        if meta['version'] != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported dictionary snapshot version {} in {}".format(meta['version'], folder))
+
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(folder, name + '.npy'), mmap_mode=mmap_mode) for name in _ARRAYS}
+        relations = {reltype: (np.load(os.path.join(folder, 'relations', reltype + '.indptr.npy'), mmap_mode=mmap_mode),
+                               np.load(os.path.join(folder, 'relations', reltype + '.indices.npy'), mmap_mode=mmap_mode))
+                     for reltype in meta['relations']}
+
+        return DictionarySnapshot(arrays, relations)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def string(self, i: int) -> str:
+        """
+        :param i: a script index
+        :return: the IEML string of the script
+        """
+        return bytes(self.strings[self.offsets[i]:self.offsets[i + 1]]).decode('utf8')
+
+    def index_of(self, s: Union[str, Script]) -> int:
+        """
+        :param s: a script or its IEML string
+        :return: the index of the script in the dictionary, raise a KeyError if not defined
+        """
+        if self._index is None:
+            self._index = {self.string(i): i for i in range(len(self))}
+        return self._index[str(s)]
+
+    @property
+    def scripts(self) -> LazyScripts:
+        if self._scripts is None:
+            self._scripts = LazyScripts(self)
+        return self._scripts
+
+    def __getitem__(self, item):
+        return self.scripts[self.index_of(item)]
+
+    def __contains__(self, item):
+        try:
+            self.index_of(item)
+        except KeyError:
+            return False
+        return True
+
+    @property
+    def roots(self) -> List[Script]:
+        return self.scripts[np.flatnonzero(self.roots_idx)]
+
+    def object_indices(self, subject, relation: str) -> np.ndarray:
+        """
+        :return: the sorted indexes of the objects of the relation for subject
+        """
+        indptr, indices = self.relations[relation]
+        i = self.index_of(subject)
+        return indices[indptr[i]:indptr[i + 1]]
+
+    def object_strings(self, subject, relation: str) -> List[str]:
+        return [self.string(i) for i in self.object_indices(subject, relation)]
+
+    def object(self, subject, relation: str) -> List[Script]:
+        return self.scripts[self.object_indices(subject, relation)]
+
+    def relation_object(self, subject) -> Dict[str, List[Script]]:
+        return {relation: self.object(subject, relation) for relation in RELATIONS}
+
+    def relation(self, subject, object) -> List[str]:
+        j = self.index_of(object)
+        return [relation for relation in RELATIONS if j in self.object_indices(subject, relation)]
+
+    def _script_or_none(self, i):
+        return self.scripts[int(i)] if i != -1 else None
+
+    def root(self, s) -> Script:
+        """
+        :return: the root paradigm of the script or None
+        """
+        return self._script_or_none(self.table_root[self.index_of(s)])
+
+    def parent(self, s) -> Script:
+        """
+        :return: the script of the parent table of the script or None
+        """
+        return self._script_or_none(self.table_parent[self.index_of(s)])
+
+    def rank(self, s) -> int:
+        """
+        :return: the rank of the table of the script or None
+        """
+        r = self.table_rank[self.index_of(s)]
+        return int(r) if r != -1 else None
@@ -1,11 +1,28 @@
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from itertools import chain
 
 from ieml import error
 from ieml.commons import logger
+from ieml.dictionary.script.script import dumps_references, loads_references
 from ieml.dictionary.table.table import *
 
+
+def _define_roots_chunk(data):
+    # the scripts of the roots are sent as references, the tables are returned with references to the scripts
+    # of the roots, which the dictionary process has
+    roots = loads_references(data)
+    known = set()
+    for root, paradigms in roots:
+        known.add(root)
+        known.update(paradigms)
+        known.update(root.singular_sequences)
+
+    return dumps_references([TableStructure._define_root(root=root, paradigms=paradigms)
+                             for root, paradigms in roots], known)
+
+
 class TableStructure:
     # define a forest of root paradigm
     # This class defines :
@@ -14,10 +31,21 @@ class TableStructure:
     #       o the coordinates of each cells
     # the table structure defines the rank for the paradigms
 
-    def __init__(self, scripts, roots):
-        tables, root_paradigms = self._build_tables(roots, scripts)
+    def __init__(self, scripts, roots, previous: 'TableStructure' = None, index=None, workers=1):
+        """
+        :param scripts: the scripts of the dictionary
+        :param roots: the root paradigms
+        :param previous: if set, the tables of the roots defined with the same paradigms in previous are reused
+        :param index: if set, the SingularSequenceIndex of the roots, that assigns the paradigms to their root
+        :param workers: if greater than 1, the tables of the roots are defined in a pool of this number of processes
+        """
+        tables, root_paradigms, paradigms, reused = self._build_tables(roots, scripts, previous, index, workers)
         self.tables = tables
         self.roots = root_paradigms
+        # map root -> the paradigms the root tables were defined from
+        self.paradigms = paradigms
+        # the roots whose tables were taken from previous
+        self.reused = reused
         self.table_to_root = {t: r for r, t_s in self.roots.items() for t in t_s}
         # self.table_to_root = {t: r for r, t_s in self.roots.items() for t in t_s}
 
@@ -89,30 +117,61 @@ class TableStructure:
         return tables, cells
 
     @staticmethod
-    def _build_tables(root_scripts, scripts):
+    def _build_tables(root_scripts, scripts, previous=None, index=None, workers=1):
         roots = defaultdict(list)
-        root_ss = {}
 
-        for root in root_scripts:
-            for ss in root.singular_sequences:
-                root_ss[ss] = root
+        if index is not None:
+            root_set = set(root_scripts)
+
+            def root_of(s):
+                root = index.root(s)
+                return root if root in root_set else None
+        else:
+            root_ss = {}
+            for root in root_scripts:
+                for ss in root.singular_sequences:
+                    root_ss[ss] = root
+
+            def root_of(s):
+                return root_ss.get(s.singular_sequences[0])
 
         # assign each paradigm to its root paradigm
         for s in scripts:
             if s.cardinal == 1:
                 continue
-            if s.singular_sequences[0] not in root_ss:
+            root = root_of(s)
+            if root is None:
                 logger.error(s.singular_sequences[0] + " not found")
                 continue
-            roots[root_ss[s.singular_sequences[0]]].append(s)
+            roots[root].append(s)
 
         root_paradigms = {}
+        paradigms = {}
+        reused = set()
+        defined = []
         for root in root_scripts:
-            tables, cells = TableStructure._define_root(root=root, paradigms=roots[root])
+            paradigms[root] = frozenset(roots[root])
+            if previous is not None and getattr(previous, 'paradigms', {}).get(root) == paradigms[root]:
+                root_paradigms[root] = previous.roots[root]
+                reused.add(root)
+                continue
+
+            defined.append((root, roots[root]))
+
+        if workers > 1 and len(defined) > 1:
+            chunk_size = -(-len(defined) // (workers * 4))
+            chunks = [defined[i:i + chunk_size] for i in range(0, len(defined), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(chain.from_iterable(
+                    map(loads_references, executor.map(_define_roots_chunk, map(dumps_references, chunks)))))
+        else:
+            results = [TableStructure._define_root(root=root, paradigms=paradigms) for root, paradigms in defined]
+
+        for (root, _), (tables, cells) in zip(defined, results):
             root_paradigms[root] = tables | cells
 
         tables = {}
         for t in chain.from_iterable(root_paradigms.values()):
             tables[t.script] = t
 
-        return tables, root_paradigms
\ No newline at end of file
+        return tables, root_paradigms, paradigms, reused
\ No newline at end of file
@@ -0,0 +1,137 @@
+import os
+from collections import OrderedDict
+
+from ieml.constants import LANGUAGES, DESCRIPTORS_CLASS
+from ieml.ieml_database.descriptors import normalize_key, normalize_value
+
+
+class BulkWriter:
+    def __init__(self, db):
+        """
+        Buffer the add and remove operations of descriptors and structure entries, and apply them file by file
+        when the context exits: each affected file is read at most once and written (or removed) exactly once.
+
+        >>> with db.bulk_write() as w:
+        ...     w.add_descriptor('wa.', 'en', 'translations', 'wa')
+        ...     w.remove_structure('O:M:.', 'inhibition')
+        >>> w.files_touched
+
+        :param db: the ieml.ieml_database.IEMLDatabase to write
+        """
+        self.db = db
+        # path -> list of operations (kind, ieml, args)
+        self.operations = OrderedDict()
+        self.files_touched = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.operations.clear()
+
+    def _push(self, path, op):
+        self.operations.setdefault(path, []).append(op)
+
+    def add_descriptor(self, ieml, language, descriptor, value):
+        ieml = self.db.normalize_ieml(ieml)
+        _, language, descriptor = normalize_key(ieml, language, descriptor, partial=False)
+        value = normalize_value(value)
+        if not value:
+            return
+
+        line = '"{}" {} {} "{}"\n'.format(self.db.escape_value(ieml), language, descriptor,
+                                          self.db.escape_value(value))
+        self._push(self.db.path_of(ieml), ('add', ieml, (language, descriptor, value), line))
+
+    def remove_descriptor(self, ieml, language=None, descriptor=None, value=None, normalize=True):
+        ieml = self.db.normalize_ieml(ieml)
+        path = self.db.path_of(ieml, normalize=normalize)
+        _, language, descriptor = normalize_key(ieml, language, descriptor, partial=True)
+
+        if descriptor is None and language is None and value is None:
+            self._push(path, ('delete', ieml, None, None))
+            return
+
+        if value:
+            value = normalize_value(value)
+
+        prefixes = tuple('"{}" {} {} '.format(self.db.escape_value(ieml), l, d) +
+                         ('"{}"'.format(self.db.escape_value(value)) if value is not None else '')
+                         for l in ([language] if language else LANGUAGES)
+                         for d in ([descriptor] if descriptor else DESCRIPTORS_CLASS))
+        self._push(path, ('remove', ieml, (language, descriptor, value), prefixes))
+
+    def add_structure(self, ieml, key, value):
+        ieml = self.db.normalize_ieml(ieml)
+        _, key, value = normalize_key(ieml, key, value, partial=False, structure=True)
+
+        line = '"{}" {} "{}"\n'.format(ieml, key, value)
+        self._push(self.db.path_of(ieml, descriptor=False), ('add', ieml, None, line))
+
+    def remove_structure(self, ieml, key=None, value=None, normalize=True):
+        ieml = self.db.normalize_ieml(ieml)
+        path = self.db.path_of(ieml, descriptor=False, normalize=normalize)
+        _, key, value = normalize_key(ieml, key, value, partial=True, structure=True)
+
+        if key is None:
+            self._push(path, ('delete', ieml, None, None))
+            return
+
+        prefix = '"{}" {} '.format(ieml, key) + ('"{}"'.format(value) if value else '')
+        self._push(path, ('remove', ieml, None, (prefix,)))
+
+    def flush(self) -> int:
+        """
+        Apply the buffered operations.
+        :return: the number of files written or removed
+        """
+        touched = 0
+        for path, operations in self.operations.items():
+            if os.path.isfile(path):
+                with open(path, 'r', encoding='utf8') as fp:
+                    lines = fp.readlines()
+            else:
+                lines = None
+
+            for kind, _, _, arg in operations:
+                if kind == 'add':
+                    lines = lines if lines is not None else []
+                    lines.append(arg)
+                elif lines is None:
+                    continue
+                elif kind == 'delete':
+                    lines = None
+                else:
+                    lines = [l for l in lines if not l.startswith(arg)]
+
+            if path.endswith('.desc'):
+                self.db._descriptor_index.invalidate(path)
+
+            if lines is None:
+                if os.path.isfile(path):
+                    os.remove(path)
+                    touched += 1
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w', encoding='utf8') as fp:
+                    fp.writelines(lines)
+                touched += 1
+
+            search_index = self.db._search_index
+            if search_index is not None and path.endswith('.desc'):
+                for kind, ieml, args, _ in operations:
+                    if kind == 'add':
+                        search_index.add(ieml, *args)
+                    elif kind == 'delete':
+                        search_index.remove(ieml)
+                    else:
+                        search_index.remove(ieml, *args)
+
+        if self.operations:
+            self.db._invalidate_record_index()
+        self.operations.clear()
+        self.files_touched += touched
+        return touched
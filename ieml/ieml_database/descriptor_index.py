@@ -0,0 +1,219 @@
+import atexit
+import os
+import pickle
+import threading
+import time
+import weakref
+from collections import defaultdict
+from itertools import chain
+from typing import List
+
+import pandas
+
+from ieml import logger
+from ieml.commons import file_stat
+from ieml.ieml_database.descriptors import Descriptors
+from ieml.ieml_database.loader import list_files, read_files, CONTENT_FOLDERS, DESCRIPTORS_COLUMNS
+
+DESCRIPTOR_INDEX_VERSION = 1
+# minimum number of seconds between two saves of the persisted index, the last changes are saved at exit
+DESCRIPTOR_INDEX_SAVE_INTERVAL = 60
+
+
+def _save_at_exit(ref):
+    index = ref()
+    if index is not None:
+        with index._lock:
+            if index._unsaved:
+                try:
+                    index.save()
+                except OSError as e:
+                    logger.info("DescriptorIndex: unable to save {}: {}".format(index.cache_file, repr(e)))
+
+
+class DescriptorIndex:
+    def __init__(self, folder: str, cache_folder: str = None, save_interval: float = DESCRIPTOR_INDEX_SAVE_INTERVAL):
+        """
+        The descriptor rows of a database grouped by file, with a manifest of the (size, mtime_ns, inode) of
+        each file. A refresh only re-reads the files that were added, changed or deleted since the last one and
+        builds new descriptors from the previous ones, sharing the entries of the ieml that did not change. The
+        Descriptors returned by `descriptors` are a snapshot, never modified by the later refreshes.
+
+        :param folder: the database folder
+        :param cache_folder: if set, the folder where the manifest and the rows are persisted between processes
+        :param save_interval: the minimum number of seconds between two saves of the persisted index. The first
+        refresh of the process is saved, the later ones at most once per interval and at the exit of the process.
+        """
+        self.folder = folder
+        # prefix of the absolute paths of the files, sliced off to get their relative paths
+        self._prefix = os.path.join(folder, '')
+        self.cache_file = os.path.join(cache_folder, '.descriptors-index') if cache_folder else None
+        self.save_interval = save_interval
+        # the changes not persisted yet and the time of the last save
+        self._unsaved = False
+        self._saved_at = None
+        if self.cache_file is not None:
+            atexit.register(_save_at_exit, weakref.ref(self))
+
+        # relative path -> (size, mtime_ns, inode)
+        self.manifest = {}
+        # relative path -> list of rows
+        self.rows = {}
+        # ieml -> relative paths of the files that describe it
+        self._files_of = defaultdict(set)
+        # relative paths written by this process, re-read even if their stat did not change
+        self._dirty = set()
+
+        # the ieml whose rows were replaced by the last refresh
+        self.changed_iemls = set()
+
+        self._descriptors = None
+        self._loaded = False
+        # the refreshes of the instances sharing the index are serialized
+        self._lock = threading.Lock()
+
+    def invalidate(self, path: str) -> None:
+        """
+        Mark a file as changed, it will be re-read at the next refresh.
+        :param path: the absolute path of the file
+        """
+        self._dirty.add(self._relative(path))
+
+    def _relative(self, path: str) -> str:
+        if path.startswith(self._prefix):
+            return path[len(self._prefix):]
+        return os.path.relpath(path, self.folder)
+
+    @property
+    def descriptors(self) -> Descriptors:
+        if self._descriptors is None:
+            self.refresh()
+        return self._descriptors
+
+    def refresh(self, paths: List[str] = None) -> List[str]:
+        """
+        Stat all the descriptor files, re-read the changed ones and patch the descriptors table.
+
+        :param paths: if set, only these relative paths are checked, the other files are supposed unchanged.
+        Ignored if the index is not loaded yet.
+        :return: the relative paths of the added, changed or deleted files
+        """
+        with self._lock:
+            return self._refresh(paths)
+
+    def _refresh(self, paths):
+        if not self._loaded:
+            self._load()
+
+        if paths is not None and self._descriptors is None:
+            paths = None
+
+        if paths is None:
+            # list_files joins the paths to the folder, the prefix is sliced off without os.path.relpath
+            n = len(self._prefix)
+            files = [(path[n:], path) for path in list_files(self.folder, '.desc', CONTENT_FOLDERS)]
+        else:
+            files = [(f, os.path.join(self.folder, f)) for f in paths]
+
+        stats = {}
+        for f, path in files:
+            try:
+                stats[f] = file_stat(path)
+            except FileNotFoundError:
+                continue
+
+        checked = self.manifest if paths is None else paths
+        changed = [f for f, st in stats.items() if f in self._dirty or self.manifest.get(f) != st]
+        deleted = [f for f in checked if f not in stats and f in self.manifest]
+        if paths is None:
+            self._dirty.clear()
+        else:
+            self._dirty.difference_update(paths)
+        self.changed_iemls = set()
+
+        if not changed and not deleted and self._descriptors is not None:
+            return []
+
+        iemls = set()
+        for f in chain(changed, deleted):
+            for row in self.rows.pop(f, ()):
+                iemls.add(row[0])
+                self._files_of[row[0]].discard(f)
+            self.manifest.pop(f, None)
+
+        for f, rows in zip(changed, read_files([os.path.join(self.folder, f) for f in changed],
+                                               len(DESCRIPTORS_COLUMNS), grouped=True)):
+            self.rows[f] = rows
+            self.manifest[f] = stats[f]
+            for row in rows:
+                iemls.add(row[0])
+                self._files_of[row[0]].add(f)
+
+        if self._descriptors is None:
+            # the lookup index is built from the rows, the DataFrame at its first access
+            index = {}
+            for ieml, l, d, v in chain.from_iterable(self.rows.values()):
+                index.setdefault(ieml, {}).setdefault(d, {}).setdefault(l, []).append(v)
+            self._descriptors = Descriptors.from_index(index)
+        else:
+            files = set(chain.from_iterable(self._files_of[ieml] for ieml in iemls))
+            self._descriptors = self._descriptors.replaced(
+                iemls, self._dataframe(chain.from_iterable(self.rows[f] for f in files)))
+
+        for ieml in iemls:
+            if not self._files_of[ieml]:
+                del self._files_of[ieml]
+        self.changed_iemls = iemls
+
+        if changed or deleted:
+            self._unsaved = True
+            if self._saved_at is None or time.monotonic() - self._saved_at >= self.save_interval:
+                self.save()
+
+        return changed + deleted
+
+    @staticmethod
+    def _dataframe(rows):
+        return pandas.DataFrame(list(rows), columns=DESCRIPTORS_COLUMNS, dtype=str)
+
+    def _load(self):
+        self._loaded = True
+        if self.cache_file is None or not os.path.isfile(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, 'rb') as fp:
+                version, manifest, rows = pickle.load(fp)
+        except Exception as e:
+            logger.info("DescriptorIndex: unable to read {}: {}".format(self.cache_file, repr(e)))
+            return
+
+        if version != DESCRIPTOR_INDEX_VERSION:
+            return
+
+        self.manifest = manifest
+        self.rows = rows
+        for f, rows in self.rows.items():
+            for row in rows:
+                self._files_of[row[0]].add(f)
+
+    def save(self) -> None:
+        """
+        Persist the manifest and the rows in the cache folder.
+        """
+        if self.cache_file is None:
+            return
+
+        # a temporary file per process and thread, the concurrent saves never write the same file
+        tmp = '{}.{}-{}.tmp'.format(self.cache_file, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp, 'wb') as fp:
+                pickle.dump((DESCRIPTOR_INDEX_VERSION, self.manifest, self.rows), fp, protocol=4)
+            os.replace(tmp, self.cache_file)
+        except BaseException:
+            if os.path.isfile(tmp):
+                os.remove(tmp)
+            raise
+
+        self._unsaved = False
+        self._saved_at = time.monotonic()
@@ -1,18 +1,17 @@
 import csv
 import enum
 import json
-import operator
 from enum import Enum
 from io import StringIO
+from itertools import chain
 from typing import Dict, List
 
 import pandas
 from collections import defaultdict
-from functools import reduce
 
 from ieml.constants import STRUCTURE_KEYS, INHIBITABLE_RELATIONS, DescriptorsType, DESCRIPTORS_CLASS, LANGUAGES, \
     Languages
-from ieml.usl.parser import IEMLParser
+from ieml.usl.parser import default_parser
 
 
 
@@ -23,7 +22,7 @@ def normalize_key(ieml, key, value, parse_ieml=False, partial=False, structure=F
     if ieml:
         ieml = str(ieml)
         if parse_ieml:
-            parsed = IEMLParser().parse(str(ieml))
+            parsed = default_parser().parse(str(ieml))
             ieml = str(parsed)
             # if ieml != str(parsed):
             #     raise ValueError("IEML is not normalized: {}".format(ieml))
@@ -61,23 +60,87 @@ def normalize_key(ieml, key, value, parse_ieml=False, partial=False, structure=F
 
     return ieml, key, value
 
+def normalize_value(value):
+    if not isinstance(value, str):
+        raise ValueError("Expected a string, not a {}".format(value.__class__.__name__))
+
+    # TODO normalize accent encoding
+    return value.strip()
+
+
 Descriptor = Dict[DescriptorsType, Dict[Languages, List[str]]]
 
+_COLUMNS = ['ieml', 'language', 'descriptor', 'value']
+
+
 class Descriptors:
     def __init__(self, df):
-        assert list(df.columns) == ['ieml', 'language', 'descriptor', 'value']
-        self.df = df.set_index(['ieml', 'language', 'descriptor']).sort_index()
+        assert list(df.columns) == _COLUMNS
+        self._df = df.set_index(['ieml', 'language', 'descriptor']).sort_index()
+        # ieml -> descriptor -> language -> values, built at the first lookup
+        self._index = None
+
+    @property
+    def df(self):
+        if self._df is None:
+            self._df = pandas.DataFrame([(ieml, l, d, v)
+                                         for ieml, descs in self._index.items()
+                                         for d, langs in descs.items()
+                                         for l, values in langs.items()
+                                         for v in values], columns=_COLUMNS, dtype=str)\
+                .set_index(['ieml', 'language', 'descriptor']).sort_index()
+        return self._df
+
+    @property
+    def index(self) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+        if self._index is None:
+            index = {}
+            iemls, languages, descriptors = (self._df.index.get_level_values(k).tolist()
+                                             for k in ['ieml', 'language', 'descriptor'])
+            for ieml, l, d, v in zip(iemls, languages, descriptors, self._df['value'].tolist()):
+                index.setdefault(ieml, {}).setdefault(d, {}).setdefault(l, []).append(v)
+            self._index = index
+
+        return self._index
+
+    @classmethod
+    def from_index(cls, index) -> 'Descriptors':
+        """
+        :param index: the lookup index, ieml -> descriptor -> language -> values
+        :return: the Descriptors of this index, its DataFrame is built at its first access
+        """
+        res = cls.__new__(cls)
+        res._df = None
+        res._index = index
+        return res
+
+    def replaced(self, iemls, df) -> 'Descriptors':
+        """
+        Return new Descriptors where all the rows of `iemls` are replaced by the rows of `df`, these ones are
+        left unchanged. The lookup index is copied shallowly: the entries of the other ieml are shared, the
+        DataFrame is rebuilt at its next access.
+
+        :param iemls: the ieml to remove from the table
+        :param df: the rows to add ('ieml', 'language', 'descriptor', 'value')
+        """
+        assert list(df.columns) == _COLUMNS
+        rows = list(df.itertuples(index=False))
+
+        index = dict(self.index)
+        for ieml in chain(iemls, (row[0] for row in rows)):
+            index.pop(ieml, None)
+
+        for ieml, l, d, v in rows:
+            index.setdefault(ieml, {}).setdefault(d, {}).setdefault(l, []).append(v)
+
+        return Descriptors.from_index(index)
 
     # @monitor_decorator('get_values')
     def get_values(self, ieml, language, descriptor):
         ieml, language, descriptor = normalize_key(ieml, language, descriptor,
                                                    parse_ieml=False, partial=False)
         try:
-            res = self.df.loc(axis=0)[(str(ieml), language, descriptor)]
-            if isinstance(res, pandas.Series):
-                return res.to_list()
-            else:
-                return res.to_dict('list')['value']
+            return list(self.index[ieml][descriptor][language])
         except KeyError:
             return []
 
@@ -86,26 +149,39 @@ class Descriptors:
         ieml, language, descriptor = normalize_key(ieml, language, descriptor,
                                                    parse_ieml=False, partial=True)
 
-        key = {'ieml': ieml, 'language': language, 'descriptor': descriptor}
-        key = reduce(operator.and_,
-                     [self.df.index.get_level_values(k) == v for k, v in key.items() if v is not None],
-                     True)
+        if ieml is not None:
+            items = [(ieml, self.index[ieml])] if ieml in self.index else []
+        else:
+            items = self.index.items()
+
+        res = {}
+        for _ieml, descs in items:
+            for d, langs in descs.items():
+                if descriptor is not None and d != descriptor:
+                    continue
+                for l, values in langs.items():
+                    if language is not None and l != language:
+                        continue
+                    res[(_ieml, l, d)] = list(values)
 
-        res = defaultdict(list)
-        for k, (v,) in self.df[key].iterrows():
-            res[k].append(v)
-
-        return dict(res)
+        return res
 
     def get_descriptor(self, ieml) -> Descriptor:
         res = {d : {l: [] for l in LANGUAGES} for d in DESCRIPTORS_CLASS}
 
-        for (_ieml, lang, desc), value in self.get_values_partial(ieml).items():
-            assert ieml == _ieml
-            res[desc][lang] = value
+        for d, langs in self.index.get(str(ieml), {}).items():
+            for l, values in langs.items():
+                res[d][l] = list(values)
 
         return res
 
+    def get_descriptors_bulk(self, iemls) -> Dict[str, Descriptor]:
+        """
+        :param iemls: a list of ieml
+        :return: a dict ieml -> descriptor of each ieml
+        """
+        return {str(ieml): self.get_descriptor(ieml) for ieml in iemls}
+
     @staticmethod
     def from_csv_string(s, assert_unique_ieml=False):
         ours_data = StringIO(s)
@@ -0,0 +1,176 @@
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import pandas
+import pygit2
+
+from ieml import error
+from ieml.dictionary.dictionary import Dictionary
+from ieml.exceptions import CannotParse
+from ieml.ieml_database.descriptors import Descriptors
+from ieml.ieml_database.ieml_database import IEMLDatabase, Structure
+from ieml.ieml_database.loader import tokenize_blobs, CONTENT_FOLDERS, DESCRIPTORS_COLUMNS, STRUCTURE_COLUMNS
+from ieml.ieml_database.registry import registry
+from ieml.usl.parser import IEMLParser
+
+# number of parsed blobs kept in memory, shared by all the versions
+BLOB_CACHE_SIZE = 1 << 18
+
+
+class _BlobCache:
+    """LRU of the tokenized rows of the blobs, keyed by blob oid"""
+    def __init__(self, max_size=BLOB_CACHE_SIZE):
+        self.max_size = max_size
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def rows(self, repo, entries: List[Tuple[str, str]], width: int) -> List[List[List[str]]]:
+        """
+        :param repo: the pygit2 repository
+        :param entries: the list of (path, blob oid) to read
+        :param width: the number of fields per line
+        :return: the rows of each blob
+        """
+        with self._lock:
+            missing = [(path, oid) for path, oid in entries if oid not in self._rows]
+
+        if missing:
+            # all the missing blobs are read then tokenized together
+            rows = tokenize_blobs([repo[oid].data for _, oid in missing], width, names=[p for p, _ in missing])
+            with self._lock:
+                for (_, oid), r in zip(missing, rows):
+                    self._rows[oid] = r
+                while len(self._rows) > self.max_size:
+                    self._rows.popitem(last=False)
+
+        res = []
+        with self._lock:
+            for _, oid in entries:
+                r = self._rows.get(oid)
+                if r is None:
+                    r = tokenize_blobs([repo[oid].data], width)[0]
+                else:
+                    self._rows.move_to_end(oid)
+                res.append(r)
+        return res
+
+
+blob_cache = _BlobCache()
+
+
+def _walk(tree, prefix, extension, res):
+    for entry in tree:
+        if entry.filemode == pygit2.GIT_FILEMODE_TREE:
+            _walk(entry, prefix + entry.name + '/', extension, res)
+        elif entry.name.endswith(extension):
+            res.append((prefix + entry.name, entry.id))
+
+
+class GitDatabase(IEMLDatabase):
+    def __init__(self, gitdb, commit_id=None):
+        """
+        Read only IEMLDatabase on a commit of the git repository of a database. The structure, the descriptors
+        and the dictionary are read from the git trees and blobs of the commit, the working directory is never
+        read nor modified. The tokenized blobs are shared between the versions.
+
+        :param gitdb: the GitInterface of the database
+        :param commit_id: the commit to read, default to the HEAD
+        """
+        self.repo = gitdb.repo
+        commit = self.repo.revparse_single(str(commit_id)) if commit_id is not None else self.repo.head.peel()
+        self.commit_id = str(commit.id)
+        self.tree = commit.peel(pygit2.Tree)
+
+        super().__init__(gitdb.folder, use_cache=False, gitdb=gitdb)
+
+    def _get_descriptors_state(self):
+        # the descriptors of the commit are not the ones of the working directory
+        return SimpleNamespace(descriptor_index=None, search_index=None)
+
+    def __str__(self):
+        return "<{} ({} commit={})>".format(self.__module__, self.folder, self.commit_id)
+
+    def tree_id(self, path=''):
+        """
+        :return: the id of the git tree of path at this commit, None if it does not exist
+        """
+        if not path:
+            return str(self.tree.id)
+        try:
+            return str(self.tree[path].id)
+        except KeyError:
+            return None
+
+    def _entries(self, path, extension):
+        try:
+            tree = self.tree[path] if path else self.tree
+        except KeyError:
+            return []
+
+        res = []
+        _walk(self.repo[tree.id], path + '/' if path else '', extension, res)
+        return sorted(res)
+
+    def _rows(self, paths, extension, width):
+        entries = [e for p in paths for e in self._entries(p, extension)]
+        return blob_cache.rows(self.repo, entries, width)
+
+    def list(self, type=None, paradigm=None, parse=False):
+        p = ''
+        if type:
+            if not isinstance(type, str):
+                type = type.__name__.lower()
+            p = type
+            if paradigm is not None:
+                p = '{}/{}'.format(p, 'paradigm' if paradigm else 'singular')
+
+        rows = self._rows([p], '.desc', len(DESCRIPTORS_COLUMNS))
+        res = list(dict.fromkeys(r[0] for file_rows in rows for r in file_rows))
+
+        if parse:
+            parser = IEMLParser(dictionary=self.get_dictionary())
+            _res = []
+            for s in res:
+                try:
+                    _res.append(parser.parse(s))
+                except CannotParse as e:
+                    error("Cannot parse {} : {}".format(s, repr(e)))
+            return _res
+
+        return res
+
+    def get_descriptors(self, files_list=None):
+        if files_list is not None:
+            entries = [(f, self.tree[f].id) for f in files_list]
+            rows = blob_cache.rows(self.repo, entries, len(DESCRIPTORS_COLUMNS))
+            return Descriptors(pandas.DataFrame([r for file_rows in rows for r in file_rows],
+                                                columns=DESCRIPTORS_COLUMNS, dtype=str))
+
+        def load():
+            rows = self._rows(CONTENT_FOLDERS, '.desc', len(DESCRIPTORS_COLUMNS))
+            return Descriptors(pandas.DataFrame([r for file_rows in rows for r in file_rows],
+                                                columns=DESCRIPTORS_COLUMNS, dtype=str))
+
+        return registry.get(self.folder, 'descriptors@git', self.tree_id(), load)
+
+    def get_structure(self):
+        def load():
+            rows = self._rows(['morpheme'], '.ieml', len(STRUCTURE_COLUMNS))
+            return Structure(pandas.DataFrame([r for file_rows in rows for r in file_rows],
+                                              columns=STRUCTURE_COLUMNS, dtype=str))
+
+        return registry.get(self.folder, 'structure@git', self.tree_id('morpheme'), load)
+
+    def get_dictionary(self):
+        return registry.get(self.folder, 'dictionary@git', self.tree_id('morpheme/paradigm'),
+                            lambda: Dictionary(self.list('morpheme', paradigm=True), self.get_structure()))
+
+    def get_dictionary_snapshot(self, mmap=True):
+        raise ValueError("Dictionary snapshots are not available on a GitDatabase")
+
+    def _read_only(self, *args, **kwargs):
+        raise ValueError("{} is read only".format(self))
+
+    add_descriptor = remove_descriptor = add_structure = remove_structure = bulk_write = _read_only
@@ -6,6 +6,7 @@ from io import StringIO
 import tqdm
 
 from ieml.ieml_database.descriptors import Descriptor, Descriptors
+from ieml.ieml_database.registry import registry
 
 try:
     from pygit2._pygit2 import GIT_CHECKOUT_FORCE, GIT_CHECKOUT_RECREATE_MISSING, GIT_STATUS_WT_NEW, \
@@ -38,6 +39,19 @@ class MergeConflict(Exception):
     def __repr__(self):
         return self.message
 
+class GitDiff(dict):
+    def __init__(self, changes, commit0, commit1):
+        """
+        The files changed between two commits, file path -> change, as returned by GitInterface.diff.
+
+        :param changes: the changes of the files
+        :param commit0: the id of the commit the diff starts from
+        :param commit1: the id of the commit the diff ends to
+        """
+        super().__init__(changes)
+        self.commit0 = commit0
+        self.commit1 = commit1
+
 #TODO  normalize repo name with postfix .git
 
 class git_transaction:
@@ -99,8 +113,16 @@ class git_transaction:
                 # TODO : ensure that the reset is perfect
                 # even when creating a new file in the folder ? untracked
                 raise e
+            finally:
+                self._invalidate_registry()
         else:
             self.db.reset(self.commit_id)
+            self._invalidate_registry()
+
+    def _invalidate_registry(self):
+        # the dictionary, structure and record index loaded before the transaction are outdated. The
+        # descriptors index follows the files by itself and is kept.
+        registry.invalidate(self.db.folder, names=['dictionary', 'structure', 'record_index'])
 
 
 class GitInterface:
@@ -398,6 +420,32 @@ class GitInterface:
         except KeyError:
             self.repo.remotes.create(name, url)
 
+    def tree_id(self, path='', commit_id=None):
+        """
+        Return the id of the git tree of a folder of the repository, an identifier of the folder content.
+
+        :param path: the folder, relative to the repository root
+        :param commit_id: the commit, default to the HEAD. In that case, None is returned if the folder has
+        uncommitted changes in the working directory.
+        :return: the tree id as an hexadecimal string, or None
+        """
+        repo = self.repo
+        commit = repo.revparse_single(str(commit_id)) if commit_id is not None else repo.head.peel()
+        tree = commit.peel(pygit2.Tree)
+        if path:
+            try:
+                tree = tree[path]
+            except KeyError:
+                return None
+
+        if commit_id is None:
+            prefix = path.rstrip('/') + '/' if path else ''
+            for f, k in repo.status().items():
+                if f.startswith(prefix) and k != pygit2.GIT_STATUS_IGNORED:
+                    return None
+
+        return str(tree.id)
+
     def diff(self, commit0, commit1):
         t0 = self.repo.revparse_single(str(commit0))
         t1 = self.repo.revparse_single(str(commit1))
@@ -426,4 +474,4 @@ class GitInterface:
                     'is_removed': patch.delta.new_file.mode == 0,
                 }
 
-        return res
+        return GitDiff(res, str(t0.peel(pygit2.Commit).id), str(t1.peel(pygit2.Commit).id))
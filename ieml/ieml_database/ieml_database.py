@@ -1,6 +1,8 @@
 import logging
 import operator
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from shlex import quote
 from sys import stdout
 
@@ -9,42 +11,112 @@ from functools import reduce
 
 import os
 import json
+import shutil
 from hashlib import sha224
-import subprocess
+from functools import lru_cache
+from typing import Tuple, List
 
 import sys
+import threading
 
-from pandas.errors import ParserError, EmptyDataError
 from tqdm import tqdm
 
 from ieml import error
-from ieml.commons import monitor_decorator, cache_results_watch_files
+from ieml.commons import monitor_decorator, cache_results_watch_files, FolderWatcherCache, stat_fingerprint, \
+    VersionedCacheStore
 from ieml.constants import INHIBITABLE_RELATIONS, STRUCTURE_KEYS, GRAMMATICAL_CLASS_NAMES, \
-    TYPES, LANGUAGES, DESCRIPTORS_CLASS
+    TYPES, LANGUAGES
 from ieml.dictionary.dictionary import Dictionary
+from ieml.dictionary.snapshot import DictionarySnapshot
 from ieml.dictionary.script import NullScript, MultiplicativeScript, AdditiveScript, Script
 from ieml.exceptions import CannotParse
-from ieml.ieml_database.descriptors import Descriptors, normalize_key
+from ieml.ieml_database.descriptor_index import DescriptorIndex
+from ieml.ieml_database.bulk_write import BulkWriter
+from ieml.ieml_database.descriptors import Descriptors, normalize_key, normalize_value
 from ieml.ieml_database.git_interface import logger
+from ieml.ieml_database.loader import read_descriptors, read_structure, list_iemls, read_files, STRUCTURE_COLUMNS
+from ieml.ieml_database.record_index import RecordIndex
+from ieml.ieml_database.registry import registry
+from ieml.ieml_database.search import DescriptorSearchIndex
 from ieml.usl.decoration.instance import InstancedUSL
 from ieml.usl.lexeme import Lexeme
-from ieml.usl.parser import IEMLParser
+from ieml.usl.parser import IEMLParser, default_parser
 from ieml.usl import PolyMorpheme, Word, get_index
 
 
 
-def _normalize_value(value):
-    if not isinstance(value, str):
-        raise ValueError("Expected a string, not a {}".format(value.__class__.__name__))
+# under this number of usls, get_list does not start a process pool
+LIST_PARALLEL_MIN_SIZE = 2000
 
-    # TODO normalize accent encoding
-    return value.strip()
+# the dictionary and the parser of a get_list worker process
+_list_worker = {}
+
+
+def _init_list_worker(dictionary):
+    _list_worker['dictionary'] = dictionary
+    _list_worker['parser'] = IEMLParser(dictionary=dictionary)
+
+
+def _classify(ieml, parser, dictionary):
+    try:
+        pieml = parser.parse(ieml)
+    except CannotParse:
+        return None
+
+    assert str(pieml) == ieml
+    i, r = get_index(pieml, dictionary)
+    if i == 0 and isinstance(pieml, PolyMorpheme):
+        pieml = pieml.constant[0]
+    return {'ieml': str(pieml),
+            'type': TYPES[i],
+            'paradigm': len(pieml) != 1,
+            'class': GRAMMATICAL_CLASS_NAMES[pieml.grammatical_class].lower().capitalize(),
+            'index': r,
+            'cardinality': 'singular_sequence' if pieml.cardinal == 1 else \
+                ('paradigm' if not isinstance(pieml, Script) or pieml not in dictionary.tables.roots
+                 else 'root_paradigm'),
+            'domains': []
+            }
+
+
+def _classify_chunk(iemls):
+    """
+    :return: the record of each ieml of the list, or None if it cannot be parsed
+    """
+    return [_classify(ieml, _list_worker['parser'], _list_worker['dictionary']) for ieml in iemls]
+
+
+def _publish_folder(folder, write):
+    """
+    Write a cache folder with write(path) in a temporary folder of this thread, then move it to folder. If an
+    other process published the folder first, its folder is kept.
+    """
+    tmp = os.path.join(os.path.dirname(folder),
+                       '.tmp-{}-{}-{}'.format(os.getpid(), threading.get_ident(), os.path.basename(folder)))
+    write(tmp)
+    try:
+        os.replace(tmp, folder)
+    except OSError:
+        # a non empty folder can't be replaced
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isdir(folder):
+            raise
+
+
+class _DescriptorsState:
+    def __init__(self, folder, cache_folder):
+        self.descriptor_index = DescriptorIndex(folder, cache_folder=cache_folder)
+        self.search_index = None
 
 
 def _normalize_inhibitions(inhibitions):
     return inhibitions
 
 
+# number of ieml path resolutions kept in memory
+PATH_CACHE_SIZE = 1 << 16
+
+
 class Structure:
     def __init__(self, df):
         assert list(df.columns) == ['ieml', 'key', 'value']
@@ -55,7 +127,11 @@ class Structure:
         ieml, key, _ = normalize_key(ieml, key, None, parse_ieml=False, partial=False, structure=True)
 
         try:
-            return self.df.loc(axis=0)[(ieml, key)].to_dict('list')['value']
+            res = self.df.loc(axis=0)[(ieml, key)]
+            if isinstance(res, pandas.Series):
+                return res.to_list()
+            else:
+                return res.to_dict('list')['value']
         except KeyError:
             return []
 
@@ -85,13 +161,28 @@ class IEMLDatabase:
         Word: ('word', 10)
     }
 
+    # class folder -> size of the prefix folder of the filenames
+    _PREFIX_SIZE = dict(CLASS_TO_FOLDER.values())
+
     MAX_IEML_NAME_SIZE = 100
     HASH_SIZE = 10
 
     def __init__(self, folder,
                  cache_folder=None,
-                 use_cache=True):
+                 use_cache=True,
+                 gitdb=None,
+                 cache_versions=None):
+        """
+        :param folder: the database folder
+        :param cache_folder: the folder of the cache files, default to the database folder
+        :param use_cache: if False, nothing is cached on the disk
+        :param gitdb: the GitInterface of the folder, if set the dictionary and the usls list are also cached by
+        the git tree id of their files, in cache_versions
+        :param cache_versions: the VersionedCacheStore of the cached versions, default to one in
+        CACHE_VERSIONS_FOLDER
+        """
         self.folder = folder
+        self.gitdb = gitdb
 
         self.use_cache = use_cache
         self.cache_folder = cache_folder
@@ -104,46 +195,123 @@ class IEMLDatabase:
         else:
             self.cache_folder = None
 
+        self.cache_versions = None
+        if self.use_cache and self.gitdb is not None:
+            self.cache_versions = cache_versions if cache_versions is not None else VersionedCacheStore()
+
+        self._descriptors_state = self._get_descriptors_state()
+
+    def _get_descriptors_state(self):
+        # the descriptors are shared by all the instances on this folder and cache folder, pinned so that the
+        # instances never end up with different descriptor states
+        return registry.get(self.folder, 'descriptors', self.cache_folder,
+                            lambda: _DescriptorsState(self.folder, self.cache_folder), pin=True)
+
+    @property
+    def _descriptor_index(self) -> DescriptorIndex:
+        return self._descriptors_state.descriptor_index
+
+    @property
+    def _search_index(self) -> DescriptorSearchIndex:
+        return self._descriptors_state.search_index
+
+    @_search_index.setter
+    def _search_index(self, search_index):
+        self._descriptors_state.search_index = search_index
+
     def __str__(self):
         return "<{} ({} cache={})>".format(self.__module__, self.folder, self.cache_folder)
 
+    def tree_version(self, subtree):
+        """
+        :return: the git tree id of the subtree if it has no uncommitted change, None otherwise or without git
+        """
+        if self.cache_versions is None:
+            return None
+        return self.gitdb.tree_id(subtree)
+
 
-    def filename_of(self, ieml):
+    @classmethod
+    @lru_cache(maxsize=PATH_CACHE_SIZE)
+    def filename_of(cls, ieml):
         l = str(ieml)
-        if len(l) > self.MAX_IEML_NAME_SIZE:
-            l = "{}|{}".format(l[:self.MAX_IEML_NAME_SIZE - self.HASH_SIZE - 1],
-                               sha224(l.encode('utf8')).hexdigest()[:self.HASH_SIZE])
+        if len(l) > cls.MAX_IEML_NAME_SIZE:
+            l = "{}|{}".format(l[:cls.MAX_IEML_NAME_SIZE - cls.HASH_SIZE - 1],
+                               sha224(l.encode('utf8')).hexdigest()[:cls.HASH_SIZE])
         return l
 
-    def path_of(self, _ieml, descriptor=True, mkdir=False, normalize=True):
-        if isinstance(_ieml, str):
-            ieml = IEMLParser().parse(_ieml)
-        else:
-            ieml = _ieml
-
-        if descriptor:
-            ext = '.desc'
-        else:
-            ext = '.ieml'
-
+    @classmethod
+    def _resolution_of(cls, ieml):
         if isinstance(ieml, InstancedUSL):
-                class_folder, prefix_sixe = self.CLASS_TO_FOLDER[ieml.usl.__class__]
+            class_folder, _ = cls.CLASS_TO_FOLDER[ieml.usl.__class__]
         else:
-            class_folder, prefix_sixe = self.CLASS_TO_FOLDER[ieml.__class__]
-
-        if normalize:
-            filename = self.filename_of(ieml)
+            class_folder, _ = cls.CLASS_TO_FOLDER[ieml.__class__]
+
+        return class_folder, len(ieml) != 1, str(ieml)
+
+    @classmethod
+    @lru_cache(maxsize=PATH_CACHE_SIZE)
+    def _resolve(cls, ieml):
+        # (class_folder, is_paradigm, normalized ieml) of an ieml string, parsed at the first call only
+        return cls._resolution_of(default_parser().parse(ieml))
+
+    def normalize_ieml(self, ieml):
+        """
+        :param ieml: an ieml string or a parsed ieml
+        :return: the normalized ieml string, the strings are only parsed the first time they are seen
+        """
+        if ieml is None or not isinstance(ieml, str):
+            return str(ieml) if ieml is not None else None
+        return self._resolve(ieml)[2]
+
+    def resolve_path(self, ieml, normalize=True) -> Tuple[str, bool, str]:
+        """
+        Resolve the location of an ieml in the database. The resolutions of the ieml strings are kept in a
+        bounded LRU cache.
+
+        :param ieml: an ieml string or a parsed ieml
+        :param normalize: if False, the filename is computed from ieml as given instead of its normalized form
+        :return: the tuple (class_folder, is_paradigm, filename)
+        """
+        if isinstance(ieml, str):
+            class_folder, is_paradigm, normalized = self._resolve(ieml)
         else:
-            filename = self.filename_of(_ieml)
+            class_folder, is_paradigm, normalized = self._resolution_of(ieml)
+
+        return class_folder, is_paradigm, self.filename_of(normalized if normalize else str(ieml))
+
+    def resolve_paths(self, iemls, normalize=True) -> List[Tuple[str, bool, str]]:
+        """
+        Bulk version of resolve_path, each distinct ieml is resolved once.
+        """
+        resolved = {}
+        res = []
+        for ieml in iemls:
+            key = (str(ieml), isinstance(ieml, str))
+            if key not in resolved:
+                resolved[key] = self.resolve_path(ieml, normalize=normalize)
+            res.append(resolved[key])
+        return res
 
-        prefix = filename[:prefix_sixe]
+    def _path(self, resolution, descriptor=True, mkdir=False):
+        class_folder, is_paradigm, filename = resolution
+        prefix = filename[:self._PREFIX_SIZE[class_folder]]
 
-        p = os.path.join(self.folder, class_folder,
-                         'singular' if len(ieml) == 1 else 'paradigm', prefix)
+        p = os.path.join(self.folder, class_folder, 'paradigm' if is_paradigm else 'singular', prefix)
         if mkdir:
             os.makedirs(p, exist_ok=True)
 
-        return os.path.join(p, filename + ext)
+        return os.path.join(p, filename + ('.desc' if descriptor else '.ieml'))
+
+    def path_of(self, _ieml, descriptor=True, mkdir=False, normalize=True):
+        return self._path(self.resolve_path(_ieml, normalize=normalize), descriptor=descriptor, mkdir=mkdir)
+
+    def paths_of(self, iemls, descriptor=True, mkdir=False, normalize=True) -> List[str]:
+        """
+        Bulk version of path_of
+        """
+        return [self._path(r, descriptor=descriptor, mkdir=mkdir)
+                for r in self.resolve_paths(iemls, normalize=normalize)]
 
     @monitor_decorator("list content")
     def list(self, type=None, paradigm=None, parse=False, ):
@@ -155,12 +323,7 @@ class IEMLDatabase:
             if paradigm is not None:
                 p = os.path.join(p, 'paradigm' if paradigm else 'singular')
 
-        p1 = subprocess.Popen("find -path *.desc -print0".split(), stdout=subprocess.PIPE, cwd=p)
-        p2 = subprocess.Popen("xargs -0 cat".split(), stdin=p1.stdout, stdout=subprocess.PIPE, cwd=p)
-        p3 = subprocess.Popen(["cut", "-f2", '-d', '"'], stdin=p2.stdout, stdout=subprocess.PIPE, cwd=p)
-        p4 = subprocess.Popen(["uniq"], stdin=p3.stdout, stdout=subprocess.PIPE, cwd=p)
-
-        res = [s.strip().decode('utf8') for s in p4.stdout.readlines() if s.strip()]
+        res = list_iemls(p)
 
         if parse:
             parser = IEMLParser(dictionary=self.get_dictionary())
@@ -193,128 +356,290 @@ class IEMLDatabase:
     @monitor_decorator("Get descriptors")
     def get_descriptors(self, files_list=None):
         if files_list is not None:
-            p1 = subprocess.Popen(['echo', '-ne', r'\0'.join(files_list)],
-                                  stdout=subprocess.PIPE, cwd=self.folder)
-            # p1 = subprocess.Popen(['sed', '-e', r's/\n/\x0/g'], stdin=p0.stdout,
-            #                       stdout=subprocess.PIPE, cwd=self.folder)
-        else:
-            p1 = subprocess.Popen("find -path *.desc -print0".split(),
-                                  stdout=subprocess.PIPE, cwd=self.folder)
-
-        p2 = subprocess.Popen("xargs -0 cat".split(), stdin=p1.stdout, stdout=subprocess.PIPE, cwd=self.folder)
-        try:
-            r = pandas.read_csv(p2.stdout, sep=' ', header=None)
-            r.columns=['ieml', 'language', 'descriptor', 'value']
-        except EmptyDataError:
-            r = pandas.DataFrame(columns=['ieml', 'language', 'descriptor', 'value'])
-
-        return Descriptors(r)
+            return Descriptors(read_descriptors(self.folder, files_list=files_list))
+
+        # only re-read the descriptor files that changed since the last call
+        self._descriptor_index.refresh()
+        self._sync_search_index()
+        return self._descriptor_index.descriptors
+
+    def _sync_search_index(self):
+        # update the search index with the ieml re-read by the last refresh of the descriptor index
+        if self._search_index is not None:
+            descriptors = self._descriptor_index.descriptors
+            for ieml in self._descriptor_index.changed_iemls:
+                self._search_index.set_descriptor(ieml, descriptors.get_descriptor(ieml))
+
+    def get_search_index(self) -> DescriptorSearchIndex:
+        """
+        Return the full text index of the descriptor values, built at the first call. It is then updated by
+        add_descriptor and remove_descriptor, and by get_descriptors for the files changed on disk.
+        """
+        if self._search_index is None:
+            self._search_index = DescriptorSearchIndex(self.get_descriptors())
+        return self._search_index
+
+    @monitor_decorator("Search descriptors")
+    def search(self, query, language=None, descriptor=None, limit=50):
+        """
+        Search the ieml whose descriptor values contain all the words of query, as whole words, prefixes or
+        substrings. The matching ignores the case and the accents.
+
+        :param query: the searched text
+        :param language: if set, only search the values in this language
+        :param descriptor: if set, only search the values of this descriptor class
+        :param limit: the maximum number of results
+        :return: the list of (ieml, score) sorted by decreasing score
+        """
+        _, language, descriptor = normalize_key(None, language, descriptor, partial=True)
+        return self.get_search_index().search(query, language=language, descriptor=descriptor, limit=limit)
 
     @monitor_decorator("Get structure")
     def get_structure(self):
-        p1 = subprocess.Popen("find -path *.ieml -print0".split(), stdout=subprocess.PIPE, cwd=os.path.join(self.folder, "morpheme"))
-        p2 = subprocess.Popen("xargs -0 cat".split(), stdin=p1.stdout, stdout=subprocess.PIPE, cwd=os.path.join(self.folder, "morpheme"))
-        r = pandas.read_csv(p2.stdout, sep=' ', header=None)
-        r.columns = ['ieml', 'key', 'value']
-        return Structure(r)
+        return registry.get(self.folder, 'structure', stat_fingerprint(self.folder, "**/*.ieml"),
+                            lambda: Structure(read_structure(self.folder)), source=lambda: self._source('structure'))
 
     @monitor_decorator("Get dictionary")
-    @cache_results_watch_files("morpheme/paradigm/*", 'dictionary')
     def get_dictionary(self):
+        return registry.get(self.folder, 'dictionary', stat_fingerprint(self.folder, "morpheme/paradigm/*"),
+                            self._load_dictionary, source=lambda: self._source('dictionary'))
+
+    # the folder of the files of the registered objects
+    SOURCE_SUBTREES = {'structure': '', 'dictionary': 'morpheme/paradigm'}
+
+    def _source(self, name, commit_id=None):
+        """
+        :return: the git tree id of the files of the registered object name at commit_id (default to the working
+        directory), None without git or if these files have uncommitted changes
+        """
+        if self.gitdb is None:
+            return None
+        return self.gitdb.tree_id(self.SOURCE_SUBTREES[name], commit_id=commit_id)
+
+    def _reload_base(self, name, diff):
+        """
+        :return: the registered object name loaded from the files at the commit the diff starts from, None if
+        there is none or if the diff does not tell its commits
+        """
+        if getattr(diff, 'commit0', None) is None:
+            return None
+        return registry.find(self.folder, name, self._source(name, commit_id=diff.commit0))
+
+    def _register_reloaded(self, name, diff, version, value):
+        """
+        Register the patched object name, only if the files on the disk are the ones of the commit the diff ends
+        to: otherwise the patch does not match the files and the object is left to be fully loaded.
+        """
+        source = self._source(name)
+        if source is not None and source == self._source(name, commit_id=diff.commit1):
+            registry.put(self.folder, name, version, value, source=source)
+
+    @monitor_decorator("Reload from diff")
+    def reload(self, diff):
+        """
+        Patch the loaded descriptors, structure and dictionary with the files changed by a pull or a checkout,
+        instead of loading them again. Only the changed descriptor and structure files are read, and the
+        dictionary is only rebuilt if the paradigms or their structure changed, reusing the tables and the
+        relations of the root paradigms that were not touched.
+
+        The structure and the dictionary are only patched if they were loaded from the files at the commit the
+        diff starts from, and the patched objects are only registered if the files on the disk are the ones at
+        the commit the diff ends to, which requires the gitdb of the database. Otherwise, and for the objects
+        that were not loaded, they are left to be fully loaded at their first access.
+
+        :param diff: the changed files, as returned by GitInterface.diff(commit_before, commit_after)
+        """
+        desc_files = [f for f in diff if f.endswith('.desc')]
+        ieml_files = [f for f in diff if f.endswith('.ieml')]
+        if desc_files or ieml_files:
+            self._invalidate_record_index()
+
+        if desc_files and self._descriptor_index._descriptors is not None:
+            self._descriptor_index.refresh(paths=desc_files)
+            self._sync_search_index()
+
+        structure = self._reload_base('structure', diff)
+        if structure is not None:
+            if ieml_files:
+                iemls = {diff[f]['ieml'] for f in ieml_files}
+                paths = [os.path.join(self.folder, f) for f in ieml_files]
+                rows = read_files([p for p in paths if os.path.isfile(p)], len(STRUCTURE_COLUMNS))
+
+                df = structure.df.reset_index()
+                structure = Structure(pandas.concat([df[~df['ieml'].isin(iemls)],
+                                                     pandas.DataFrame(rows, columns=STRUCTURE_COLUMNS, dtype=str)],
+                                                    ignore_index=True))
+            self._register_reloaded('structure', diff, stat_fingerprint(self.folder, "**/*.ieml"), structure)
+
+        dictionary = self._reload_base('dictionary', diff)
+        if dictionary is not None:
+            # the dictionary only depends on the list of the paradigms and on their structure
+            paradigm_files = [f for f in diff if f.startswith('morpheme/paradigm/') and
+                              (f.endswith('.ieml') or diff[f]['is_new'] or diff[f]['is_removed'])]
+            if paradigm_files:
+                dictionary = Dictionary(self.list('morpheme', paradigm=True), self.get_structure(),
+                                        previous=dictionary)
+            self._register_reloaded('dictionary', diff, stat_fingerprint(self.folder, "morpheme/paradigm/*"),
+                                    dictionary)
+
+    @cache_results_watch_files("morpheme/paradigm/*", 'dictionary', subtree='morpheme/paradigm')
+    def _load_dictionary(self):
         return Dictionary(self.list('morpheme', paradigm=True), self.get_structure())
 
+    @monitor_decorator("Get dictionary snapshot")
+    def get_dictionary_snapshot(self, mmap=True):
+        """
+        Return the dictionary as a DictionarySnapshot. The snapshot is written in the cache folder and memory
+        mapped, then the relations can be queried without unpickling or building the Script objects.
+
+        :param mmap: memory map the snapshot arrays
+        :return: the DictionarySnapshot of the dictionary
+        """
+        if not self.use_cache:
+            return DictionarySnapshot.from_dictionary(self.get_dictionary())
+
+        cache = FolderWatcherCache(self.folder, "morpheme/paradigm/*", cache_folder=self.cache_folder,
+                                   name='dictionary_snapshot')
+        folder = cache.cache_file
+        if not os.path.isdir(folder):
+            for c in cache._cache_candidates():
+                shutil.rmtree(c, ignore_errors=True)
+
+            _publish_folder(folder, DictionarySnapshot.from_dictionary(self.get_dictionary()).save)
+
+        return DictionarySnapshot.load(folder, mmap=mmap)
+
     @monitor_decorator("Get list of all usls")
-    @cache_results_watch_files("morpheme/*/*.desc", 'all_usls')
-    def get_list(self):
-        res = {}
+    @cache_results_watch_files("morpheme/*/*.desc", 'all_usls', subtree='morpheme')
+    def get_list(self, workers=None):
+        """
+        Return the list of all the described usls, with their classification and descriptors, sorted by index.
+
+        :param workers: the number of processes that parse and classify the usls, default to the number of
+        cpus. The usls are parsed in the current process if workers is 1 or if there are only a few of them.
+        """
         dictionary = self.get_dictionary()
-        parser = IEMLParser(dictionary=dictionary)
+        index = self.get_descriptors().index
+        iemls = sorted(index)
 
-        for (ieml, lang, desc), (v,) in tqdm(self.get_descriptors().df.iterrows(),
-                                             "List all descriptors at {}".format(self.folder)):
-            if ieml not in res:
-                try:
-                    pieml = parser.parse(ieml)
-                except CannotParse:
-                    continue
-
-                assert str(pieml) == ieml
-                i, r = get_index(pieml, dictionary)
-                if i == 0 and isinstance(pieml, PolyMorpheme):
-                    pieml = pieml.constant[0]
-                res[ieml] = {'ieml': str(pieml),
-                             'type': TYPES[i],
-                             'paradigm': len(pieml) != 1,
-                             'class': GRAMMATICAL_CLASS_NAMES[pieml.grammatical_class].lower().capitalize(),
-                             'index': r,
-                             'cardinality': 'singular_sequence' if pieml.cardinal == 1 else \
-                                 ('paradigm' if not isinstance(pieml,
-                                                               Script) or pieml not in dictionary.tables.roots
-                                 else 'root_paradigm'),
-                             'domains': []
-                             }
-            if desc not in res[ieml]:
-                res[ieml][desc] = {l: [] for l in LANGUAGES}
-
-            res[ieml][desc][lang].append(v)
-
-        return sorted(res.values(), key=lambda e: e['index'])
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(iemls) < LIST_PARALLEL_MIN_SIZE:
+            parser = IEMLParser(dictionary=dictionary)
+            records = [_classify(ieml, parser, dictionary) for ieml in iemls]
+        else:
+            chunk_size = -(-len(iemls) // (workers * 4))
+            chunks = [iemls[i:i + chunk_size] for i in range(0, len(iemls), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_list_worker,
+                                     initargs=(dictionary,)) as executor:
+                records = list(chain.from_iterable(tqdm(executor.map(_classify_chunk, chunks), total=len(chunks),
+                                                        desc="List all descriptors at {}".format(self.folder))))
+
+        res = []
+        for ieml, record in zip(iemls, records):
+            if record is None:
+                continue
+
+            descs = index[ieml]
+            for l, d in sorted((l, d) for d, langs in descs.items() for l in langs):
+                if d not in record:
+                    record[d] = {l: [] for l in LANGUAGES}
+                record[d][l].extend(descs[d][l])
+            res.append(record)
+
+        return sorted(res, key=lambda e: e['index'])
+
+    @monitor_decorator("Get usls record index")
+    def get_record_index(self) -> RecordIndex:
+        """
+        Return the RecordIndex of the get_list records, written in the cache folder and rebuilt when a
+        descriptor or a structure file changes. The index is shared by the instances of the folder until a write
+        or a reload.
+        """
+        return registry.get(self.folder, 'record_index', self.cache_folder, self._load_record_index)
+
+    def _load_record_index(self):
+        # the records depend on the descriptors, and on the dictionary and the structure that classify the usls
+        cache = FolderWatcherCache(self.folder, "**/*.desc", cache_folder=self.cache_folder, name='usls_index')
+        folder = '{}.{}'.format(cache.cache_file, stat_fingerprint(self.folder, "**/*.ieml"))
+        if not os.path.isdir(folder):
+            for c in cache._cache_candidates():
+                shutil.rmtree(c, ignore_errors=True)
+
+            records = self.get_list()
+            _publish_folder(folder, lambda path: RecordIndex.write(path, records))
+
+        return RecordIndex(folder)
+
+    def _invalidate_record_index(self):
+        registry.invalidate(self.folder, names=['record_index'])
+
+    def iter_list(self, type=None, class_=None, paradigm=None, offset=0, limit=None):
+        """
+        Iterate over the records of get_list that match the filters, from the offset-th to the
+        (offset + limit)-th. With a cache, the records are read one by one from the record index, only the
+        records of the page are unpickled.
+
+        :param type: the record type (morpheme, polymorpheme, ...)
+        :param class_: the grammatical class (Noun, Verb, Auxiliary)
+        :param paradigm: if set, only iterate over the paradigms (True) or the singular usls (False)
+        :param offset: the number of matching records to skip
+        :param limit: the maximum number of records
+        """
+        if not self.use_cache:
+            records = (r for r in self.get_list() if RecordIndex.match(r, type=type, class_=class_, paradigm=paradigm))
+            yield from islice(records, offset, offset + limit if limit is not None else None)
+            return
+
+        yield from self.get_record_index().iter(type=type, class_=class_, paradigm=paradigm,
+                                                offset=offset, limit=limit)
+
+    def bulk_write(self) -> BulkWriter:
+        """
+        Return a context manager that buffers add_descriptor, remove_descriptor, add_structure and
+        remove_structure operations and applies them at exit, reading and writing each affected file once.
+        The number of files written or removed is then available in its `files_touched` attribute.
+        """
+        return BulkWriter(self)
 
     def add_descriptor(self, ieml, language, descriptor, value):
-        ieml, language, descriptor = normalize_key(ieml, language, descriptor,
-                                                   parse_ieml=True, partial=False)
-        value = _normalize_value(value)
+        ieml, language, descriptor = normalize_key(self.normalize_ieml(ieml), language, descriptor,
+                                                   parse_ieml=False, partial=False)
+        value = normalize_value(value)
         if not value:
             return
 
-        with open(self.path_of(ieml, mkdir=True), 'a', encoding='utf8') as fp:
+        path = self.path_of(ieml, mkdir=True)
+        self._descriptor_index.invalidate(path)
+        with open(path, 'a', encoding='utf8') as fp:
             fp.write('"{}" {} {} "{}"\n'.format(
                 self.escape_value(str(ieml)),
                 language,
                 descriptor,
                 self.escape_value(value)))
+        self._invalidate_record_index()
+
+        if self._search_index is not None:
+            self._search_index.add(ieml, language, descriptor, value)
 
     @monitor_decorator('remove_key')
     def remove_descriptor(self, ieml, language=None, descriptor=None, value=None, normalize=True):
-        ieml, language, descriptor = normalize_key(ieml, language, descriptor,
-                                                   parse_ieml=True, partial=True)
-
-        path = self.path_of(ieml, mkdir=True, normalize=normalize)
-        if not os.path.isfile(path):
-            return
-
-        if descriptor is None and language is None and value is None:
-            os.remove(path)
-            return
-
-        if descriptor is None or language is None:
-            if language is None:
-                for l in LANGUAGES:
-                    self.remove_descriptor(ieml, l, descriptor)
-            else:
-                for d in DESCRIPTORS_CLASS:
-                    self.remove_descriptor(ieml, language, d)
-            return
-
-        if value:
-            value = _normalize_value(value)
-
-        with open(path, "r", encoding='utf8') as f:
-            lines = [l for l in f.readlines()
-                     if not l.startswith('"{}" {} {} '.format(str(ieml), language, descriptor) + \
-                                        ('"{}"'.format(self.escape_value(value)) if value is not None else ''))]
-
-        with open(path, "w", encoding='utf8') as f:
-            f.writelines(lines)
+        # the file is read and rewritten once, whatever the number of (language, descriptor) removed
+        with self.bulk_write() as w:
+            w.remove_descriptor(ieml, language, descriptor, value, normalize=normalize)
 
     def add_structure(self, ieml, key, value):
-        ieml, key, value = normalize_key(ieml, key, value, parse_ieml=True, partial=False, structure=True)
+        ieml, key, value = normalize_key(self.normalize_ieml(ieml), key, value, parse_ieml=False, partial=False,
+                                         structure=True)
 
         with open(self.path_of(ieml, descriptor=False, mkdir=True), 'a', encoding='utf8') as fp:
             fp.write('"{}" {} "{}"\n'.format(str(ieml), key, value))
+        self._invalidate_record_index()
 
     def remove_structure(self, ieml, key=None, value=None, normalize=True):
-        ieml, key, value = normalize_key(ieml, key, value, parse_ieml=True, partial=True, structure=True)
+        ieml, key, value = normalize_key(self.normalize_ieml(ieml), key, value, parse_ieml=False, partial=True,
+                                         structure=True)
 
         path = self.path_of(ieml, descriptor=False, mkdir=True, normalize=normalize)
 
@@ -323,6 +648,7 @@ class IEMLDatabase:
 
         if key is None:
             os.remove(path)
+            self._invalidate_record_index()
             return
 
         with open(path, "r", encoding='utf8') as f:
@@ -332,6 +658,7 @@ class IEMLDatabase:
 
         with open(path, "w", encoding='utf8') as f:
             f.writelines(lines)
+        self._invalidate_record_index()
 
     def escape_value(self, v):
         return v.replace('"', '""').replace('\n', '\\n')
@@ -0,0 +1,216 @@
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from io import StringIO
+from itertools import chain
+from typing import List, Iterable
+
+import pandas
+
+DESCRIPTORS_COLUMNS = ['ieml', 'language', 'descriptor', 'value']
+STRUCTURE_COLUMNS = ['ieml', 'key', 'value']
+
+# the folders of the database that contains descriptor files, one per USL type
+CONTENT_FOLDERS = ['morpheme', 'polymorpheme', 'lexeme', 'word']
+
+# number of files read by a single task of the pool
+CHUNK_SIZE = 256
+
+
+def _scan(path, extension, res):
+    try:
+        it = os.scandir(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.'):
+                    _scan(entry.path, extension, res)
+            elif entry.name.endswith(extension):
+                res.append(entry.path)
+
+
+def list_files(folder: str, extension: str, subfolders: Iterable[str] = None) -> List[str]:
+    """
+    Recursively list the files ending by `extension` under folder, with os.scandir.
+
+    :param folder: the root of the walk
+    :param extension: the file extension to match ('.desc' or '.ieml')
+    :param subfolders: if set, only walk these subfolders of `folder`
+    :return: the sorted list of the absolute paths of the matching files
+    """
+    res = []
+    if subfolders is None:
+        _scan(folder, extension, res)
+    else:
+        for sub in subfolders:
+            _scan(os.path.join(folder, sub), extension, res)
+
+    return sorted(res)
+
+
+def _terminated(data):
+    if data and not data.endswith(b'\n'):
+        data += b'\n'
+    return data
+
+
+def _read_bytes(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            b = os.read(fd, 1 << 16)
+            if not b:
+                break
+            chunks.append(b)
+    finally:
+        os.close(fd)
+
+    return _terminated(b''.join(chunks))
+
+
+def _tokenize(data: str):
+    return [row for row in csv.reader(StringIO(data), delimiter=' ', quotechar='"') if row]
+
+
+def read_file(path: str, width: int) -> List[List[str]]:
+    """
+    Tokenize a database file. Each line is a space separated list of `width` fields, the fields can be quoted
+    with '"' (quotes inside a field are doubled).
+
+    :param path: the file to read
+    :param width: the expected number of fields per line
+    :return: the list of rows of the file
+    """
+    rows = _tokenize(_read_bytes(path).decode('utf8'))
+
+    for row in rows:
+        if len(row) != width:
+            raise ValueError("Invalid line in {}, expected {} fields: {}".format(path, width, ' '.join(row)))
+
+    return rows
+
+
+# a line that separates the files in a chunk, it is tokenized as a row of width 1
+_FILE_SEPARATOR = b'\x00\n'
+
+
+def _read_chunk(paths, width, grouped=False):
+    # tokenize the files of the chunk in a single pass, it is much cheaper than a csv reader per file
+    sep = _FILE_SEPARATOR if grouped else b''
+    rows = _tokenize(sep.join(map(_read_bytes, paths)).decode('utf8'))
+
+    if any(len(row) != width for row in rows if not grouped or row != ['\x00']):
+        # find the faulty file to report it
+        if grouped:
+            return [read_file(path, width) for path in paths]
+        return [row for path in paths for row in read_file(path, width)]
+
+    if grouped:
+        return _split_files(rows)
+
+    return rows
+
+
+def _split_files(rows):
+    res = [[]]
+    for row in rows:
+        if row == ['\x00']:
+            res.append([])
+        else:
+            res[-1].append(row)
+    return res
+
+
+def tokenize_blobs(blobs: List[bytes], width: int, names: List[str] = None) -> List[List[List[str]]]:
+    """
+    Tokenize the content of several files already in memory (git blobs for instance) in a single pass.
+
+    :param blobs: the content of the files
+    :param width: the expected number of fields per line
+    :param names: the names of the files, used in the error messages
+    :return: the list of rows of each file
+    """
+    blobs = [_terminated(b) for b in blobs]
+    rows = _tokenize(_FILE_SEPARATOR.join(blobs).decode('utf8'))
+
+    if any(len(row) != width for row in rows if row != ['\x00']):
+        for i, b in enumerate(blobs):
+            for row in _tokenize(b.decode('utf8')):
+                if len(row) != width:
+                    raise ValueError("Invalid line in {}, expected {} fields: {}".format(
+                        names[i] if names else i, width, ' '.join(row)))
+
+    return _split_files(rows) if blobs else []
+
+
+def read_files(paths: List[str], width: int, workers: int = None, processes: bool = False,
+               grouped: bool = False) -> List[List[str]]:
+    """
+    Read and tokenize all the files in a pool of workers.
+
+    :param paths: the files to read
+    :param width: the expected number of fields per line
+    :param workers: the size of the pool, if 0 the files are read in the current thread
+    :param processes: use a process pool instead of a thread pool
+    :param grouped: if True, return a list of rows per file instead of a flat list of rows
+    :return: the rows of all the files, in the order of `paths`
+    """
+    if workers is None:
+        workers = min(32, (os.cpu_count() or 1) + 4) if not processes else (os.cpu_count() or 1)
+
+    if workers == 0 or len(paths) <= CHUNK_SIZE:
+        return _read_chunk(paths, width, grouped) if paths else []
+
+    chunks = [paths[i:i + CHUNK_SIZE] for i in range(0, len(paths), CHUNK_SIZE)]
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor(max_workers=workers) as pool:
+        return list(chain.from_iterable(pool.map(_read_chunk, chunks,
+                                                 [width] * len(chunks), [grouped] * len(chunks))))
+
+
+def read_descriptors(folder: str, files_list: List[str] = None, **kwargs) -> pandas.DataFrame:
+    """
+    Build the descriptors table ('ieml', 'language', 'descriptor', 'value') of the database at `folder`.
+
+    :param folder: the database folder
+    :param files_list: if set, only read these files (relative to `folder`)
+    :param kwargs: the pool arguments of `read_files`
+    :return: the descriptors DataFrame
+    """
+    if files_list is None:
+        paths = list_files(folder, '.desc', CONTENT_FOLDERS)
+    else:
+        paths = [os.path.join(folder, f) for f in files_list]
+
+    return pandas.DataFrame(read_files(paths, len(DESCRIPTORS_COLUMNS), **kwargs),
+                            columns=DESCRIPTORS_COLUMNS, dtype=str)
+
+
+def read_structure(folder: str, **kwargs) -> pandas.DataFrame:
+    """
+    Build the structure table ('ieml', 'key', 'value') from the morpheme structure files of the database at `folder`.
+
+    :param folder: the database folder
+    :param kwargs: the pool arguments of `read_files`
+    :return: the structure DataFrame
+    """
+    paths = list_files(os.path.join(folder, 'morpheme'), '.ieml')
+    return pandas.DataFrame(read_files(paths, len(STRUCTURE_COLUMNS), **kwargs),
+                            columns=STRUCTURE_COLUMNS, dtype=str)
+
+
+def list_iemls(folder: str, **kwargs) -> List[str]:
+    """
+    List the IEML described by the descriptor files under `folder` (each descriptor file
+    describes a single IEML).
+
+    :param folder: the folder to walk
+    :param kwargs: the pool arguments of `read_files`
+    :return: the unique IEML, in files order
+    """
+    rows = read_files(list_files(folder, '.desc'), len(DESCRIPTORS_COLUMNS), **kwargs)
+    return list(dict.fromkeys(row[0] for row in rows))
@@ -0,0 +1,103 @@
+import json
+import os
+import pickle
+from typing import List, Iterator
+
+import numpy as np
+
+from ieml.constants import TYPES
+
+RECORD_INDEX_VERSION = 1
+
+# the filtered columns, one .npy file each
+_COLUMNS = ['type', 'class', 'paradigm']
+
+
+def _normalize_class(class_):
+    return class_.lower().capitalize()
+
+
+class RecordIndex:
+    def __init__(self, folder: str):
+        """
+        Persisted list of the usl records of get_list, in the get_list order. The records are pickled one by one
+        in a single file, with an array of their offsets and small memory mapped arrays of the filtered columns
+        (type, class and paradigm). A page of a filtered query only unpickles the records of the page.
+
+        :param folder: the folder written by `RecordIndex.write`
+        """
+        with open(os.path.join(folder, 'meta.json')) as fp:
+            meta = json.load(fp)
+
+        if meta['version'] != RECORD_INDEX_VERSION:
+            raise ValueError("Unsupported record index version {} in {}".format(meta['version'], folder))
+
+        self.folder = folder
+        self.classes = meta['classes']
+        self.offsets = np.load(os.path.join(folder, 'offsets.npy'), mmap_mode='r')
+        self.columns = {c: np.load(os.path.join(folder, c + '.npy'), mmap_mode='r') for c in _COLUMNS}
+
+    @staticmethod
+    def write(folder: str, records: List[dict]) -> None:
+        """
+        :param folder: the index folder, created if needed
+        :param records: the records, as returned by IEMLDatabase.get_list
+        """
+        os.makedirs(folder, exist_ok=True)
+
+        classes = sorted({r['class'] for r in records})
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        with open(os.path.join(folder, 'records.bin'), 'wb') as fp:
+            for i, r in enumerate(records):
+                fp.write(pickle.dumps(r, protocol=4))
+                offsets[i + 1] = fp.tell()
+
+        np.save(os.path.join(folder, 'offsets.npy'), offsets)
+        np.save(os.path.join(folder, 'type.npy'), np.array([TYPES.index(r['type']) for r in records], dtype=np.int8))
+        np.save(os.path.join(folder, 'class.npy'),
+                np.array([classes.index(r['class']) for r in records], dtype=np.int8))
+        np.save(os.path.join(folder, 'paradigm.npy'), np.array([r['paradigm'] for r in records], dtype=bool))
+
+        with open(os.path.join(folder, 'meta.json'), 'w') as fp:
+            json.dump({'version': RECORD_INDEX_VERSION, 'size': len(records), 'classes': classes}, fp)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def select(self, type: str = None, class_: str = None, paradigm: bool = None) -> np.ndarray:
+        """
+        :return: the positions of the records that match the filters
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if type is not None:
+            mask &= self.columns['type'] == (TYPES.index(type) if type in TYPES else -1)
+        if class_ is not None:
+            class_ = _normalize_class(class_)
+            mask &= self.columns['class'] == (self.classes.index(class_) if class_ in self.classes else -1)
+        if paradigm is not None:
+            mask &= self.columns['paradigm'] == bool(paradigm)
+
+        return np.flatnonzero(mask)
+
+    def count(self, type: str = None, class_: str = None, paradigm: bool = None) -> int:
+        return len(self.select(type=type, class_=class_, paradigm=paradigm))
+
+    def iter(self, type: str = None, class_: str = None, paradigm: bool = None,
+             offset: int = 0, limit: int = None) -> Iterator[dict]:
+        """
+        Iterate over the records that match the filters, from the offset-th to the (offset + limit)-th.
+        """
+        selected = self.select(type=type, class_=class_, paradigm=paradigm)
+        selected = selected[offset:offset + limit if limit is not None else None]
+
+        with open(os.path.join(self.folder, 'records.bin'), 'rb') as fp:
+            for i in selected:
+                start, end = self.offsets[i], self.offsets[i + 1]
+                fp.seek(start)
+                yield pickle.loads(fp.read(end - start))
+
+    @staticmethod
+    def match(record: dict, type: str = None, class_: str = None, paradigm: bool = None) -> bool:
+        return (type is None or record['type'] == type) and \
+               (class_ is None or record['class'] == _normalize_class(class_)) and \
+               (paradigm is None or record['paradigm'] == bool(paradigm))
@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# maximum number of objects kept by the registry
+REGISTRY_SIZE = 16
+
+
+class DatabaseRegistry:
+    def __init__(self, max_size=REGISTRY_SIZE):
+        """
+        Process wide LRU of the objects loaded from the databases (Dictionary, Structure, descriptors),
+        keyed by (database folder, name, version), where the version is a fingerprint of the files the object
+        was loaded from. The IEMLDatabase instances of a folder share the loaded objects instead of reading
+        them again from the disk or the cache.
+
+        The objects are loaded without holding the registry lock: the loads of different keys run concurrently,
+        and the concurrent gets of a key being loaded wait for this load.
+
+        An object can also be registered with its source, an identifier of the content of the files it was
+        loaded from (a git tree id), to find it back by this content whatever the state of the files on the disk.
+
+        :param max_size: the maximum number of objects kept, the least recently used are evicted first. The
+        pinned objects are not counted and never evicted.
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        # key -> source of the entries
+        self._sources = {}
+        # the objects that are kept until invalidated
+        self._pinned = {}
+        # key -> Future of the loads in progress
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get(self, folder, name, version, factory, pin=False, source=None):
+        """
+        :param folder: the database folder
+        :param name: the kind of object ('dictionary', 'structure', ...)
+        :param version: the version of the object for this folder
+        :param factory: a function that loads the object, called if it is not registered
+        :param pin: if True, the object is never evicted, it is shared by the instances until invalidated
+        :param source: a function returning the source of the object, called before loading it, or None
+        :return: the registered object
+        """
+        key = (os.path.abspath(folder), name, version)
+        with self._lock:
+            if key in self._pinned:
+                return self._pinned[key]
+
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            future = self._loading.get(key)
+            loading = future is None
+            if loading:
+                future = self._loading[key] = Future()
+
+        if not loading:
+            return future.result()
+
+        try:
+            source = source() if source is not None else None
+            value = factory()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+            if pin:
+                self._pinned[key] = value
+            else:
+                self._add(key, value, source)
+        future.set_result(value)
+        return value
+
+    def put(self, folder, name, version, value, source=None):
+        """
+        Register value as the object name of folder at version, loaded from source.
+        """
+        key = (os.path.abspath(folder), name, version)
+        with self._lock:
+            self._add(key, value, source)
+
+    def _add(self, key, value, source=None):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._sources.pop(key, None)
+        if source is not None:
+            self._sources[key] = source
+
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            self._sources.pop(evicted, None)
+
+    def find(self, folder, name, source):
+        """
+        :return: the most recently used object name of folder loaded from source, None if there is none
+        """
+        if source is None:
+            return None
+
+        folder = os.path.abspath(folder)
+        with self._lock:
+            for key in reversed(self._entries):
+                if key[0] == folder and key[1] == name and self._sources.get(key) == source:
+                    return self._entries[key]
+        return None
+
+    def invalidate(self, folder=None, names=None):
+        """
+        Drop the registered objects of folder (all the folders if None) and of these names (all if None).
+        """
+        folder = os.path.abspath(folder) if folder is not None else None
+        with self._lock:
+            for entries in (self._entries, self._pinned):
+                for key in [k for k in entries
+                            if (folder is None or k[0] == folder) and (names is None or k[1] in names)]:
+                    del entries[key]
+                    self._sources.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries) + len(self._pinned)
+
+    def __contains__(self, key):
+        folder, name, version = key
+        key = (os.path.abspath(folder), name, version)
+        return key in self._entries or key in self._pinned
+
+
+registry = DatabaseRegistry()
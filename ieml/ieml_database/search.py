@@ -0,0 +1,197 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import List, Tuple, Dict
+
+from ieml.constants import LANGUAGES, DESCRIPTORS_CLASS
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# score of a query token matching an indexed token
+EXACT_SCORE = 3
+PREFIX_SCORE = 2
+SUBSTRING_SCORE = 1
+# bonus when the whole value is equal to the query
+VALUE_SCORE = 1
+
+
+def normalize_text(s: str) -> str:
+    """
+    :return: the accent folded and case folded string
+    """
+    s = unicodedata.normalize('NFKD', s)
+    return ''.join(c for c in s if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(s: str) -> List[str]:
+    """
+    :return: the words of the normalized string
+    """
+    return _TOKEN_RE.findall(normalize_text(s))
+
+
+def trigrams(token: str):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class _Field:
+    """The inverted index of the values of a (language, descriptor)"""
+    def __init__(self):
+        # ieml -> list of (value, normalized value, tokens)
+        self.entries = defaultdict(list)
+        # token -> ieml -> number of entries of the ieml that contain the token
+        self.postings = defaultdict(dict)
+        # sorted list of the tokens, for the prefix queries
+        self.vocabulary = []
+        # trigram -> tokens that contain it, for the substring queries
+        self.trigrams = defaultdict(set)
+
+    def add(self, ieml, value):
+        tokens = set(tokenize(value))
+        self.entries[ieml].append((value, normalize_text(value).strip(), tokens))
+
+        for t in tokens:
+            if t not in self.postings:
+                insort(self.vocabulary, t)
+                for tri in trigrams(t):
+                    self.trigrams[tri].add(t)
+
+            self.postings[t][ieml] = self.postings[t].get(ieml, 0) + 1
+
+    def remove(self, ieml, value=None):
+        entries = self.entries.get(ieml, [])
+        removed = [e for e in entries if value is None or e[0] == value]
+        if not removed:
+            return
+
+        kept = [e for e in entries if not (value is None or e[0] == value)]
+        if kept:
+            self.entries[ieml] = kept
+        else:
+            del self.entries[ieml]
+
+        for _, _, tokens in removed:
+            for t in tokens:
+                post = self.postings[t]
+                post[ieml] -= 1
+                if post[ieml] == 0:
+                    del post[ieml]
+
+                if not post:
+                    del self.postings[t]
+                    del self.vocabulary[bisect_left(self.vocabulary, t)]
+                    for tri in trigrams(t):
+                        self.trigrams[tri].discard(t)
+                        if not self.trigrams[tri]:
+                            del self.trigrams[tri]
+
+    def _match_tokens(self, q) -> Dict[str, int]:
+        res = {}
+        if len(q) >= 3:
+            tris = sorted((self.trigrams.get(tri, set()) for tri in trigrams(q)), key=len)
+            for t in set.intersection(*tris) if tris else ():
+                if q in t:
+                    res[t] = SUBSTRING_SCORE
+
+        i = bisect_left(self.vocabulary, q)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(q):
+            res[self.vocabulary[i]] = PREFIX_SCORE
+            i += 1
+
+        if q in self.postings:
+            res[q] = EXACT_SCORE
+
+        return res
+
+    def search(self, query_tokens, normalized_query) -> Dict[str, int]:
+        scores = None
+        for q in query_tokens:
+            best = {}
+            for t, score in self._match_tokens(q).items():
+                for ieml in self.postings[t]:
+                    if best.get(ieml, 0) < score:
+                        best[ieml] = score
+
+            if scores is None:
+                scores = best
+            else:
+                scores = {ieml: s + best[ieml] for ieml, s in scores.items() if ieml in best}
+
+            if not scores:
+                return {}
+
+        for ieml in scores:
+            if any(e[1] == normalized_query for e in self.entries[ieml]):
+                scores[ieml] += VALUE_SCORE
+
+        return scores
+
+
+class DescriptorSearchIndex:
+    def __init__(self, descriptors=None):
+        """
+        Inverted index over the normalized (accent folded, lower cased and tokenized) descriptor values, one
+        per (language, descriptor class). Queries match the indexed words exactly, by prefix, or by substring
+        with a trigram index.
+
+        :param descriptors: if set, index all the values of this ieml.ieml_database.descriptors.Descriptors
+        """
+        self.fields = {(l, d): _Field() for l in LANGUAGES for d in DESCRIPTORS_CLASS}
+
+        if descriptors is not None:
+            for ieml, descs in descriptors.index.items():
+                for d, langs in descs.items():
+                    for l, values in langs.items():
+                        for v in values:
+                            self.add(ieml, l, d, v)
+
+    def _fields(self, language=None, descriptor=None):
+        return [f for (l, d), f in self.fields.items()
+                if (language is None or l == language) and (descriptor is None or d == descriptor)]
+
+    def add(self, ieml, language, descriptor, value) -> None:
+        self.fields[(language, descriptor)].add(str(ieml), value)
+
+    def remove(self, ieml, language=None, descriptor=None, value=None) -> None:
+        """
+        Remove the values of ieml, filtered by language, descriptor and value if set.
+        """
+        for f in self._fields(language, descriptor):
+            f.remove(str(ieml), value)
+
+    def set_descriptor(self, ieml, descriptor) -> None:
+        """
+        Replace all the values of ieml by the values of descriptor.
+        :param descriptor: a dict descriptor -> language -> values, as returned by Descriptors.get_descriptor
+        """
+        self.remove(ieml)
+        for d, langs in descriptor.items():
+            for l, values in langs.items():
+                for v in values:
+                    self.add(ieml, l, d, v)
+
+    def search(self, query: str, language: str = None, descriptor: str = None,
+               limit: int = 50) -> List[Tuple[str, int]]:
+        """
+        Search the ieml whose values contains all the words of the query.
+
+        :param query: the searched text
+        :param language: if set, only search the values in this language
+        :param descriptor: if set, only search the values of this descriptor class (translations, tags, ...)
+        :param limit: the maximum number of results
+        :return: the list of (ieml, score) sorted by decreasing score
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        normalized_query = normalize_text(query).strip()
+
+        scores = {}
+        for f in self._fields(language, descriptor):
+            for ieml, score in f.search(query_tokens, normalized_query).items():
+                if scores.get(ieml, 0) < score:
+                    scores[ieml] = score
+
+        return sorted(scores.items(), key=lambda e: (-e[1], e[0]))[:limit]
@@ -3,7 +3,7 @@ import tqdm
 
 from ieml import error
 from ieml.ieml_database import IEMLDatabase
-from ieml.constants import INHIBITABLE_RELATIONS, LANGUAGES, DESCRIPTORS_CLASS
+from ieml.constants import INHIBITABLE_RELATIONS, LANGUAGES, DESCRIPTORS_CLASS, STRUCTURE_KEYS
 from ieml.dictionary.script import Script, factorize
 from ieml.usl import USL
 
@@ -65,6 +65,314 @@ def _check_multi_descriptors(descriptor):
     return descriptor
 
 
+# The _plan_* functions validate an operation against the loaded dictionary, descriptors and structure.
+# They return None if there is nothing to change, otherwise the commit message of the operation and a function
+# that writes the changes with an IEMLDatabase or a BulkWriter.
+
+def _plan_set_descriptors(descriptors, ieml, descriptor, value):
+    ieml = _check_ieml(ieml)
+    value = _check_descriptors(value)
+
+    old_trans = {l: descriptors.get_values(ieml=ieml, language=l, descriptor=descriptor) for l in LANGUAGES}
+
+    if all(sorted(value[l]) == sorted(old_trans[l]) for l in LANGUAGES):
+        error("No update needed, db already contains {}:{} for {}".format(descriptor, json.dumps(value), str(ieml)))
+        return None
+
+    # test if after modification there is still at least a descriptor
+    if all(not (descriptors.get_values(ieml=ieml, language=l, descriptor=d) if d != descriptor else value[l])
+           for l in LANGUAGES for d in DESCRIPTORS_CLASS):
+        error('[descriptors] Remove {}'.format(str(ieml)))
+        return '[descriptors] Remove {}'.format(str(ieml)), lambda db: db.remove_descriptor(ieml)
+    # to_add = {l: [e for e in value[l] if e not in old_trans[l]] for l in LANGUAGES}
+    # to_remove = {l: [e for e in old_trans[l] if e not in value[l]] for l in LANGUAGES}
+
+    def apply(db):
+        db.remove_descriptor(ieml, None, descriptor)
+
+        for l in LANGUAGES:
+            for e in value[l]:
+                db.add_descriptor(ieml, l, descriptor, e)
+
+    return '[descriptors] Update {} for {} to {}'.format(descriptor, str(ieml), json.dumps(value)), apply
+
+
+def _plan_set_inhibitions(dictionary, structure, ieml, inhibitions):
+    ieml = _check_ieml(ieml)
+    assert dictionary.tables.root(ieml) == ieml
+
+    inhibitions = _check_inhibitions(inhibitions)
+
+    old_inhib = structure.get_values(ieml, 'inhibition')
+
+    if set(old_inhib) == set(inhibitions):
+        return None
+
+    to_remove = [e for e in old_inhib if e not in inhibitions]
+    to_add = [e for e in inhibitions if e not in old_inhib]
+
+    def apply(db):
+        for e in to_add:
+            db.add_structure(ieml, 'inhibition', e)
+
+        for e in to_remove:
+            db.remove_structure(ieml, 'inhibition', e)
+
+    return '[inhibitions] Update inhibitions for {} to {}'.format(str(ieml), json.dumps(inhibitions)), apply
+
+
+def _plan_add_morpheme_paradigm(dictionary, descriptors, script, translations, comments):
+    script = _check_script(script)
+    if len(script) == 1:
+        raise ValueError("The script is not a paradigm {}, can't use it to define a paradigm.".format(str(script)))
+
+    translations = _check_descriptors(translations)
+    comments = _check_descriptors(comments)
+
+    if script in dictionary.scripts:
+        raise ValueError("Script {} already defined in the dictionary".format(str(script)))
+
+    r_cand = set()
+    for ss in script.singular_sequences:
+        try:
+            r_cand.add(dictionary.tables.root(ss))
+        except KeyError:
+            raise ValueError("No root paradigms contains this script {}".format(str(script)))
+
+    if len(r_cand) != 1:
+        raise ValueError("No root paradigms or too many for script {}".format(str(script)))
+
+    root = next(iter(r_cand))
+
+    message = "[dictionary] Create paradigm {} ({}) for root paradigm {} ({})"\
+        .format(str(script),
+                  " / ".join(
+                      "{}:{}".format(l, ', '.join(descriptors.get_values(script, l, 'translations'))) for l in LANGUAGES),
+                  str(root),
+                  " / ".join(
+                      "{}:{}".format(l, ', '.join(descriptors.get_values(root, l, 'translations'))) for l in LANGUAGES))
+
+    def apply(db):
+        db.remove_descriptor(script)
+        db.remove_structure(script)
+
+        db.add_structure(script, 'is_root', False)
+
+        for l in LANGUAGES:
+            for v in translations[l]:
+                db.add_descriptor(script, language=l, descriptor='translations', value=v)
+
+            for v in comments[l]:
+                db.add_descriptor(script, language=l, descriptor='comments', value=v)
+
+    return message, apply
+
+
+def _plan_delete_morpheme_paradigm(dictionary, descriptors, script):
+    script = _check_script(script)
+    if script in dictionary.scripts and len(script) == 1:
+        raise ValueError("Script {} is not a paradigm".format(str(script)))
+
+    root = dictionary.tables.root(script)
+    message = "[dictionary] Remove paradigm {} ({})"\
+                      .format(str(script),
+                              " / ".join(
+                                  "{}:{}".format(l, ', '.join(descriptors.get_values(script, l, 'translations'))) for l in LANGUAGES),
+                              str(root),
+                              " / ".join(
+                                  "{}:{}".format(l, ', '.join(descriptors.get_values(root, l, 'translations'))) for l in LANGUAGES))
+
+    def apply(db):
+        db.remove_structure(script)
+        db.remove_descriptor(script)
+
+    return message, apply
+
+
+class _PendingDescriptors:
+    def __init__(self, descriptors):
+        """
+        The descriptors once the queued operations of a DBBatch are applied.
+        """
+        self.descriptors = descriptors
+        # (ieml, language, descriptor) -> values changed by the operations
+        self.values = {}
+
+    def get_values(self, ieml, language, descriptor):
+        key = (str(ieml), language, descriptor)
+        if key in self.values:
+            return list(self.values[key])
+        return self.descriptors.get_values(ieml=ieml, language=language, descriptor=descriptor)
+
+    def add_descriptor(self, ieml, language, descriptor, value):
+        self.values[(str(ieml), language, descriptor)] = self.get_values(ieml, language, descriptor) + [value]
+
+    def remove_descriptor(self, ieml, language=None, descriptor=None, value=None, normalize=True):
+        for l in [language] if language is not None else LANGUAGES:
+            for d in [descriptor] if descriptor is not None else DESCRIPTORS_CLASS:
+                self.values[(str(ieml), l, d)] = [v for v in self.get_values(ieml, l, d)
+                                                  if value is not None and v != value]
+
+
+class _PendingStructure:
+    def __init__(self, structure):
+        """
+        The structure once the queued operations of a DBBatch are applied.
+        """
+        self.structure = structure
+        # (ieml, key) -> values changed by the operations
+        self.values = {}
+
+    def get_values(self, ieml, key):
+        if (str(ieml), key) in self.values:
+            return list(self.values[(str(ieml), key)])
+        return self.structure.get_values(ieml, key)
+
+    def add_structure(self, ieml, key, value):
+        self.values[(str(ieml), key)] = self.get_values(ieml, key) + [str(value)]
+
+    def remove_structure(self, ieml, key=None, value=None, normalize=True):
+        for k in [key] if key is not None else STRUCTURE_KEYS:
+            self.values[(str(ieml), k)] = [v for v in self.get_values(ieml, k) if value and v != str(value)]
+
+
+class _PendingWriter:
+    def __init__(self, descriptors, structure):
+        # the writes of the plans, applied to the pending descriptors and structure
+        self.add_descriptor = descriptors.add_descriptor
+        self.remove_descriptor = descriptors.remove_descriptor
+        self.add_structure = structure.add_structure
+        self.remove_structure = structure.remove_structure
+
+
+class BatchFailed(Exception):
+    def __init__(self, message, results):
+        self.message = message
+        self.results = results
+
+    def __repr__(self):
+        return self.message
+
+
+class DBBatch:
+    def __init__(self, transactions: 'DBTransactions', message: str):
+        """
+        Queue of DBTransactions operations applied together in a single commit. The operations are validated
+        against the dictionary loaded once before the batch, and against the descriptors and the structure as they
+        are once the previous operations of the batch are applied. Then all the changes are written with a
+        BulkWriter and committed. If an operation is invalid or the writes fail, nothing is committed and the
+        working directory is reset. As the dictionary is not rebuilt during the batch, a paradigm can only be
+        added or deleted once per batch.
+
+        Used as a context manager, the batch is committed on a clean exit:
+
+            with transactions.batch("Curation session") as batch:
+                batch.set_descriptors(script('wa.'), 'translations', {'en': ['wa']})
+                batch.set_inhibitions(script('O:M:.'), ['opposed'])
+
+        :param transactions: the DBTransactions to commit with
+        :param message: the title of the commit message, followed by the message of each operation
+        """
+        self.transactions = transactions
+        self.message = message
+        self.operations = []
+        # the results of the last commit
+        self.results = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if type is None:
+            self.commit()
+
+    def set_descriptors(self, ieml, descriptor, value):
+        self.operations.append(('set_descriptors', ieml, (ieml, descriptor, value)))
+
+    def set_inhibitions(self, ieml, inhibitions):
+        self.operations.append(('set_inhibitions', ieml, (ieml, inhibitions)))
+
+    def add_morpheme_paradigm(self, script: Script, translations, comments):
+        self.operations.append(('add_morpheme_paradigm', script, (script, translations, comments)))
+
+    def delete_morpheme_paradigm(self, script: Script):
+        self.operations.append(('delete_morpheme_paradigm', script, (script,)))
+
+    def _plan(self, dictionary, descriptors, structure, operation, args):
+        if operation == 'set_descriptors':
+            return _plan_set_descriptors(descriptors, *args)
+        elif operation == 'set_inhibitions':
+            return _plan_set_inhibitions(dictionary, structure, *args)
+        elif operation == 'add_morpheme_paradigm':
+            return _plan_add_morpheme_paradigm(dictionary, descriptors, *args)
+        elif operation == 'delete_morpheme_paradigm':
+            return _plan_delete_morpheme_paradigm(dictionary, descriptors, *args)
+        raise ValueError("Unknown operation {}".format(operation))
+
+    def commit(self):
+        """
+        Validate and apply all the queued operations in a single commit.
+
+        :return: the result of each operation, in the queue order: a dict with the 'operation' name, the 'ieml',
+        'changed' (False if there was nothing to update) and the commit 'message' or the 'error'
+        :raise BatchFailed: if an operation is invalid or the commit failed, with the results
+        """
+        db = self.transactions._db()
+        dictionary = db.get_dictionary()
+        descriptors = _PendingDescriptors(db.get_descriptors())
+        structure = _PendingStructure(db.get_structure())
+        pending = _PendingWriter(descriptors, structure)
+        paradigms = set()
+
+        results = []
+        plans = []
+        for operation, ieml, args in self.operations:
+            result = {'operation': operation, 'ieml': str(ieml), 'changed': False, 'message': None, 'error': None}
+            try:
+                if operation in ('add_morpheme_paradigm', 'delete_morpheme_paradigm'):
+                    if str(ieml) in paradigms:
+                        raise ValueError("Paradigm {} already added or deleted in this batch".format(str(ieml)))
+                    paradigms.add(str(ieml))
+
+                plan = self._plan(dictionary, descriptors, structure, operation, args)
+            except (AssertionError, ValueError, KeyError) as e:
+                result['error'] = str(e) or repr(e)
+            else:
+                if plan is not None:
+                    result['changed'] = True
+                    result['message'] = plan[0]
+                    plans.append(plan)
+                    # the next operations are validated against the changes of this one
+                    plan[1](pending)
+            results.append(result)
+
+        self.operations = []
+        self.results = results
+
+        errors = [r for r in results if r['error'] is not None]
+        if errors:
+            raise BatchFailed("{} invalid operations in the batch, nothing was committed".format(len(errors)),
+                              results)
+
+        if not plans:
+            return results
+
+        message = "{}\n\n{}".format(self.message, "\n".join(m for m, _ in plans))
+        try:
+            with self.transactions.gitdb.commit(self.transactions.signature, message):
+                with db.bulk_write() as writer:
+                    for _, apply in plans:
+                        apply(writer)
+        except Exception as e:
+            for r in results:
+                r['changed'] = False
+            # the files are reset, the descriptors and the shared search index are updated from them again
+            db.get_descriptors()
+            raise BatchFailed("Batch rolled back: {}".format(repr(e)), results) from e
+
+        return results
+
+
 class DBTransactions:
     def __init__(self, gitdb, signature, cache_folder=None, use_cache=True):
         self.gitdb = gitdb
@@ -72,8 +380,19 @@ class DBTransactions:
         self.cache_folder = cache_folder
         self.use_cache = use_cache
 
+    def _db(self):
+        return IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder,
+                            gitdb=self.gitdb)
+
+    def batch(self, message) -> DBBatch:
+        """
+        :param message: the title of the commit message of the batch
+        :return: a DBBatch that queues operations and commits them together
+        """
+        return DBBatch(self, message)
+
     def create_root_paradigm(self, root, inhibitions, translations, comments):
-        db = IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder)
+        db = self._db()
 
         root = _check_script(root)
         if len(root) == 1:
@@ -120,54 +439,17 @@ class DBTransactions:
                               script: Script,
                               translations,
                               comments):
-        db = IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder)
-        d = db.get_dictionary()
-
-        script = _check_script(script)
-        if len(script) == 1:
-            raise ValueError("The script is not a paradigm {}, can't use it to define a paradigm.".format(str(script)))
-
-        if script in d.scripts:
-            raise ValueError("Script {} already defined in the dictionary".format(str(script)))
-
-        r_cand = set()
-        for ss in script.singular_sequences:
-            try:
-                r_cand.add(d.tables.root(ss))
-            except KeyError:
-                raise ValueError("No root paradigms contains this script {}".format(str(script)))
-
-        if len(r_cand) != 1:
-            raise ValueError("No root paradigms or too many for script {}".format(str(script)))
-
-        root = next(iter(r_cand))
-        descriptors = db.get_descriptors()
-
-        message = "[dictionary] Create paradigm {} ({}) for root paradigm {} ({})"\
-            .format(str(script),
-                      " / ".join(
-                          "{}:{}".format(l, ', '.join(descriptors.get_values(script, l, 'translations'))) for l in LANGUAGES),
-                      str(root),
-                      " / ".join(
-                          "{}:{}".format(l, ', '.join(descriptors.get_values(root, l, 'translations'))) for l in LANGUAGES))
+        db = self._db()
 
+        message, apply = _plan_add_morpheme_paradigm(db.get_dictionary(), db.get_descriptors(),
+                                                     script, translations, comments)
         with self.gitdb.commit(self.signature, message):
-            db.remove_descriptor(script)
-            db.remove_structure(script)
-
-            db.add_structure(script, 'is_root', False)
-
-            for l in LANGUAGES:
-                for v in translations[l]:
-                    db.add_descriptor(script, language=l, descriptor='translations', value=v)
-
-                for v in comments[l]:
-                    db.add_descriptor(script, language=l, descriptor='comments', value=v)
+            apply(db)
 
     def delete_morpheme_root_paradigm(self,
                                       script: Script, empty_descriptors=True
                                       ):
-        db = IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder)
+        db = self._db()
         d = db.get_dictionary()
         descriptors = db.get_descriptors()
 
@@ -189,26 +471,11 @@ class DBTransactions:
 
     def delete_morpheme_paradigm(self,
                                  script: Script):
-        db = IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder)
-        d = db.get_dictionary()
-        descriptors = db.get_descriptors()
-
-        script = _check_script(script)
-        if script in d.scripts and len(script) == 1:
-            raise ValueError("Script {} is not a paradigm".format(str(script)))
-
-        root = d.tables.root(script)
-        message = "[dictionary] Remove paradigm {} ({})"\
-                          .format(str(script),
-                                  " / ".join(
-                                      "{}:{}".format(l, ', '.join(descriptors.get_values(script, l, 'translations'))) for l in LANGUAGES),
-                                  str(root),
-                                  " / ".join(
-                                      "{}:{}".format(l, ', '.join(descriptors.get_values(root, l, 'translations'))) for l in LANGUAGES))
+        db = self._db()
 
+        message, apply = _plan_delete_morpheme_paradigm(db.get_dictionary(), db.get_descriptors(), script)
         with self.gitdb.commit(self.signature, message):
-            db.remove_structure(script)
-            db.remove_descriptor(script)
+            apply(db)
 
 
     def update_morpheme_paradigm(self,
@@ -222,7 +489,7 @@ class DBTransactions:
 
         assert len(script_old) != 1 or len(script_new) != 1, "Can't update singular sequences, only paradigms"
 
-        db = IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder)
+        db = self._db()
         d = db.get_dictionary()
         desc = db.get_descriptors()
         ds = db.get_structure()
@@ -287,70 +554,33 @@ class DBTransactions:
                         descriptor,
                         value):
 
-        db = IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder)
-
-        ieml = _check_ieml(ieml)
-        value = _check_descriptors(value)
+        db = self._db()
 
-        desc = db.get_descriptors()
-        old_trans = {l: desc.get_values(ieml=ieml, language=l, descriptor=descriptor) for l in LANGUAGES}
-
-        if all(sorted(value[l]) == sorted(old_trans[l]) for l in LANGUAGES):
-            error("No update needed, db already contains {}:{} for {}".format(descriptor, json.dumps(value), str(ieml)))
+        plan = _plan_set_descriptors(db.get_descriptors(), ieml, descriptor, value)
+        if plan is None:
             return False
 
-        # test if after modification there is still at least a descriptor
-        if all(not (desc.get_values(ieml=ieml, language=l, descriptor=d) if d != descriptor else value[l])
-               for l in LANGUAGES for d in DESCRIPTORS_CLASS):
-            error('[descriptors] Remove {}'.format(str(ieml)))
-            with self.gitdb.commit(self.signature, '[descriptors] Remove {}'.format(str(ieml))):
-                db.remove_descriptor(ieml)
-            return True
-        # to_add = {l: [e for e in value[l] if e not in old_trans[l]] for l in LANGUAGES}
-        # to_remove = {l: [e for e in old_trans[l] if e not in value[l]] for l in LANGUAGES}
-
-        with self.gitdb.commit(self.signature, '[descriptors] Update {} for {} to {}'.format(descriptor,
-                                                                                             str(ieml),
-                                                                                             json.dumps(value))):
-            db.remove_descriptor(ieml, None, descriptor)
-
-            for l in LANGUAGES:
-                for e in value[l]:
-                    db.add_descriptor(ieml, l, descriptor, e)
-
+        message, apply = plan
+        with self.gitdb.commit(self.signature, message):
+            apply(db)
             return True
 
     def set_inhibitions(self,
                         ieml,
                         inhibitions):
 
-        db = IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder)
+        db = self._db()
 
-        ieml = _check_ieml(ieml)
-        assert db.get_dictionary().tables.root(ieml) == ieml
-
-        inhibitions = _check_inhibitions(inhibitions)
-
-        ds = db.get_structure()
-        old_inhib = ds.get_values(ieml, 'inhibition')
-
-        if set(old_inhib) == set(inhibitions):
+        plan = _plan_set_inhibitions(db.get_dictionary(), db.get_structure(), ieml, inhibitions)
+        if plan is None:
             return
 
-        to_remove = [e for e in old_inhib if e not in inhibitions]
-        to_add = [e for e in inhibitions if e not in old_inhib]
-
-        with self.gitdb.commit(self.signature, '[inhibitions] Update inhibitions for {} to {}'.format(str(ieml),
-                                                                                             json.dumps(inhibitions))):
-            for e in to_add:
-                db.add_structure(ieml, 'inhibition', e)
-
-            for e in to_remove:
-                db.remove_structure(ieml, 'inhibition', e)
-
+        message, apply = plan
+        with self.gitdb.commit(self.signature, message):
+            apply(db)
 
     def update_all_ieml(self, f, message: str):
-        db = IEMLDatabase(folder=self.gitdb.folder, use_cache=self.use_cache, cache_folder=self.cache_folder)
+        db = self._db()
         desc = db.get_descriptors()
 
         with self.gitdb.commit(self.signature, '[IEML migration] Update all ieml in db: {}'.format(message)):
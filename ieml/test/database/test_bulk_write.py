@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ieml.ieml_database import IEMLDatabase
+from ieml.test.database.utils import init_test_db
+
+
+class BulkWriteTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        init_test_db(self.folder)
+        self.db = IEMLDatabase(folder=self.folder, use_cache=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_bulk_write(self):
+        with self.db.bulk_write() as w:
+            for i in range(10):
+                w.add_descriptor('wa.', 'en', 'tags', 'tag {}'.format(i))
+            w.remove_descriptor('wa.', 'en', 'tags', 'tag 3')
+            w.add_descriptor('we.', 'fr', 'translations', 'we')
+            w.remove_descriptor('O:M:.', language='fr')
+            w.remove_structure('O:M:.', 'inhibition')
+            w.add_structure('O:M:.', 'inhibition', 'father_mode')
+
+        # wa. O:M:. and we. descriptors, O:M:. structure
+        self.assertEqual(w.files_touched, 4)
+
+        desc = self.db.get_descriptors()
+        self.assertListEqual(desc.get_values('wa.', 'en', 'tags'),
+                             ['tag {}'.format(i) for i in range(10) if i != 3])
+        self.assertListEqual(desc.get_values('wa.', 'en', 'translations'), ['wa'])
+        self.assertListEqual(desc.get_values('we.', 'fr', 'translations'), ['we'])
+        self.assertListEqual(desc.get_values('O:M:.', 'fr', 'translations'), [])
+        self.assertListEqual(desc.get_values('O:M:.', 'en', 'translations'), ['root O:M:.'])
+        self.assertListEqual(self.db.get_structure().get_values('O:M:.', 'inhibition'), ['father_mode'])
+
+    def test_same_as_single_operations(self):
+        other = tempfile.mkdtemp()
+        try:
+            init_test_db(other)
+            single = IEMLDatabase(folder=other, use_cache=False)
+            single.add_descriptor('wa.', 'fr', 'translations', 'wa "fr"')
+            single.remove_descriptor('O:B:.')
+            single.remove_descriptor('wa.', None, 'comments')
+
+            with self.db.bulk_write() as w:
+                w.add_descriptor('wa.', 'fr', 'translations', 'wa "fr"')
+                w.remove_descriptor('O:B:.')
+                w.remove_descriptor('wa.', None, 'comments')
+
+            self.assertEqual(w.files_touched, 2)
+            for ieml in ['wa.', 'O:B:.']:
+                path = self.db.path_of(ieml)
+                self.assertEqual(os.path.isfile(path), os.path.isfile(single.path_of(ieml)))
+                if os.path.isfile(path):
+                    with open(path) as a, open(single.path_of(ieml)) as b:
+                        self.assertEqual(a.read(), b.read())
+        finally:
+            shutil.rmtree(other)
+
+    def test_error_discards(self):
+        with self.assertRaises(ValueError):
+            with self.db.bulk_write() as w:
+                w.add_descriptor('wa.', 'en', 'tags', 'tag')
+                raise ValueError()
+
+        self.assertListEqual(self.db.get_descriptors().get_values('wa.', 'en', 'tags'), [])
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import pygit2
+
+from ieml.commons import VersionedCacheStore
+from ieml.ieml_database import IEMLDatabase, GitInterface
+from ieml.ieml_database.registry import registry
+from ieml.test.database.utils import init_test_db
+
+
+def _commit_all(repo, message):
+    index = repo.index
+    index.add_all()
+    index.write()
+    signature = pygit2.Signature('test', 'test@ieml.io')
+    parents = [] if repo.head_is_unborn else [repo.head.target]
+    return repo.create_commit('HEAD', signature, signature, message, index.write_tree(), parents)
+
+
+class VersionedCacheStoreTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_get_put(self):
+        store = VersionedCacheStore(self.folder)
+        with self.assertRaises(KeyError):
+            store.get('dictionary', 'v0')
+
+        store.put('dictionary', 'v0', [0])
+        store.put('dictionary', 'v1', [1])
+        self.assertListEqual(store.get('dictionary', 'v0'), [0])
+        self.assertListEqual(store.get('dictionary', 'v1'), [1])
+
+    def test_evict(self):
+        store = VersionedCacheStore(self.folder, max_bytes=1 << 20)
+        for i in range(3):
+            store.put('dictionary', 'v{}'.format(i), b'0' * 1000)
+            os.utime(store.path('dictionary', 'v{}'.format(i)), ns=(i * 10 ** 9, i * 10 ** 9))
+        # v0 is used again
+        store.get('dictionary', 'v0')
+
+        store.max_bytes = 2500
+        store.put('dictionary', 'v3', b'0' * 1000)
+        self.assertIn(('dictionary', 'v0'), store)
+        self.assertNotIn(('dictionary', 'v1'), store)
+        self.assertNotIn(('dictionary', 'v2'), store)
+        self.assertIn(('dictionary', 'v3'), store)
+
+
+class CacheVersionsTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.versions = tempfile.mkdtemp()
+        repo = pygit2.init_repository(self.folder, initial_head='master')
+        init_test_db(self.folder)
+        self.commit0 = _commit_all(repo, 'init')
+
+        db = IEMLDatabase(folder=self.folder, use_cache=False)
+        db.add_structure('O:O:.', 'is_root', True)
+        db.add_descriptor('O:O:.', 'en', 'translations', 'root O:O:.')
+        self.commit1 = _commit_all(repo, 'root paradigm')
+
+        self.gitdb = GitInterface(folder=self.folder)
+
+    def tearDown(self):
+        registry.invalidate(self.folder)
+        shutil.rmtree(self.folder)
+        shutil.rmtree(self.versions)
+
+    def _db(self):
+        registry.invalidate(self.folder)
+        return IEMLDatabase(folder=self.folder, gitdb=self.gitdb,
+                            cache_versions=VersionedCacheStore(self.versions))
+
+    def test_tree_id(self):
+        self.assertEqual(self.gitdb.tree_id('morpheme/paradigm'),
+                         self.gitdb.tree_id('morpheme/paradigm', commit_id=self.commit1))
+        self.assertNotEqual(self.gitdb.tree_id('morpheme/paradigm', commit_id=self.commit0),
+                            self.gitdb.tree_id('morpheme/paradigm', commit_id=self.commit1))
+        self.assertEqual(self.gitdb.tree_id('morpheme/singular', commit_id=self.commit0),
+                         self.gitdb.tree_id('morpheme/singular', commit_id=self.commit1))
+
+        IEMLDatabase(folder=self.folder, use_cache=False).add_structure('M:M:.', 'inhibition', 'twin')
+        self.assertIsNone(self.gitdb.tree_id('morpheme/paradigm'))
+
+    def test_checkout_reuse(self):
+        db = self._db()
+        d1 = db.get_dictionary()
+        v1 = self.gitdb.tree_id('morpheme/paradigm')
+        self.assertIn(('dictionary', v1), db.cache_versions)
+
+        self.gitdb.reset(self.commit0)
+        d0 = self._db().get_dictionary()
+        v0 = self.gitdb.tree_id('morpheme/paradigm')
+        self.assertIn(('dictionary', v0), db.cache_versions)
+        self.assertNotIn('O:O:.', d0)
+        self.assertIn('O:O:.', d1)
+
+        # the version of commit1 is still there, the folder cache only has the commit0 version
+        self.gitdb.reset(self.commit1)
+        os.utime(db.cache_versions.path('dictionary', v1), ns=(0, 0))
+        d = self._db().get_dictionary()
+        self.assertGreater(os.stat(db.cache_versions.path('dictionary', v1)).st_mtime_ns, 0)
+        self.assertIn('O:O:.', d)
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ieml.ieml_database import IEMLDatabase
+from ieml.ieml_database.descriptor_index import DescriptorIndex
+from ieml.test.database.utils import init_test_db
+
+
+class DescriptorIndexTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache_folder = tempfile.mkdtemp()
+        init_test_db(self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+        shutil.rmtree(self.cache_folder)
+
+    def test_refresh_only_changed(self):
+        db = IEMLDatabase(self.folder, cache_folder=self.cache_folder)
+        index = db._descriptor_index
+
+        self.assertEqual(len(index.refresh()), 5)
+        self.assertListEqual(index.refresh(), [])
+
+        desc = db.get_descriptors()
+        db.add_descriptor('wa.', 'fr', 'translations', 'ajout')
+        self.assertListEqual(index.refresh(), [os.path.relpath(db.path_of('wa.'), self.folder)])
+
+        # the previous descriptors are a snapshot, the entries that did not change are shared
+        updated = db.get_descriptors()
+        self.assertIsNot(updated, desc)
+        self.assertListEqual(desc.get_values('wa.', 'fr', 'translations'), [])
+        self.assertListEqual(updated.get_values('wa.', 'fr', 'translations'), ['ajout'])
+        self.assertIs(updated.index['O:M:.'], desc.index['O:M:.'])
+
+    def test_deleted_file(self):
+        db = IEMLDatabase(self.folder, use_cache=False)
+        self.assertListEqual(db.get_descriptors().get_values('wa.', 'en', 'translations'), ['wa'])
+
+        db.remove_descriptor('wa.')
+        self.assertListEqual(db.get_descriptors().get_values('wa.', 'en', 'translations'), [])
+        self.assertEqual(len(db.get_descriptors().df), 6)
+
+    def test_persisted(self):
+        IEMLDatabase(self.folder, cache_folder=self.cache_folder).get_descriptors()
+
+        path = IEMLDatabase(self.folder, use_cache=False).path_of('O:B:.')
+        with open(path, 'a', encoding='utf8') as fp:
+            fp.write('"O:B:." fr translations "ajout"\n')
+
+        index = DescriptorIndex(self.folder, cache_folder=self.cache_folder)
+        self.assertListEqual(index.refresh(), [os.path.relpath(path, self.folder)])
+        self.assertListEqual(index.descriptors.get_values('O:B:.', 'fr', 'translations'), ['ajout'])
+        self.assertEqual(len(index.descriptors.df), 9)
+
+    def test_save_interval(self):
+        db = IEMLDatabase(self.folder, cache_folder=self.cache_folder)
+        db.get_descriptors()
+        db.add_descriptor('wa.', 'fr', 'translations', 'ajout')
+        db.get_descriptors()
+
+        # the second refresh of the process is saved at the next interval or at exit
+        path = os.path.relpath(db.path_of('wa.'), self.folder)
+        self.assertListEqual(DescriptorIndex(self.folder, cache_folder=self.cache_folder).refresh(), [path])
+        self.assertTrue(db._descriptor_index._unsaved)
+
+        db._descriptor_index.save()
+        index = DescriptorIndex(self.folder, cache_folder=self.cache_folder)
+        self.assertListEqual(index.refresh(), [])
+        self.assertListEqual(index.descriptors.get_values('wa.', 'fr', 'translations'), ['ajout'])
+
+        # without interval, each refresh is saved
+        index.save_interval = 0
+        index.invalidate(db.path_of('wa.'))
+        db.add_descriptor('wa.', 'fr', 'translations', 'ajout 2')
+        index.refresh()
+        self.assertFalse(index._unsaved)
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import pandas
+
+from ieml.ieml_database.descriptors import Descriptors
+
+
+def _df(rows):
+    return pandas.DataFrame(rows, columns=['ieml', 'language', 'descriptor', 'value'])
+
+
+class DescriptorsTestCase(TestCase):
+    def setUp(self):
+        self.desc = Descriptors(_df([
+            ('wa.', 'en', 'translations', 'wa'),
+            ('wa.', 'en', 'translations', 'wa 2'),
+            ('wa.', 'fr', 'comments', 'commentaire'),
+            ('O:M:.', 'fr', 'translations', 'racine'),
+        ]))
+
+    def test_get_values(self):
+        self.assertListEqual(self.desc.get_values('wa.', 'en', 'translations'), ['wa', 'wa 2'])
+        self.assertListEqual(self.desc.get_values('wa.', 'fr', 'translations'), [])
+        self.assertListEqual(self.desc.get_values('we.', 'fr', 'translations'), [])
+
+    def test_get_values_partial(self):
+        self.assertDictEqual(self.desc.get_values_partial('wa.'), {
+            ('wa.', 'en', 'translations'): ['wa', 'wa 2'],
+            ('wa.', 'fr', 'comments'): ['commentaire']})
+        self.assertDictEqual(self.desc.get_values_partial('wa.', language='fr'),
+                             {('wa.', 'fr', 'comments'): ['commentaire']})
+        self.assertDictEqual(self.desc.get_values_partial(None, descriptor='translations'), {
+            ('wa.', 'en', 'translations'): ['wa', 'wa 2'],
+            ('O:M:.', 'fr', 'translations'): ['racine']})
+        self.assertDictEqual(self.desc.get_values_partial('we.'), {})
+
+    def test_get_descriptor(self):
+        res = self.desc.get_descriptor('wa.')
+        self.assertListEqual(res['translations']['en'], ['wa', 'wa 2'])
+        self.assertListEqual(res['translations']['fr'], [])
+        self.assertListEqual(res['comments']['fr'], ['commentaire'])
+
+        # the returned lists are copies
+        res['translations']['en'].append('modified')
+        self.assertListEqual(self.desc.get_values('wa.', 'en', 'translations'), ['wa', 'wa 2'])
+
+        bulk = self.desc.get_descriptors_bulk(['wa.', 'O:M:.', 'we.'])
+        self.assertDictEqual(bulk['wa.'], self.desc.get_descriptor('wa.'))
+        self.assertListEqual(bulk['O:M:.']['translations']['fr'], ['racine'])
+        self.assertListEqual(bulk['we.']['translations']['fr'], [])
+
+    def test_replaced(self):
+        desc = self.desc.replaced(['wa.'], _df([('wa.', 'fr', 'translations', 'nouveau')]))
+        self.assertListEqual(desc.get_values('wa.', 'en', 'translations'), [])
+        self.assertListEqual(desc.get_values('wa.', 'fr', 'translations'), ['nouveau'])
+        self.assertEqual(len(desc.df), 2)
+        self.assertListEqual(desc.df.loc[('wa.', 'fr', 'translations')].to_list(), ['nouveau'])
+
+        # the replaced descriptors are unchanged
+        self.assertListEqual(self.desc.get_values('wa.', 'en', 'translations'), ['wa', 'wa 2'])
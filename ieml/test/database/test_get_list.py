@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ieml.constants import TYPES, GRAMMATICAL_CLASS_NAMES, LANGUAGES
+from ieml.dictionary.script import Script
+from ieml.exceptions import CannotParse
+from ieml.ieml_database import IEMLDatabase, ieml_database
+from ieml.test.database.utils import init_test_db
+from ieml.usl import PolyMorpheme, get_index
+from ieml.usl.parser import IEMLParser
+
+
+def _legacy_get_list(db):
+    res = {}
+    dictionary = db.get_dictionary()
+    parser = IEMLParser(dictionary=dictionary)
+
+    for (ieml, lang, desc), (v,) in db.get_descriptors().df.iterrows():
+        if ieml not in res:
+            try:
+                pieml = parser.parse(ieml)
+            except CannotParse:
+                continue
+
+            i, r = get_index(pieml, dictionary)
+            if i == 0 and isinstance(pieml, PolyMorpheme):
+                pieml = pieml.constant[0]
+            res[ieml] = {'ieml': str(pieml),
+                         'type': TYPES[i],
+                         'paradigm': len(pieml) != 1,
+                         'class': GRAMMATICAL_CLASS_NAMES[pieml.grammatical_class].lower().capitalize(),
+                         'index': r,
+                         'cardinality': 'singular_sequence' if pieml.cardinal == 1 else
+                         ('paradigm' if not isinstance(pieml, Script) or pieml not in dictionary.tables.roots
+                          else 'root_paradigm'),
+                         'domains': []}
+        if desc not in res[ieml]:
+            res[ieml][desc] = {l: [] for l in LANGUAGES}
+
+        res[ieml][desc][lang].append(v)
+
+    return sorted(res.values(), key=lambda e: e['index'])
+
+
+class GetListTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        init_test_db(self.folder)
+        self.db = IEMLDatabase(folder=self.folder, use_cache=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_same_as_legacy(self):
+        expected = _legacy_get_list(self.db)
+        self.assertEqual(len(expected), 3)
+        self.assertListEqual(self.db.get_list(workers=1), expected)
+        # the serial path does not keep the dictionary in the worker globals
+        self.assertDictEqual(ieml_database._list_worker, {})
+
+    def test_process_pool(self):
+        min_size = ieml_database.LIST_PARALLEL_MIN_SIZE
+        ieml_database.LIST_PARALLEL_MIN_SIZE = 0
+        try:
+            self.assertListEqual(self.db.get_list(workers=2), _legacy_get_list(self.db))
+        finally:
+            ieml_database.LIST_PARALLEL_MIN_SIZE = min_size
@@ -0,0 +1,63 @@
+import shutil
+import tempfile
+from unittest import TestCase
+
+import pygit2
+
+from ieml.ieml_database import IEMLDatabase, GitInterface
+from ieml.ieml_database.git_database import GitDatabase, blob_cache
+from ieml.ieml_database.registry import registry
+from ieml.test.database.test_cache_versions import _commit_all
+from ieml.test.database.utils import init_test_db
+
+
+class GitDatabaseTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        repo = pygit2.init_repository(self.folder, initial_head='master')
+        init_test_db(self.folder)
+        self.commit0 = _commit_all(repo, 'init')
+
+        db = IEMLDatabase(folder=self.folder, use_cache=False)
+        db.add_structure('O:O:.', 'is_root', True)
+        db.add_descriptor('O:O:.', 'en', 'translations', 'root O:O:.')
+        db.add_descriptor('wa.', 'en', 'translations', 'wa 2')
+        self.commit1 = _commit_all(repo, 'root paradigm')
+
+        self.gitdb = GitInterface(folder=self.folder)
+
+    def tearDown(self):
+        registry.invalidate(self.folder)
+        shutil.rmtree(self.folder)
+
+    def test_same_as_working_copy(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=False)
+        gdb = GitDatabase(self.gitdb)
+
+        self.assertListEqual(sorted(gdb.list()), sorted(db.list()))
+        self.assertListEqual(sorted(gdb.list('morpheme', paradigm=True)), sorted(db.list('morpheme', paradigm=True)))
+        self.assertDictEqual(gdb.get_descriptors().index, db.get_descriptors().index)
+        self.assertTrue(gdb.get_structure().df.equals(db.get_structure().df))
+        self.assertListEqual([str(s) for s in gdb.get_dictionary().scripts],
+                             [str(s) for s in db.get_dictionary().scripts])
+        self.assertListEqual(gdb.get_list(), db.get_list())
+
+    def test_older_commit(self):
+        gdb0 = GitDatabase(self.gitdb, commit_id=self.commit0)
+        self.assertNotIn('O:O:.', gdb0.get_dictionary())
+        self.assertListEqual(gdb0.get_descriptors().get_values('wa.', 'en', 'translations'), ['wa'])
+
+        # the working copy is not modified
+        self.assertIn('O:O:.', IEMLDatabase(folder=self.folder, use_cache=False).get_dictionary())
+
+    def test_shared_blobs(self):
+        blob_cache._rows.clear()
+        GitDatabase(self.gitdb, commit_id=self.commit0).get_descriptors()
+        size = len(blob_cache._rows)
+        GitDatabase(self.gitdb, commit_id=self.commit1).get_descriptors()
+        # only the new O:O:. and the changed wa. files are read
+        self.assertEqual(len(blob_cache._rows), size + 2)
+
+    def test_read_only(self):
+        with self.assertRaises(ValueError):
+            GitDatabase(self.gitdb).add_descriptor('wa.', 'en', 'translations', 'wa')
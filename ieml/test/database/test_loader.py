@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ieml.ieml_database.loader import list_files, read_files, read_descriptors, read_structure
+from ieml.test.database.utils import init_test_db
+
+
+class LoaderTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.db = init_test_db(self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_list_files(self):
+        files = list_files(self.folder, '.desc')
+        self.assertEqual(len(files), 5)
+        self.assertEqual(files, sorted(files))
+        self.assertIn(self.db.path_of('wa.'), files)
+        self.assertEqual(len(list_files(self.folder, '.ieml')), 3)
+
+    def test_read_descriptors(self):
+        df = read_descriptors(self.folder)
+        self.assertListEqual(list(df.columns), ['ieml', 'language', 'descriptor', 'value'])
+        self.assertEqual(len(df), 8)
+
+        desc = self.db.get_descriptors()
+        self.assertListEqual(desc.get_values('O:B:.', 'en', 'translations'), ['paradigm "O:B:."'])
+        # values are never converted by type inference
+        self.assertListEqual(desc.get_values('wa.', 'fr', 'comments'), ['True'])
+
+    def test_read_structure(self):
+        structure = self.db.get_structure()
+        self.assertListEqual(structure.get_values('O:M:.', 'is_root'), ['True'])
+        self.assertListEqual(structure.get_values('O:M:.', 'inhibition'), ['opposed'])
+        self.assertEqual(len(read_structure(self.folder)), 4)
+
+    def test_pools(self):
+        files = list_files(self.folder, '.desc') * 200
+        ref = read_files(files, 4, workers=0)
+        self.assertEqual(read_files(files, 4, workers=4), ref)
+        self.assertEqual(read_files(files, 4, workers=2, processes=True), ref)
+
+    def test_invalid_file(self):
+        with open(os.path.join(self.folder, 'morpheme', 'invalid.desc'), 'w') as fp:
+            fp.write('"wa." en translations\n')
+
+        with self.assertRaises(ValueError):
+            read_descriptors(self.folder)
+
+    def test_list(self):
+        self.assertSetEqual(set(self.db.list()), {'O:M:.', 'M:M:.', 'O:B:.', 'wa.', 'wa. m1(we.)'})
+        self.assertSetEqual(set(self.db.list('morpheme', paradigm=True)), {'O:M:.', 'M:M:.', 'O:B:.'})
+        self.assertListEqual(self.db.list('polymorpheme'), ['wa. m1(we.)'])
+
+    def test_dictionary(self):
+        dictionary = self.db.get_dictionary()
+        self.assertEqual(len(dictionary), 18)
+        self.assertSetEqual({str(r) for r in dictionary.tables.roots}, {'O:M:.', 'M:M:.'})
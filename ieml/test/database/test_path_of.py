@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ieml.ieml_database import IEMLDatabase
+from ieml.usl.parser import IEMLParser
+
+
+class PathOfTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.db = IEMLDatabase(folder=self.folder, use_cache=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_resolve_path(self):
+        self.assertTupleEqual(self.db.resolve_path('wa.'), ('morpheme', False, 'wa.'))
+        self.assertTupleEqual(self.db.resolve_path('O:M:.'), ('morpheme', True, 'O:M:.'))
+        self.assertTupleEqual(self.db.resolve_path('wa. m1(we.)'), ('polymorpheme', True, 'wa. m1(we.)'))
+
+        parsed = IEMLParser().parse('wa. m1(we.)')
+        self.assertTupleEqual(self.db.resolve_path(parsed), self.db.resolve_path('wa. m1(we.)'))
+        self.assertEqual(self.db.path_of('wa. m1(we.)'),
+                         os.path.join(self.folder, 'polymorpheme', 'paradigm', 'wa. m', 'wa. m1(we.).desc'))
+        self.assertEqual(self.db.path_of('O:M:.', descriptor=False),
+                         os.path.join(self.folder, 'morpheme', 'paradigm', '', 'O:M:..ieml'))
+
+    def test_cache(self):
+        IEMLDatabase._resolve.cache_clear()
+        self.db.path_of('wo.')
+        self.db.path_of('wo.', descriptor=False)
+        self.db.add_descriptor('wo.', 'en', 'translations', 'wo')
+        info = IEMLDatabase._resolve.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 3)
+
+    def test_normalize(self):
+        ieml = 'wa. m1(we. wo.) m2(wu. wi.)'
+        self.assertEqual(self.db.normalize_ieml(ieml), 'wa. m1(wo. we.) m2(wu. i.)')
+        self.assertEqual(self.db.resolve_path(ieml)[2], 'wa. m1(wo. we.) m2(wu. i.)')
+        self.assertEqual(self.db.resolve_path(ieml, normalize=False)[2], ieml)
+
+        self.assertEqual(len(self.db.filename_of('a' * 200)), IEMLDatabase.MAX_IEML_NAME_SIZE)
+
+    def test_paths_of(self):
+        iemls = ['wa.', 'O:M:.', 'wa.', IEMLParser().parse('wa. m1(we.)')]
+        self.assertListEqual(self.db.paths_of(iemls), [self.db.path_of(i) for i in iemls])
@@ -0,0 +1,75 @@
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ieml.ieml_database import IEMLDatabase
+from ieml.ieml_database.record_index import RecordIndex
+from ieml.ieml_database.registry import registry
+from ieml.test.database.utils import init_test_db
+
+
+def _records(n):
+    return [{'ieml': 'ieml{}'.format(i),
+             'type': 'morpheme' if i % 2 else 'polymorpheme',
+             'class': 'Noun' if i % 3 else 'Verb',
+             'paradigm': i % 5 == 0,
+             'index': i} for i in range(n)]
+
+
+class RecordIndexTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.records = _records(100)
+        RecordIndex.write(self.folder, self.records)
+        self.index = RecordIndex(self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_iter(self):
+        self.assertEqual(len(self.index), 100)
+        self.assertListEqual(list(self.index.iter()), self.records)
+        self.assertListEqual(list(self.index.iter(offset=10, limit=5)), self.records[10:15])
+
+    def test_filters(self):
+        for filters in [{'type': 'morpheme'}, {'class_': 'verb'}, {'paradigm': True},
+                        {'type': 'polymorpheme', 'class_': 'Noun', 'paradigm': False}, {'type': 'word'},
+                        {'class_': 'Auxiliary'}]:
+            expected = [r for r in self.records if RecordIndex.match(r, **filters)]
+            self.assertListEqual(list(self.index.iter(**filters)), expected)
+            self.assertListEqual(list(self.index.iter(offset=3, limit=4, **filters)), expected[3:7])
+            self.assertEqual(self.index.count(**filters), len(expected))
+
+
+class IterListTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        init_test_db(self.folder)
+
+    def tearDown(self):
+        registry.invalidate(self.folder)
+        shutil.rmtree(self.folder)
+
+    def test_iter_list(self):
+        for use_cache in [False, True]:
+            db = IEMLDatabase(folder=self.folder, use_cache=use_cache)
+            records = db.get_list()
+            self.assertListEqual(list(db.iter_list()), records)
+            self.assertListEqual(list(db.iter_list(paradigm=True, offset=1, limit=1)),
+                                 [r for r in records if r['paradigm']][1:2])
+
+    def test_rebuild(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=True)
+        self.assertEqual(len(list(db.iter_list())), 3)
+
+        db.add_descriptor('k.', 'en', 'translations', 'k')
+        self.assertEqual(len(list(db.iter_list())), 4)
+
+    def test_memoized(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=True)
+        index = db.get_record_index()
+        self.assertIs(IEMLDatabase(folder=self.folder, use_cache=True).get_record_index(), index)
+
+        # the records classification depends on the structure
+        db.add_structure('M:M:.', 'inhibition', 'opposed')
+        self.assertIsNot(db.get_record_index(), index)
@@ -0,0 +1,122 @@
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from ieml.ieml_database import IEMLDatabase
+from ieml.ieml_database.registry import DatabaseRegistry, registry
+from ieml.test.database.utils import init_test_db
+
+
+class DatabaseRegistryTestCase(TestCase):
+    def test_lru(self):
+        r = DatabaseRegistry(max_size=2)
+        self.assertEqual(r.get('/db', 'dictionary', 'v0', lambda: 0), 0)
+        self.assertEqual(r.get('/db', 'dictionary', 'v0', lambda: 1), 0)
+        r.get('/db', 'dictionary', 'v1', lambda: 1)
+        r.get('/db', 'dictionary', 'v0', lambda: 2)
+        r.get('/db', 'structure', 'v0', lambda: 3)
+
+        self.assertEqual(len(r), 2)
+        self.assertNotIn(('/db', 'dictionary', 'v1'), r)
+        self.assertIn(('/db', 'dictionary', 'v0'), r)
+
+    def test_invalidate(self):
+        r = DatabaseRegistry()
+        r.get('/db', 'dictionary', 'v0', lambda: 0)
+        r.get('/db', 'structure', 'v0', lambda: 0)
+        r.get('/other', 'dictionary', 'v0', lambda: 0)
+
+        r.invalidate('/db', names=['dictionary'])
+        self.assertNotIn(('/db', 'dictionary', 'v0'), r)
+        self.assertIn(('/db', 'structure', 'v0'), r)
+
+        r.invalidate('/db')
+        self.assertEqual(len(r), 1)
+        r.invalidate()
+        self.assertEqual(len(r), 0)
+
+    def test_find(self):
+        r = DatabaseRegistry(max_size=2)
+        r.get('/db', 'dictionary', 'v0', lambda: 0, source=lambda: 't0')
+        r.put('/db', 'dictionary', 'v1', 1, source='t1')
+        r.put('/db', 'dictionary', 'v2', 2)
+
+        self.assertEqual(r.find('/db', 'dictionary', 't1'), 1)
+        self.assertIsNone(r.find('/db', 'dictionary', 't0'))
+        self.assertIsNone(r.find('/db', 'dictionary', None))
+        self.assertIsNone(r.find('/db', 'structure', 't1'))
+
+    def test_pinned(self):
+        r = DatabaseRegistry(max_size=1)
+        state = r.get('/db', 'descriptors', None, object, pin=True)
+        r.get('/db', 'dictionary', 'v0', lambda: 0)
+        r.get('/db', 'dictionary', 'v1', lambda: 1)
+        self.assertIs(r.get('/db', 'descriptors', None, object, pin=True), state)
+
+        r.invalidate('/db')
+        self.assertNotIn(('/db', 'descriptors', None), r)
+
+    def test_concurrent_loads(self):
+        r = DatabaseRegistry()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append('slow')
+            started.set()
+            release.wait(5)
+            return 'slow'
+
+        with ThreadPoolExecutor(3) as pool:
+            first = pool.submit(r.get, '/db', 'dictionary', 'v0', slow)
+            started.wait(5)
+            # the same key waits for the load in progress
+            second = pool.submit(r.get, '/db', 'dictionary', 'v0', slow)
+            # an other key is not blocked by it
+            self.assertEqual(pool.submit(r.get, '/other', 'dictionary', 'v0', lambda: 'fast').result(5), 'fast')
+            self.assertFalse(first.done())
+            release.set()
+            self.assertEqual(first.result(5), 'slow')
+            self.assertEqual(second.result(5), 'slow')
+
+        self.assertListEqual(calls, ['slow'])
+
+    def test_failed_load(self):
+        r = DatabaseRegistry()
+
+        def fail():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            r.get('/db', 'dictionary', 'v0', fail)
+        self.assertEqual(r.get('/db', 'dictionary', 'v0', lambda: 0), 0)
+
+
+class SharedInstancesTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        init_test_db(self.folder)
+
+    def tearDown(self):
+        registry.invalidate(self.folder)
+        shutil.rmtree(self.folder)
+
+    def test_shared(self):
+        db0 = IEMLDatabase(folder=self.folder, use_cache=False)
+        db1 = IEMLDatabase(folder=self.folder, use_cache=False)
+
+        self.assertIs(db0.get_dictionary(), db1.get_dictionary())
+        self.assertIs(db0.get_structure(), db1.get_structure())
+        self.assertIs(db0.get_descriptors(), db1.get_descriptors())
+
+        # a write from an instance is seen by the other
+        db0.add_descriptor('wa.', 'en', 'tags', 'tag')
+        self.assertListEqual(db1.get_descriptors().get_values('wa.', 'en', 'tags'), ['tag'])
+
+        dictionary = db0.get_dictionary()
+        db0.add_structure('M:M:.', 'inhibition', 'opposed')
+        self.assertIsNot(db1.get_dictionary(), dictionary)
+        self.assertListEqual(db1.get_structure().get_values('M:M:.', 'inhibition'), ['opposed'])
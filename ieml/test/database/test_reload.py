@@ -0,0 +1,113 @@
+import shutil
+import tempfile
+from unittest import TestCase
+
+import pygit2
+
+from ieml.dictionary.dictionary import Dictionary
+from ieml.ieml_database import IEMLDatabase, GitInterface
+from ieml.ieml_database.descriptors import Descriptors
+from ieml.ieml_database.ieml_database import Structure
+from ieml.ieml_database.loader import read_descriptors, read_structure
+from ieml.ieml_database.registry import registry
+from ieml.test.database.test_cache_versions import _commit_all
+from ieml.test.database.utils import init_test_db
+
+
+class ReloadTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        repo = pygit2.init_repository(self.folder, initial_head='master')
+        init_test_db(self.folder)
+        self.commit0 = _commit_all(repo, 'init')
+
+        db = IEMLDatabase(folder=self.folder, use_cache=False)
+        db.add_structure('O:O:.', 'is_root', True)
+        db.add_descriptor('O:O:.', 'en', 'translations', 'root O:O:.')
+        db.add_structure('M:M:.', 'inhibition', 'twin')
+        self.commit1 = _commit_all(repo, 'root paradigm')
+
+        db.add_descriptor('wa.', 'en', 'translations', 'wa 2')
+        self.commit2 = _commit_all(repo, 'translation')
+
+        self.gitdb = GitInterface(folder=self.folder)
+        registry.invalidate(self.folder)
+
+    def tearDown(self):
+        registry.invalidate(self.folder)
+        shutil.rmtree(self.folder)
+
+    def _check(self, db):
+        structure = Structure(read_structure(self.folder))
+        self.assertTrue(db.get_structure().df.equals(structure.df))
+        self.assertDictEqual(db.get_descriptors().index, Descriptors(read_descriptors(self.folder)).index)
+
+        expected = Dictionary(db.list('morpheme', paradigm=True), structure)
+        dictionary = db.get_dictionary()
+        self.assertListEqual([str(s) for s in dictionary.scripts], [str(s) for s in expected.scripts])
+        for reltype, m in expected.relations.relations.items():
+            self.assertEqual((m != dictionary.relations.relations[reltype]).nnz, 0, reltype)
+
+    def test_reload_checkout(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=False, gitdb=self.gitdb)
+        db.get_descriptors()
+        db.get_dictionary()
+
+        self.gitdb.reset(self.commit0)
+        db.reload(self.gitdb.diff(self.commit2, self.commit0))
+        self.assertNotIn('O:O:.', db.get_dictionary())
+        self._check(db)
+
+        self.gitdb.reset(self.commit2)
+        db.reload(self.gitdb.diff(self.commit0, self.commit2))
+        self.assertIn('O:O:.', db.get_dictionary())
+        self._check(db)
+
+    def test_reuse_dictionary(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=False, gitdb=self.gitdb)
+        db.get_descriptors()
+        dictionary = db.get_dictionary()
+        self.assertListEqual(db.search('wa'), [('wa.', 4)])
+
+        # only a translation of a singular morpheme changed, the dictionary is kept
+        self.gitdb.reset(self.commit1)
+        db.reload(self.gitdb.diff(self.commit2, self.commit1))
+        self.assertIs(db.get_dictionary(), dictionary)
+        self.assertListEqual(db.get_descriptors().get_values('wa.', 'en', 'translations'), ['wa'])
+        self._check(db)
+
+    def test_reused_roots(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=False, gitdb=self.gitdb)
+        previous = db.get_dictionary()
+
+        self.gitdb.reset(self.commit0)
+        db.reload(self.gitdb.diff(self.commit2, self.commit0))
+
+        # O:O:. is removed and M:M:. has a new inhibition, the tables of the other roots are reused
+        dictionary = db.get_dictionary()
+        self.assertSetEqual({str(r) for r in dictionary.tables.reused}, {'O:M:.', 'M:M:.'})
+        for root in dictionary.tables.reused:
+            self.assertIs(dictionary.tables.roots[root], previous.tables.roots[root])
+
+    def test_reload_other_base(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=False, gitdb=self.gitdb)
+        dictionary = db.get_dictionary()
+
+        # checked out without reloading, the loaded dictionary is not the one the diff starts from
+        self.gitdb.reset(self.commit1)
+        self.gitdb.reset(self.commit0)
+        db.reload(self.gitdb.diff(self.commit1, self.commit0))
+        self.assertIsNot(db.get_dictionary(), dictionary)
+        self.assertNotIn('O:O:.', db.get_dictionary())
+        self._check(db)
+
+    def test_reload_without_git(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=False)
+        dictionary = db.get_dictionary()
+
+        # the loaded objects can not be checked against the diff, they are fully loaded
+        self.gitdb.reset(self.commit0)
+        db.reload(self.gitdb.diff(self.commit2, self.commit0))
+        self.assertIsNot(db.get_dictionary(), dictionary)
+        self.assertNotIn('O:O:.', db.get_dictionary())
+        self._check(db)
@@ -0,0 +1,74 @@
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ieml.ieml_database import IEMLDatabase
+from ieml.ieml_database.search import DescriptorSearchIndex, normalize_text, tokenize
+from ieml.test.database.utils import init_test_db
+
+
+class DescriptorSearchIndexTestCase(TestCase):
+    def setUp(self):
+        self.index = DescriptorSearchIndex()
+        self.index.add('wa.', 'fr', 'translations', 'Élévation du corps')
+        self.index.add('we.', 'fr', 'translations', 'corps')
+        self.index.add('wo.', 'en', 'translations', 'body elevation')
+        self.index.add('wu.', 'en', 'tags', 'elevator')
+
+    def test_normalize(self):
+        self.assertEqual(normalize_text('Élévation'), 'elevation')
+        self.assertListEqual(tokenize("L'Élévation, du corps"), ['l', 'elevation', 'du', 'corps'])
+
+    def test_exact_prefix_substring(self):
+        # exact word and whole value first
+        self.assertListEqual([i for i, _ in self.index.search('corps')], ['we.', 'wa.'])
+        # prefix and accents
+        self.assertListEqual([i for i, _ in self.index.search('ELEV', language='fr')], ['wa.'])
+        self.assertListEqual([i for i, _ in self.index.search('elev')], ['wa.', 'wo.', 'wu.'])
+        # substring
+        self.assertListEqual([i for i, _ in self.index.search('vati')], ['wa.', 'wo.'])
+        # all the words must match
+        self.assertListEqual([i for i, _ in self.index.search('elevation corps')], ['wa.'])
+        self.assertListEqual(self.index.search('elevation nothing'), [])
+        self.assertListEqual([i for i, _ in self.index.search('elev', descriptor='tags')], ['wu.'])
+        self.assertEqual(len(self.index.search('elev', limit=1)), 1)
+
+    def test_remove(self):
+        self.index.remove('we.', 'fr', 'translations', 'corps')
+        self.assertListEqual([i for i, _ in self.index.search('corps')], ['wa.'])
+
+        self.index.remove('wa.')
+        self.assertListEqual(self.index.search('corps'), [])
+        self.assertNotIn('corps', self.index.fields[('fr', 'translations')].vocabulary)
+
+
+class DatabaseSearchTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        init_test_db(self.folder)
+        self.db = IEMLDatabase(folder=self.folder, use_cache=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_search(self):
+        self.assertListEqual([i for i, _ in self.db.search('racine')], ['M:M:.', 'O:M:.'])
+        self.assertListEqual([i for i, _ in self.db.search('root', language='fr')], [])
+
+    def test_incremental_update(self):
+        self.db.search('racine')
+
+        self.db.add_descriptor('wa.', 'fr', 'translations', 'Racine élevée')
+        self.assertIn('wa.', [i for i, _ in self.db.search('elevee')])
+
+        self.db.remove_descriptor('wa.', 'fr', 'translations', 'Racine élevée')
+        self.assertNotIn('wa.', [i for i, _ in self.db.search('racine')])
+
+        self.db.remove_descriptor('O:M:.')
+        self.assertListEqual([i for i, _ in self.db.search('racine')], ['M:M:.'])
+
+        # a file changed by another process is re-indexed by get_descriptors
+        other = IEMLDatabase(folder=self.folder, use_cache=False)
+        other.add_descriptor('we.', 'en', 'translations', 'external')
+        self.db.get_descriptors()
+        self.assertListEqual([i for i, _ in self.db.search('external')], ['we.'])
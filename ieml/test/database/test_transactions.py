@@ -0,0 +1,104 @@
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import pygit2
+
+from ieml.dictionary.script import script
+from ieml.ieml_database import IEMLDatabase, GitInterface
+from ieml.ieml_database.registry import registry
+from ieml.ieml_database.transactions.DBTransaction import DBTransactions, BatchFailed
+from ieml.test.database.test_cache_versions import _commit_all
+from ieml.test.database.utils import init_test_db
+
+
+class BatchTransactionTestCase(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.repo = pygit2.init_repository(self.folder, initial_head='master')
+        init_test_db(self.folder)
+        self.commit0 = _commit_all(self.repo, 'init')
+
+        self.gitdb = GitInterface(folder=self.folder)
+        self.transactions = DBTransactions(self.gitdb, pygit2.Signature('test', 'test@ieml.io'), use_cache=False)
+
+    def tearDown(self):
+        registry.invalidate(self.folder)
+        shutil.rmtree(self.folder)
+
+    def test_single_commit(self):
+        with self.transactions.batch("Curation") as batch:
+            batch.set_descriptors(script('wa.'), 'translations', {'en': ['wa 2'], 'fr': ['wa fr']})
+            batch.set_descriptors(script('wa.'), 'tags', {'en': ['tag']})
+            batch.set_inhibitions(script('O:M:.'), ['opposed', 'twin'])
+            batch.add_morpheme_paradigm(script('U:M:.'), {'en': ['U:M:.']}, {})
+            # already up to date
+            batch.set_inhibitions(script('M:M:.'), [])
+
+        self.assertListEqual([r['changed'] for r in batch.results], [True, True, True, True, False])
+        self.assertTrue(all(r['error'] is None for r in batch.results))
+
+        head = self.repo.head.peel()
+        self.assertListEqual(head.parent_ids, [self.commit0])
+        self.assertTrue(head.message.startswith("Curation\n"))
+        self.assertDictEqual(self.gitdb.status(), {})
+
+        db = IEMLDatabase(folder=self.folder, use_cache=False)
+        descriptors = db.get_descriptors()
+        self.assertListEqual(descriptors.get_values('wa.', 'fr', 'translations'), ['wa fr'])
+        self.assertListEqual(descriptors.get_values('wa.', 'en', 'tags'), ['tag'])
+        self.assertSetEqual(set(db.get_structure().get_values('O:M:.', 'inhibition')), {'opposed', 'twin'})
+        self.assertIn('U:M:.', db.get_dictionary())
+
+    def test_invalid_operation(self):
+        batch = self.transactions.batch("Curation")
+        batch.set_descriptors(script('wa.'), 'translations', {'en': ['wa 2']})
+        # wa. is not a root paradigm
+        batch.set_inhibitions(script('wa.'), ['opposed'])
+
+        with self.assertRaises(BatchFailed) as ctx:
+            batch.commit()
+
+        self.assertIsNone(ctx.exception.results[0]['error'])
+        self.assertIsNotNone(ctx.exception.results[1]['error'])
+
+        self.assertEqual(self.repo.head.target, self.commit0)
+        self.assertDictEqual(self.gitdb.status(), {})
+        self.assertListEqual(IEMLDatabase(folder=self.folder, use_cache=False).get_descriptors()
+                             .get_values('wa.', 'en', 'translations'), ['wa'])
+
+    def test_pending_state(self):
+        with self.transactions.batch("Curation") as batch:
+            batch.set_descriptors(script('wa.'), 'comments', {})
+            # validated once the comments are removed, no descriptor remains
+            batch.set_descriptors(script('wa.'), 'translations', {})
+            batch.set_descriptors(script('wa.'), 'comments', {})
+
+        self.assertEqual(batch.results[0]['message'].split(' ')[1], 'Update')
+        self.assertEqual(batch.results[1]['message'], '[descriptors] Remove wa.')
+        self.assertFalse(batch.results[2]['changed'])
+        self.assertNotIn('wa.', IEMLDatabase(folder=self.folder, use_cache=False).get_descriptors().index)
+
+    def test_paradigm_once(self):
+        batch = self.transactions.batch("Curation")
+        batch.add_morpheme_paradigm(script('U:M:.'), {'en': ['U:M:.']}, {})
+        batch.add_morpheme_paradigm(script('U:M:.'), {'en': ['U:M:.']}, {})
+
+        with self.assertRaises(BatchFailed) as ctx:
+            batch.commit()
+        self.assertIsNone(ctx.exception.results[0]['error'])
+        self.assertIsNotNone(ctx.exception.results[1]['error'])
+
+    def test_rollback_search_index(self):
+        db = IEMLDatabase(folder=self.folder, use_cache=False)
+        self.assertListEqual(db.search('zebra'), [])
+
+        batch = self.transactions.batch("Curation")
+        batch.set_descriptors(script('wa.'), 'translations', {'en': ['zebra']})
+        # the commit fails once the files are written
+        with mock.patch.object(self.gitdb, 'status', side_effect=[{}, RuntimeError('commit failed')]):
+            with self.assertRaises(BatchFailed):
+                batch.commit()
+
+        self.assertListEqual(db.search('zebra'), [])
+        self.assertListEqual(db.get_descriptors().get_values('wa.', 'en', 'translations'), ['wa'])
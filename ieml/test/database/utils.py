@@ -37,3 +37,22 @@ def init_repo(folders):
         shutil.rmtree('/tmp/iemldb_test/tmp')
 
     return gitdbs
+
+
+def init_test_db(folder):
+    """Write a small database at folder (two root paradigms, a paradigm and a few descriptors), without git"""
+    from ieml.ieml_database import IEMLDatabase
+
+    db = IEMLDatabase(folder=folder, use_cache=False)
+    for root in ["O:M:.", "M:M:."]:
+        db.add_structure(root, 'is_root', True)
+        db.add_descriptor(root, 'fr', 'translations', 'racine {}'.format(root))
+        db.add_descriptor(root, 'en', 'translations', 'root {}'.format(root))
+
+    db.add_structure("O:M:.", 'inhibition', 'opposed')
+    db.add_structure("O:B:.", 'is_root', False)
+    db.add_descriptor("O:B:.", 'en', 'translations', 'paradigm "O:B:."')
+    db.add_descriptor("wa.", 'en', 'translations', 'wa')
+    db.add_descriptor("wa.", 'fr', 'comments', 'True')
+    db.add_descriptor("wa. m1(we.)", 'fr', 'translations', 'polymorpheme')
+    return db
@@ -0,0 +1,80 @@
+import random
+import re
+import unittest
+
+import pygit2
+
+from ieml.dictionary.script.parser import ScriptParser, fast_parser
+from ieml.exceptions import CannotParse, InvalidScript, TooManySingularSequences
+from ieml.ieml_database import IEMLDatabase, GitInterface
+from ieml.usl import constants
+
+
+def _random_script(rng, layer):
+    if layer == 0:
+        return rng.choice('EUASBTOMFI') + ':'
+    if layer == 1 and rng.random() < 0.3:
+        return rng.choice(['wo', 'wa', 'y', 'o', 'e', 'wu', 'we', 'u', 'a', 'i', 'j', 'g', 's', 'b', 't', 'h', 'c',
+                           'k', 'm', 'n', 'p', 'x', 'd', 'f', 'l']) + '.'
+
+    mark = ':.-\',_;'[layer]
+    return ''.join(_random_sum(rng, layer - 1) for _ in range(rng.randint(1, 3))) + mark
+
+
+def _random_sum(rng, layer):
+    return '+'.join(_random_script(rng, layer) for _ in range(1 if rng.random() < 0.7 else 2))
+
+
+def _tree(s):
+    return (s.__class__.__name__, str(s), s.layer, s.cardinal, s.character, s.empty,
+            tuple(_tree(c) for c in s.children))
+
+
+class FastScriptParserTestCase(unittest.TestCase):
+    def assertSameParse(self, s, handled=True):
+        try:
+            expected = _tree(ScriptParser().ply_parse(s))
+        except (CannotParse, InvalidScript, TooManySingularSequences, ValueError):
+            expected = None
+
+        res = fast_parser.parse(s)
+        if res is None:
+            # only the unusual inputs are left to ply
+            if handled:
+                self.assertIsNone(expected, s)
+            return expected
+
+        self.assertEqual(_tree(res), expected, s)
+        return expected
+
+    def test_constants(self):
+        scripts = set(re.findall(r"script\(['\"](.+?)['\"]\)", open(constants.__file__).read()))
+        self.assertGreater(len(scripts), 50)
+        for s in scripts:
+            self.assertSameParse(s)
+
+    def test_random(self):
+        rng = random.Random(0)
+        parsed = 0
+        for _ in range(3000):
+            s = _random_script(rng, rng.randint(0, 4))
+            if self.assertSameParse(s) is not None:
+                parsed += 1
+        self.assertGreater(parsed, 1000)
+
+    def test_fallback(self):
+        for s in ['wa:O:.', 'U:S:', "U:.-'", 'O:+wa.', 'S: + B:', '']:
+            self.assertSameParse(s, handled=False)
+
+        with self.assertRaises(CannotParse):
+            ScriptParser().parse('wa:O:.')
+
+    def test_all_scripts(self):
+        try:
+            gitdb = GitInterface()
+        except pygit2.GitError as e:
+            self.skipTest("The ieml language repository is not available: {}".format(e))
+
+        dictionary = IEMLDatabase(folder=gitdb.folder).get_dictionary()
+        for s in dictionary.scripts:
+            self.assertSameParse(str(s))
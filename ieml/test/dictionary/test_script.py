@@ -1,13 +1,70 @@
+import gc
+import pickle
+import random
+import re
 import unittest
+from functools import cmp_to_key
+from operator import attrgetter
 
-from ieml.exceptions import TooManySingularSequences
+import pygit2
+
+from ieml.exceptions import TooManySingularSequences, CannotParse, InvalidScript
 from ieml.dictionary.script import script as sc, m
-from ieml.constants import AUXILIARY_CLASS, VERB_CLASS, NOUN_CLASS, PRIMITIVES
-from ieml.dictionary.script import MultiplicativeScript, AdditiveScript
+from ieml.constants import AUXILIARY_CLASS, VERB_CLASS, NOUN_CLASS, PRIMITIVES, character_value
+from ieml.dictionary.script import MultiplicativeScript, AdditiveScript, NullScript
+from ieml.dictionary.script.parser import ScriptParser
+from ieml.dictionary.script.script import _interned, _unpickle_script
+from ieml.ieml_database import IEMLDatabase, GitInterface
+from ieml.test.dictionary.test_fast_script_parser import _random_script
+from ieml.usl import constants
 
 scripts = list(map(sc, ["O:.E:M:.-"]))
 
 
+def _legacy_lt(self, other):
+    # the comparison of the scripts before the sort keys
+    if self == other:
+        return False
+
+    if self.layer != other.layer:
+        return self.layer < other.layer
+
+    if isinstance(self, NullScript):
+        return True
+    if isinstance(other, NullScript):
+        return False
+
+    if self.cardinal != other.cardinal:
+        return self.cardinal < other.cardinal
+
+    if self.canonical != other.canonical:
+        return self.canonical < other.canonical
+
+    if self.layer != 0:
+        if isinstance(self, other.__class__):
+            iterator = iter(other.children)
+            for s in self.children:
+                try:
+                    o = iterator.__next__()
+                    if o != s:
+                        return _legacy_lt(s, o)
+                except StopIteration:
+                    return False
+            return True
+        return isinstance(self, MultiplicativeScript)
+
+    def value(s):
+        if isinstance(s, AdditiveScript):
+            return sum(character_value[c.character] for c in s.children)
+        return character_value[s.character]
+
+    return value(self) < value(other)
+
+
+def _legacy_sorted(scripts):
+    return sorted(scripts, key=cmp_to_key(lambda a, b: -1 if _legacy_lt(a, b) else (1 if _legacy_lt(b, a) else 0)))
+
+
 class TestScript(unittest.TestCase):
     def test_factorisation(self):
         s = sc("E:.-T:.n.+f.-+U:.n.+S:+T:S:.-l.-'")
@@ -50,4 +107,92 @@ class TestScript(unittest.TestCase):
 
     def test_str(self):
         self.assertIsNotNone(MultiplicativeScript(character='A')._str)
-        self.assertIsNotNone(AdditiveScript(character='O')._str)
\ No newline at end of file
+        self.assertIsNotNone(AdditiveScript(character='O')._str)
+
+    def test_interned(self):
+        s = "s.-S:.U:.-'l.-S:.O:.-'n.-T:.A:.-',+M:.-'M:.-'n.-T:.A:.-',"
+        self.assertIs(sc(s), ScriptParser().ply_parse(s))
+        self.assertIs(m(substance=sc('wa.'), attribute=sc('u.'), mode=sc('O:.')), sc('wa.u.O:.-'))
+        self.assertIs(sc('wa.') + sc('u.'), sc('wa.+u.'))
+
+        # a single child addition is equal to its child
+        self.assertEqual(AdditiveScript(children=[sc('wa.')]), sc('wa.'))
+        self.assertEqual(sc('wa.'), 'wa.')
+        self.assertNotEqual(sc('wa.'), sc('u.'))
+
+    def test_pickle_interned(self):
+        s = sc("M:M:.o.-M:M:.o.-E:.-+s.u.-'")
+        data = pickle.dumps(s)
+        singular_sequences, cells, children = s.singular_sequences, s.cells, s.children
+        self.assertIs(pickle.loads(data), s)
+        # the attributes of a script alive are kept
+        self.assertIs(s._singular_sequences, singular_sequences)
+        self.assertIs(s._cells, cells)
+        self.assertIs(s.children, children)
+
+        # unpickled while the script is not alive
+        s = sc("t.i.-s.i.-'u.T:.-U:.-'O:O:.-',B:.-',_M:.-',_;")
+        data, cardinal = pickle.dumps(s), s.cardinal
+        del s
+        ScriptParser().parse.cache_clear()
+        gc.collect()
+        s = pickle.loads(data)
+        self.assertIs(s, sc(str(s)))
+        self.assertEqual(s.cardinal, cardinal)
+        self.assertTrue(all(ss is sc(str(ss)) for ss in s.singular_sequences))
+
+    def test_unpickle_published_once_initialized(self):
+        s = sc("M:M:.o.-M:M:.o.-E:.-+s.u.-'")
+        state, string, cls = s.__getstate__(), str(s), s.__class__
+        del s
+        ScriptParser().parse.cache_clear()
+        gc.collect()
+
+        s = _unpickle_script(cls, string)
+        self.assertNotIn((cls, string), _interned)
+        s.__setstate__(state)
+        self.assertIs(_interned[(cls, string)], s)
+        self.assertIs(sc(string), s)
+
+    def test_sort_key(self):
+        rng = random.Random(0)
+        strings = set(re.findall(r"script\(['\"](.+?)['\"]\)", open(constants.__file__).read()))
+        strings.update(_random_script(rng, rng.randint(0, 4)) for _ in range(1000))
+
+        _scripts = set()
+        for s in strings:
+            try:
+                s = sc(s)
+                # the tables of some random paradigms can't be built
+                _scripts.update(s.tables_script)
+            except (CannotParse, InvalidScript, TooManySingularSequences, ValueError, KeyError):
+                continue
+            _scripts.add(s)
+            _scripts.update(s.singular_sequences[:20])
+        _scripts = list(_scripts)
+        self.assertGreater(len(_scripts), 1000)
+
+        by_layer = {}
+        for s in _scripts:
+            by_layer.setdefault(s.layer, []).append(s)
+
+        for _ in range(20000):
+            a = rng.choice(_scripts)
+            b = rng.choice(by_layer[a.layer] if rng.random() < 0.8 else _scripts)
+            self.assertEqual(_legacy_lt(a, b), a.sort_key < b.sort_key, (str(a), str(b)))
+            self.assertEqual(_legacy_lt(a, b), a < b, (str(a), str(b)))
+
+        rng.shuffle(_scripts)
+        self.assertListEqual(sorted(_scripts, key=attrgetter('sort_key')), _legacy_sorted(_scripts))
+
+    def test_sort_key_dictionary(self):
+        try:
+            gitdb = GitInterface()
+        except pygit2.GitError as e:
+            self.skipTest("The ieml language repository is not available: {}".format(e))
+
+        dictionary = IEMLDatabase(folder=gitdb.folder).get_dictionary()
+        _scripts = list(dictionary.scripts)
+        random.Random(0).shuffle(_scripts)
+        self.assertListEqual(sorted(_scripts, key=attrgetter('sort_key')), _legacy_sorted(_scripts))
+        self.assertListEqual(list(dictionary.scripts), _legacy_sorted(_scripts))
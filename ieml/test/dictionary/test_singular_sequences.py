@@ -0,0 +1,119 @@
+import unittest
+
+import pandas
+
+from ieml.dictionary import Dictionary
+from ieml.dictionary import dictionary as dictionary_module
+from ieml.dictionary.script import script
+from ieml.dictionary.singular_sequences import SingularSequenceIndex, SingularSequenceMask
+from ieml.ieml_database.ieml_database import Structure
+
+
+def _dictionary_input(roots):
+    paradigms, rows = [], []
+    for x, y in roots:
+        root = "{}.{}.M:M:.-".format(x, y)
+        paradigms.append(root)
+        rows.append((root, 'is_root', 'True'))
+        for sub in ('M:S:.', 'M:B:.', 'S:M:.', 'T:M:.'):
+            paradigms.append("{}.{}.{}-".format(x, y, sub))
+        # out of the roots
+        paradigms.append("{}.{}.O:O:.-".format(x, y))
+
+    rows.append(("s.s.M:M:.-", 'inhibition', 'opposed'))
+    return paradigms, Structure(pandas.DataFrame(rows, columns=['ieml', 'key', 'value']))
+
+
+class SingularSequenceMaskTestCase(unittest.TestCase):
+    def test_operations(self):
+        a = SingularSequenceMask(3, 0b1011)
+        b = SingularSequenceMask(2, 0b110110)
+        self.assertEqual(a, SingularSequenceMask(0, 0b1011000))
+        self.assertEqual(len(a), 3)
+
+        self.assertTrue(a.issubset(b))
+        self.assertFalse(b.issubset(a))
+        self.assertFalse(a.isdisjoint(b))
+        self.assertTrue(SingularSequenceMask(0, 0b1).isdisjoint(b))
+        self.assertEqual(a | SingularSequenceMask(0, 0b1), SingularSequenceMask(0, 0b1011001))
+
+    def test_index(self):
+        roots = [script("s.M:M:.-"), script("b.M:M:.-")]
+        index = SingularSequenceIndex(roots)
+        self.assertEqual(len(index), 18)
+
+        for s in ["s.M:S:.-", "b.T:M:.-", "b.T:T:.-"]:
+            s = script(s)
+            self.assertEqual(index.root(s), [r for r in roots if s in r][0])
+            for r in roots:
+                self.assertEqual(index.contains(r, s), s in r)
+
+        self.assertFalse(index.covered(script("t.M:M:.-")))
+        self.assertIsNone(index.root(script("t.M:M:.-")))
+        self.assertFalse(index.contains(roots[0], script("s.")))
+
+        with self.assertRaises(ValueError):
+            SingularSequenceIndex(roots + [script("s.S:M:.-")])
+
+
+class DictionaryBitsetsTestCase(unittest.TestCase):
+    def test_same_dictionary(self):
+        paradigms, structure = _dictionary_input([(x, y) for x in 'sbt' for y in 'skm'])
+
+        expected = Dictionary(paradigms, structure, bitsets=False)
+        dictionary = Dictionary(paradigms, structure)
+        self.assertIsNone(expected.singular_sequence_index)
+        self.assertIsNotNone(dictionary.singular_sequence_index)
+
+        self.assertListEqual([str(s) for s in dictionary.scripts], [str(s) for s in expected.scripts])
+        self.assertNotIn(script("s.s.O:O:.-"), dictionary)
+        self.assertSetEqual(set(dictionary.tables.tables), set(expected.tables.tables))
+        self.assertDictEqual({str(r): sorted(str(t.script) for t in v) for r, v in dictionary.tables.roots.items()},
+                             {str(r): sorted(str(t.script) for t in v) for r, v in expected.tables.roots.items()})
+        for reltype, m in expected.relations.relations.items():
+            self.assertEqual((m != dictionary.relations.relations[reltype]).nnz, 0, reltype)
+
+    def test_overlap(self):
+        paradigms, structure = _dictionary_input([('s', 's')])
+        structure = Structure(pandas.concat([structure.df.reset_index(),
+                                             pandas.DataFrame([("s.s.M:S:.-", 'is_root', 'True')],
+                                                              columns=['ieml', 'key', 'value'])]))
+        for bitsets in (True, False):
+            with self.assertRaises(ValueError):
+                Dictionary(paradigms, structure, bitsets=bitsets)
+
+    def test_structure(self):
+        paradigms, structure = _dictionary_input([(x, y) for x in 'sb' for y in 'sk'])
+        rows = [("s.k.M:S:.-", 'is_ignored', 'True'), ("b.s.M:M:.-", 'is_root', 'False'),
+                ("s.s.M:M:.-", 'inhibition', 'twin'), ("t.t.M:M:.-", 'is_root', 'True')]
+        structure = Structure(pandas.concat([structure.df.reset_index(),
+                                             pandas.DataFrame(rows, columns=['ieml', 'key', 'value'])]))
+        for bitsets in (True, False):
+            dictionary = Dictionary(paradigms, structure, bitsets=bitsets)
+            self.assertNotIn(script("s.k.M:S:.-"), dictionary)
+            self.assertIn(script("s.k.S:M:.-"), dictionary)
+            self.assertIn(script("s.k.s.-"), dictionary)
+            self.assertNotIn(script("t.t.M:M:.-"), dictionary)
+            self.assertEqual(dictionary.roots_idx.sum(), 4)
+            self.assertListEqual(dictionary._inhibitions[script("s.s.M:M:.-")], ['opposed', 'twin'])
+            self.assertListEqual(list(dictionary.timings),
+                                 ['parse', 'structure', 'singular_sequences', 'ignored', 'tables', 'relations'])
+
+    def test_process_pool(self):
+        paradigms, structure = _dictionary_input([(x, y) for x in 'sbt' for y in 'skm'])
+        expected = Dictionary(paradigms, structure)
+
+        min_size = dictionary_module.LOAD_PARALLEL_MIN_SIZE
+        dictionary_module.LOAD_PARALLEL_MIN_SIZE = 0
+        try:
+            dictionary = Dictionary(paradigms, structure, workers=2)
+        finally:
+            dictionary_module.LOAD_PARALLEL_MIN_SIZE = min_size
+
+        self.assertListEqual(list(dictionary.scripts), list(expected.scripts))
+        self.assertDictEqual({r: sorted(str(t.script) for t in v) for r, v in dictionary.tables.roots.items()},
+                             {r: sorted(str(t.script) for t in v) for r, v in expected.tables.roots.items()})
+        for s in dictionary.scripts:
+            self.assertIs(dictionary.tables.tables[s].script if s in dictionary.tables else s, s)
+        for reltype, m in expected.relations.relations.items():
+            self.assertEqual((m != dictionary.relations.relations[reltype]).nnz, 0, reltype)
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ieml.constants import RELATIONS
+from ieml.dictionary.snapshot import DictionarySnapshot
+from ieml.ieml_database import IEMLDatabase
+from ieml.ieml_database.ieml_database import _publish_folder
+from ieml.test.database.utils import init_test_db
+
+
+class TestDictionarySnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.mkdtemp()
+        init_test_db(cls.folder)
+        cls.db = IEMLDatabase(cls.folder, use_cache=True)
+        cls.dictionary = cls.db.get_dictionary()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.folder)
+
+    def check_snapshot(self, snapshot):
+        d = self.dictionary
+        self.assertEqual(len(snapshot), len(d))
+        self.assertListEqual([snapshot.string(i) for i in range(len(snapshot))], [str(s) for s in d.scripts])
+        self.assertSetEqual({str(r) for r in snapshot.roots}, {str(r) for r in d.tables.roots})
+
+        for s in d.scripts:
+            for reltype in RELATIONS:
+                self.assertListEqual(snapshot.object_strings(s, reltype),
+                                     [str(o) for o in d.relations.object(s, reltype)])
+
+            table = d.tables.tables[s]
+            self.assertEqual(snapshot.rank(s), table.rank)
+            self.assertEqual(snapshot.root(s), d.tables.table_to_root[table])
+            self.assertEqual(snapshot.parent(s), table.parent.script if table.parent is not None else None)
+
+    def test_from_dictionary(self):
+        self.check_snapshot(DictionarySnapshot.from_dictionary(self.dictionary))
+
+    def test_mmap(self):
+        snapshot = self.db.get_dictionary_snapshot()
+        self.assertIn('O:B:.', snapshot.object_strings('O:M:.', 'contains'))
+        self.assertEqual(snapshot.rank('O:B:.'), self.dictionary.tables.tables[self.dictionary['O:B:.']].rank)
+        # no script was parsed to answer the queries
+        self.assertEqual(snapshot.scripts._scripts.count(None), len(snapshot))
+
+        self.check_snapshot(snapshot)
+        # the second call reuses the snapshot files
+        self.assertEqual(len(self.db.get_dictionary_snapshot()), len(snapshot))
+
+    def test_published_by_other_process(self):
+        parent = tempfile.mkdtemp()
+        folder = os.path.join(parent, 'snapshot')
+        DictionarySnapshot.from_dictionary(self.dictionary).save(folder)
+
+        # the folder is already there when the one of this process is moved, it is kept
+        _publish_folder(folder, DictionarySnapshot.from_dictionary(self.dictionary).save)
+        self.check_snapshot(DictionarySnapshot.load(folder))
+        self.assertListEqual(os.listdir(parent), ['snapshot'])
+        shutil.rmtree(parent)
@@ -0,0 +1,86 @@
+import gc
+import unittest
+
+from ieml.exceptions import CannotParse
+from ieml.usl.parser import IEMLParser
+from ieml.usl.parser.cache import ParseCache
+
+DECORATED = """[! E:A:.  ()(b.-S:.A:.-'S:.-'S:.-',) > E:A:. E:A:. ()(k.a.-k.a.-')] [>role>E:A:. E:A:.>content>constant>k.a.-k.a.-' "test"]"""
+
+
+class AllMorphemes:
+    def __contains__(self, item):
+        return True
+
+
+class ParseCacheTestCase(unittest.TestCase):
+    def test_hits(self):
+        cache = ParseCache()
+        parser = IEMLParser(cache=cache)
+
+        u = parser.parse("o. m1(U: S:) m2(t. m.)")
+        self.assertIs(IEMLParser(cache=cache).parse("o. m1(U: S:) m2(t. m.)"), u)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+        # other keys
+        parser.parse("o. m1(U: S:) m2(t. m.)", factorize_script=True)
+        IEMLParser(dictionary=AllMorphemes(), cache=cache).parse("o. m1(U: S:) m2(t. m.)")
+        self.assertEqual(len(cache), 3)
+
+        # the errors are not cached
+        for _ in range(2):
+            with self.assertRaises(CannotParse):
+                parser.parse("U: wa. m1()")
+        self.assertEqual(len(cache), 3)
+
+    def test_decorations(self):
+        cache = ParseCache()
+        parser = IEMLParser(cache=cache)
+        u = parser.parse(DECORATED)
+        decorated = parser.parse(DECORATED.replace('"test"', '"other"'))
+
+        # the shared components are not modified by the other decorations
+        self.assertIs(parser.parse(DECORATED), u)
+        self.assertEqual(str(u), DECORATED)
+        self.assertEqual(u.decorations[0].value, 'test')
+        self.assertEqual(decorated.decorations[0].value, 'other')
+
+    def test_frozen(self):
+        cache = ParseCache()
+        u = IEMLParser(cache=cache).parse("o. m1(U: S:) m2(t. m.)")
+        self.assertTrue(u.frozen)
+        with self.assertRaises(AttributeError):
+            u.grammatical_class = None
+        with self.assertRaises(AttributeError):
+            u.constant = ()
+
+        # the components and the lazily computed attributes
+        pm = IEMLParser(cache=cache).parse("[! E:A:.  ()(b.-S:.A:.-'S:.-'S:.-',) > E:A:. E:A:. ()(k.a.-k.a.-')]")
+        self.assertTrue(pm.syntagmatic_fun.frozen)
+        self.assertEqual(pm.cardinal, 1)
+
+        self.assertFalse(IEMLParser(cache=None).parse("o. m1(U: S:) m2(t. m.)").frozen)
+
+    def test_eviction(self):
+        strings = ["U: wo. wa.", "U: m2(wo. wa.)", "m1(U:) m1(S:)"]
+        cache = ParseCache(max_bytes=sum(ParseCache.size(s) for s in strings[1:]))
+        parser = IEMLParser(cache=cache)
+        for s in strings:
+            parser.parse(s)
+
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.bytes, cache.max_bytes)
+        self.assertIsNone(cache.get(strings[0], False, None))
+        self.assertIsNotNone(cache.get(strings[2], False, None))
+
+    def test_dictionary_collected(self):
+        cache = ParseCache()
+        dictionary = AllMorphemes()
+        IEMLParser(dictionary=dictionary, cache=cache).parse("U: wo. wa.")
+        self.assertEqual(len(cache), 1)
+
+        del dictionary
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
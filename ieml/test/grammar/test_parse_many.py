@@ -0,0 +1,58 @@
+import unittest
+
+from ieml.exceptions import CannotParse
+from ieml.usl.parser import IEMLParser, parser as parser_module
+from ieml.usl.parser.cache import ParseCache
+
+STRINGS = ["U: wo. wa.", "U: m2(wo. wa.)", "U: wa. m1()", "m1(U:) m1(S:)", "U: wo. wa.", "", "U: wa. m1()",
+           "o. m1(U: S:) m2(t. m.)"]
+
+
+class ParseManyTestCase(unittest.TestCase):
+    def check(self, results):
+        self.assertEqual(len(results), len(STRINGS))
+        for s, res in zip(STRINGS, results):
+            if s == "U: wa. m1()":
+                self.assertIsInstance(res, CannotParse)
+                self.assertEqual(res.s, s)
+            else:
+                self.assertEqual(str(res), str(IEMLParser(cache=None).parse(s)))
+
+    def test_sequential(self):
+        cache = ParseCache()
+        parser = IEMLParser(cache=cache)
+        parser.parse("m1(U:) m1(S:)")
+
+        results = parser.parse_many(STRINGS, workers=1, on_error='return')
+        self.check(results)
+
+        # the repeated strings are the same objects, the cached string is not parsed again
+        self.assertIs(results[0], results[4])
+        self.assertIs(results[3], cache.get("m1(U:) m1(S:)", False, None))
+        self.assertEqual(len(cache), 4)
+
+    def test_on_error(self):
+        parser = IEMLParser(cache=ParseCache())
+        with self.assertRaises(CannotParse):
+            parser.parse_many(STRINGS, workers=1)
+
+        results = parser.parse_many(STRINGS, workers=1, on_error='ignore')
+        self.assertIsNone(results[2])
+        self.assertEqual(str(results[0]), "U: wo. wa.")
+
+        with self.assertRaises(ValueError):
+            parser.parse_many(STRINGS, on_error='skip')
+
+    def test_process_pool(self):
+        min_size = parser_module.PARSE_MANY_PARALLEL_MIN_SIZE
+        parser_module.PARSE_MANY_PARALLEL_MIN_SIZE = 0
+        try:
+            cache = ParseCache()
+            parser = IEMLParser(cache=cache)
+            results = parser.parse_many(STRINGS, workers=2, on_error='return')
+            self.check(results)
+
+            self.assertIs(results[0], cache.get("U: wo. wa.", False, None))
+            self.assertEqual(len(cache), 4)
+        finally:
+            parser_module.PARSE_MANY_PARALLEL_MIN_SIZE = min_size
@@ -0,0 +1,26 @@
+import unittest
+
+from ieml.commons import ply_tables_up_to_date
+from ieml.dictionary.script.parser import parser as script_parser
+from ieml.usl.decoration.parser import parser as path_parser
+from ieml.usl.parser import parser as ieml_parser, default_parser
+
+
+class ParserTablesTestCase(unittest.TestCase):
+    def test_tables_up_to_date(self):
+        # regenerate them with scripts/build_parser_tables.py
+        for parser, start, tabmodule in [(script_parser.ScriptParser(), 'term', script_parser.TABLES_MODULE),
+                                         (ieml_parser.IEMLParser(), 'proposition', ieml_parser.TABLES_MODULE),
+                                         (path_parser.PathParser(), 'path', path_parser.TABLES_MODULE)]:
+            self.assertTrue(ply_tables_up_to_date(parser, start, tabmodule), tabmodule)
+
+    def test_lazy_construction(self):
+        parser = ieml_parser.IEMLParser(cache=None)
+        self.assertIsNone(parser._ply._local)
+
+        self.assertEqual(str(parser.parse("U: wo. wa.")), "U: wo. wa.")
+        self.assertIsNotNone(parser._ply._local)
+
+    def test_default_parser(self):
+        self.assertIs(default_parser(), default_parser())
+        self.assertIsNone(default_parser().dictionary)
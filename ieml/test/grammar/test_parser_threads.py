@@ -0,0 +1,58 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from ieml.dictionary.script.parser import ScriptParser
+from ieml.exceptions import CannotParse
+from ieml.usl.decoration.parser.parser import PathParser
+from ieml.usl.parser import IEMLParser
+
+USLS = [
+    "U: wo. wa.",
+    "U: m2(wo. wa.)",
+    "m1(U:) m1(S:)",
+    "o. m1(U: S:) m2(t. m.)",
+    "o. m2(A: S: B: T:) m2(y. t.)",
+    """[! E:A:.  ()(b.-S:.A:.-'S:.-'S:.-',) > E:A:. E:A:. ()(k.a.-k.a.-')] [>role>E:A:. E:A:.>content>constant>k.a.-k.a.-' "test"]""",
+    "U: wa. m1()",
+]
+
+PATHS = [
+    ">E:S:.-U:.-t.o.-'",
+    ">role>E:A:. E:A:.",
+    ">role>E:A:. E:A:.>content>constant>k.a.-k.a.-'",
+]
+
+
+def _parse(parser, s, **kwargs):
+    try:
+        return str(parser.parse(s, **kwargs))
+    except CannotParse:
+        return None
+
+
+class ParserThreadsTestCase(unittest.TestCase):
+    def _check_concurrent(self, parse, inputs):
+        expected = [parse(s) for s in inputs]
+
+        jobs = inputs * 50
+        with ThreadPoolExecutor(8) as pool:
+            res = list(pool.map(parse, jobs))
+
+        self.assertListEqual(res, expected * 50)
+
+    def test_iemlparser(self):
+        parser = IEMLParser()
+        self._check_concurrent(lambda s: _parse(parser, s), USLS)
+        self._check_concurrent(lambda s: _parse(parser, s, factorize_script=True), USLS)
+
+    def test_script_parser(self):
+        parser = ScriptParser()
+        # bypass the lru cache and the fast parser of parse
+        self._check_concurrent(lambda s: str(parser.ply_parse(s)),
+                               ["s.-S:.U:.-'l.-S:.O:.-'n.-T:.A:.-',+M:.-'M:.-'n.-T:.A:.-',",
+                                "t.i.-s.i.-'u.T:.-U:.-'O:O:.-',B:.-',_M:.-',_;",
+                                "O:M:.", "wa."])
+
+    def test_path_parser(self):
+        parser = PathParser()
+        self._check_concurrent(lambda s: _parse(parser, s), PATHS)
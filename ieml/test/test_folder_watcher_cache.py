@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ieml import commons
+from ieml.commons import FolderWatcherCache
+
+
+class TestFolderWatcherCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache_folder = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.folder, 'morpheme'))
+        for i in range(10):
+            self.write(i, 'content {}'.format(i))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+        shutil.rmtree(self.cache_folder)
+
+    def write(self, i, content):
+        with open(os.path.join(self.folder, 'morpheme', '{}.desc'.format(i)), 'w') as fp:
+            fp.write(content)
+
+    def cache(self, mode=FolderWatcherCache.STAT):
+        return FolderWatcherCache(self.folder, 'morpheme/*', cache_folder=self.cache_folder, name='test', mode=mode)
+
+    def test_pruned(self):
+        cache = self.cache()
+        self.assertTrue(cache.is_pruned())
+        cache.update([1, 2])
+
+        cache = self.cache()
+        self.assertFalse(cache.is_pruned())
+        self.assertListEqual(cache.get(), [1, 2])
+
+        self.write(3, 'modified')
+        self.assertTrue(self.cache().is_pruned())
+
+    def test_modes(self):
+        self.assertEqual(self.cache().cache_file, self.cache(FolderWatcherCache.CONTENT).cache_file)
+        self.write(3, 'modified')
+        self.assertEqual(self.cache().cache_file, self.cache(FolderWatcherCache.CONTENT).cache_file)
+
+    def test_stat_manifest(self):
+        self.cache().update(None)
+
+        with mock.patch.object(commons, '_md5_file', wraps=commons._md5_file) as md5:
+            cache = self.cache()
+            self.assertFalse(cache.is_pruned())
+            cache.get()
+            self.assertEqual(md5.call_count, 0)
+
+            self.write(3, 'modified')
+            self.assertTrue(self.cache().is_pruned())
+            self.assertEqual(md5.call_count, 1)
@@ -1,14 +1,18 @@
+import threading
 from typing import List
 
-from ieml.commons import DecoratedComponent
+from ieml.commons import DecoratedComponent, FreezableComponent
 from ieml.dictionary.script import Script
 from ieml.usl import USL
 from ieml.usl.decoration.path import UslPath, FlexionPath
 
 
-class LiteralContext:
+# the literals set on the usl components while an InstancedUSL is built, each thread has its own context
+class LiteralContext(threading.local):
 	def __init__(self):
 		self.stack = []
+		# id of a component -> (component, literal)
+		self.literals = {}
 
 	def __enter__(self):
 		self.stack = []
@@ -26,7 +30,7 @@ def literal_context():
 	return __literal_context
 
 
-class Decoration:
+class Decoration(FreezableComponent):
 	def __init__(self, path: UslPath, value):
 		self.path = path
 		self.value = value
@@ -1,9 +1,4 @@
-import logging
-import threading
-import os
-from ply.yacc import yacc
-
-from ieml.constants import PARSER_FOLDER
+from ieml.commons import Singleton, LazyPlyParser, build_ply_parser
 from ieml.dictionary.script import script
 from ieml.exceptions import CannotParse
 from ieml.usl.constants import ROLE_NAMES_TO_SCRIPT
@@ -13,30 +8,29 @@ from ieml.usl.decoration.path import UslPath, RolePath, LexemePath, Polymorpheme
 from ieml.usl.syntagmatic_function import SyntagmaticRole
 
 
-class PathParser:
+# the module of the parse tables, generated by scripts/build_parser_tables.py
+TABLES_MODULE = 'ieml.usl.decoration.parser.path_parsetab'
+
+
+class PathParser(metaclass=Singleton):
     tokens = tokens
-    lock = threading.Lock()
 
     def __init__(self):
-        # Build the lexer and parser
-        self.lexer = get_lexer()
-        self.parser = yacc(module=self, errorlog=logging, start='path',
-                                  # debug=True, debuglog=logging,
-                                  optimize=False,
-                                  picklefile=os.path.join(PARSER_FOLDER, "path_parser.pickle"))
+        # the lexer and parser are built at the first parse
+        self._ply = LazyPlyParser(lambda: (get_lexer(), build_ply_parser(self, 'path', TABLES_MODULE)))
 
     def parse(self, s):
         if not isinstance(s, str):
             s = str(s)
 
-        with self.lock:
-            try:
-                return self.parser.parse(s, lexer=self.lexer)
-            except ValueError as e:
-                raise CannotParse(s, str(e))
-            except CannotParse as e:
-                e.s = s
-                raise e
+        local = self._ply.local
+        try:
+            return local.parser.parse(s, lexer=local.lexer)
+        except ValueError as e:
+            raise CannotParse(s, str(e))
+        except CannotParse as e:
+            e.s = s
+            raise e
 
     def p_path(self, p):
         """path : SEPARATOR
@@ -0,0 +1,51 @@
+
+# path_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'pathEXCLAMATION_MARK LEXEME_POSITION MORPHEME MULTIPLICITY POLYMORPHEME_POSITION ROLE_MORPHEME ROLE_NAME ROLE_TOKEN SEPARATORpath : SEPARATOR\n                | SEPARATOR role_path\n                | SEPARATOR lexeme_path\n                | SEPARATOR flexion_path\n                | SEPARATOR polymorpheme_pathrole_path_list : role_path_list MORPHEME\n                            | MORPHEME\n                            | role_path_list ROLE_NAME\n                            | ROLE_NAMErole_path : ROLE_TOKEN SEPARATOR role_path_list\n                     | ROLE_TOKEN SEPARATOR EXCLAMATION_MARK role_path_list\n                     | ROLE_TOKEN SEPARATOR role_path_list SEPARATOR lexeme_path\n                     | ROLE_TOKEN SEPARATOR EXCLAMATION_MARK role_path_list SEPARATOR lexeme_pathlexeme_path : LEXEME_POSITION\n                        | LEXEME_POSITION SEPARATOR polymorpheme_path\n                        | LEXEME_POSITION SEPARATOR flexion_path flexion_path : MORPHEME polymorpheme_path : POLYMORPHEME_POSITION\n                             | POLYMORPHEME_POSITION MULTIPLICITY\n                             | POLYMORPHEME_POSITION SEPARATOR MORPHEME\n                             | POLYMORPHEME_POSITION MULTIPLICITY SEPARATOR MORPHEME'
+    
+_lr_action_items = {'SEPARATOR':([0,7,8,10,13,15,17,18,24,25,26,],[2,11,12,14,21,23,-7,-9,-6,-8,29,]),'$end':([1,2,3,4,5,6,8,9,10,13,15,17,18,19,20,22,24,25,26,27,28,30,],[0,-1,-2,-3,-4,-5,-14,-17,-18,-19,-10,-7,-9,-15,-16,-20,-6,-8,-11,-21,-12,-13,]),'ROLE_TOKEN':([2,],[7,]),'LEXEME_POSITION':([2,23,29,],[8,8,8,]),'MORPHEME':([2,11,12,14,15,16,17,18,21,24,25,26,],[9,17,9,22,24,17,-7,-9,27,-6,-8,24,]),'POLYMORPHEME_POSITION':([2,12,],[10,10,]),'MULTIPLICITY':([10,],[13,]),'EXCLAMATION_MARK':([11,],[16,]),'ROLE_NAME':([11,15,16,17,18,24,25,26,],[18,25,18,-7,-9,-6,-8,25,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'path':([0,],[1,]),'role_path':([2,],[3,]),'lexeme_path':([2,23,29,],[4,28,30,]),'flexion_path':([2,12,],[5,20,]),'polymorpheme_path':([2,12,],[6,19,]),'role_path_list':([11,16,],[15,26,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> path","S'",1,None,None,None),
+  ('path -> SEPARATOR','path',1,'p_path','parser.py',36),
+  ('path -> SEPARATOR role_path','path',2,'p_path','parser.py',37),
+  ('path -> SEPARATOR lexeme_path','path',2,'p_path','parser.py',38),
+  ('path -> SEPARATOR flexion_path','path',2,'p_path','parser.py',39),
+  ('path -> SEPARATOR polymorpheme_path','path',2,'p_path','parser.py',40),
+  ('role_path_list -> role_path_list MORPHEME','role_path_list',2,'p_role_path_list','parser.py',48),
+  ('role_path_list -> MORPHEME','role_path_list',1,'p_role_path_list','parser.py',49),
+  ('role_path_list -> role_path_list ROLE_NAME','role_path_list',2,'p_role_path_list','parser.py',50),
+  ('role_path_list -> ROLE_NAME','role_path_list',1,'p_role_path_list','parser.py',51),
+  ('role_path -> ROLE_TOKEN SEPARATOR role_path_list','role_path',3,'p_role_path','parser.py',70),
+  ('role_path -> ROLE_TOKEN SEPARATOR EXCLAMATION_MARK role_path_list','role_path',4,'p_role_path','parser.py',71),
+  ('role_path -> ROLE_TOKEN SEPARATOR role_path_list SEPARATOR lexeme_path','role_path',5,'p_role_path','parser.py',72),
+  ('role_path -> ROLE_TOKEN SEPARATOR EXCLAMATION_MARK role_path_list SEPARATOR lexeme_path','role_path',6,'p_role_path','parser.py',73),
+  ('lexeme_path -> LEXEME_POSITION','lexeme_path',1,'p_lexeme_path','parser.py',84),
+  ('lexeme_path -> LEXEME_POSITION SEPARATOR polymorpheme_path','lexeme_path',3,'p_lexeme_path','parser.py',85),
+  ('lexeme_path -> LEXEME_POSITION SEPARATOR flexion_path','lexeme_path',3,'p_lexeme_path','parser.py',86),
+  ('flexion_path -> MORPHEME','flexion_path',1,'p_flexion_path','parser.py',101),
+  ('polymorpheme_path -> POLYMORPHEME_POSITION','polymorpheme_path',1,'p_polymorpheme_path','parser.py',105),
+  ('polymorpheme_path -> POLYMORPHEME_POSITION MULTIPLICITY','polymorpheme_path',2,'p_polymorpheme_path','parser.py',106),
+  ('polymorpheme_path -> POLYMORPHEME_POSITION SEPARATOR MORPHEME','polymorpheme_path',3,'p_polymorpheme_path','parser.py',107),
+  ('polymorpheme_path -> POLYMORPHEME_POSITION MULTIPLICITY SEPARATOR MORPHEME','polymorpheme_path',4,'p_polymorpheme_path','parser.py',108),
+]
@@ -688,10 +688,10 @@ class RolePath(UslPath):
 # @monitor_decorator('usl_from_path_values')
 def usl_from_path_values(paths_values):
 	from ieml.usl.decoration.parser.parser import PathParser
-	from ieml.usl.parser import IEMLParser
+	from ieml.usl.parser import default_parser
 
 	path_parser = PathParser()
-	usl_parser = IEMLParser()
+	usl_parser = default_parser()
 
 	path_to_value = {path_parser.parse(p): set() for p, _ in paths_values}
 	for p, v in paths_values:
@@ -1 +1 @@
-from .parser import IEMLParser
\ No newline at end of file
+from .parser import IEMLParser, default_parser
\ No newline at end of file
@@ -0,0 +1,111 @@
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+from ieml.commons import FreezableComponent
+
+# default memory budget of the parse cache
+PARSE_CACHE_MAX_BYTES = 64 << 20
+# estimated memory of a parsed usl per character of its string, the usl objects are ~100 to 500 bytes per char
+PARSE_CACHE_BYTES_PER_CHAR = 512
+
+
+class ParseCache:
+    def __init__(self, max_bytes=PARSE_CACHE_MAX_BYTES):
+        """
+        LRU of the results of IEMLParser.parse, shared by all the parsers of the process, keyed by
+        (string, factorize_script, dictionary identity). The entries of a dictionary are dropped when the
+        dictionary is garbage collected.
+
+        The cached usls are shared by all the callers, as the Script objects of the ScriptParser cache: they are
+        frozen when they are put in the cache, and the literals of the decorations are not stored on the usl
+        components but in the literal context of the thread that builds an InstancedUSL.
+
+        :param max_bytes: the memory budget, the size of an entry is estimated from the length of its string
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (usl, size)
+        self._entries = OrderedDict()
+        # reentrant, the finalizer of a dictionary can run in a thread that holds the lock
+        self._lock = threading.RLock()
+        # id of the dictionaries with entries in the cache
+        self._dictionaries = set()
+
+    @staticmethod
+    def size(s: str) -> int:
+        return sys.getsizeof(s) + PARSE_CACHE_BYTES_PER_CHAR * len(s)
+
+    def get(self, s, factorize_script, dictionary):
+        """
+        :return: the cached usl, None if not in the cache
+        """
+        key = (s, factorize_script, id(dictionary) if dictionary is not None else None)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, s, factorize_script, dictionary, usl) -> None:
+        size = self.size(s)
+        if size > self.max_bytes:
+            return
+
+        if isinstance(usl, FreezableComponent):
+            usl.freeze()
+
+        dictionary_id = id(dictionary) if dictionary is not None else None
+        key = (s, factorize_script, dictionary_id)
+        with self._lock:
+            if dictionary_id is not None and dictionary_id not in self._dictionaries:
+                try:
+                    weakref.finalize(dictionary, self._drop_dictionary, dictionary_id)
+                except TypeError:
+                    # no weak reference, its entries could outlive it
+                    return
+                self._dictionaries.add(dictionary_id)
+
+            if key in self._entries:
+                return
+
+            self._entries[key] = (usl, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def _drop_dictionary(self, dictionary_id):
+        with self._lock:
+            self._dictionaries.discard(dictionary_id)
+            for key in [k for k in self._entries if k[2] == dictionary_id]:
+                _, size = self._entries.pop(key)
+                self.bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        :return: the number of hits, misses and entries and the estimated memory used
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self.bytes}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+parse_cache = ParseCache()
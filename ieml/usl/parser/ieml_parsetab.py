@@ -0,0 +1,64 @@
+
+# ieml_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'propositionDECORATION_VALUE EXCLAMATION_MARK GROUP_MULTIPLICITY LBRACKET LITERAL LPAREN MORPHEME OLD_MORPHEME_GRAMMATICAL_CLASS RBRACKET RCHEVRON RPAREN USL_PATHproposition :  morpheme\n                        | usl\n                        | instanced_usl\n                        usl :  poly_morpheme\n                | lexeme\n                | word\n                instanced_usl : usl decoration_listmorpheme : MORPHEMEmorpheme_sum : morpheme_sum morpheme\n                        | morpheme group : GROUP_MULTIPLICITY LPAREN morpheme_sum RPAREN  group_list : group group_list\n                       | group  poly_morpheme : morpheme_sum group_list\n                           | morpheme_sum\n                           | group_listlexeme : LPAREN poly_morpheme RPAREN LPAREN poly_morpheme RPAREN LPAREN poly_morpheme RPAREN\n                  | LPAREN RPAREN LPAREN poly_morpheme RPAREN LPAREN poly_morpheme RPAREN\n                  | LPAREN RPAREN LPAREN RPAREN LPAREN poly_morpheme RPAREN\n                  | LPAREN poly_morpheme RPAREN LPAREN poly_morpheme RPAREN\n                  | LPAREN RPAREN LPAREN poly_morpheme RPAREN\n                  | LPAREN poly_morpheme RPAREN\n                  | LPAREN RPARENpositioned_lexeme : morpheme_sum lexeme\n                             | lexemelexeme_list : lexeme_list RCHEVRON EXCLAMATION_MARK positioned_lexeme\n                       | lexeme_list RCHEVRON positioned_lexeme\n                       | EXCLAMATION_MARK positioned_lexeme\n                       | positioned_lexemeword : LBRACKET OLD_MORPHEME_GRAMMATICAL_CLASS lexeme_list RBRACKET\n                | LBRACKET lexeme_list RBRACKETdecoration_list : decoration_list decoration\n                            | decorationdecoration : LBRACKET USL_PATH DECORATION_VALUE RBRACKET'
+    
+_lr_action_items = {'MORPHEME':([0,2,5,9,11,12,19,22,23,25,27,30,34,37,40,42,46,51,56,57,],[5,-10,-8,5,5,5,-9,-10,5,5,5,5,5,5,5,5,5,5,5,5,]),'LPAREN':([0,5,12,14,19,21,22,23,25,27,33,37,43,46,52,54,],[11,-8,11,30,-9,34,-10,11,11,11,42,11,51,11,56,57,]),'LBRACKET':([0,2,3,5,6,7,8,9,10,13,15,16,18,19,21,29,31,33,36,45,48,49,52,54,58,61,62,],[12,-10,17,-8,-4,-5,-6,-15,-16,-13,17,-33,-14,-9,-23,-12,-32,-22,-31,-30,-11,-34,-21,-20,-19,-18,-17,]),'GROUP_MULTIPLICITY':([0,2,5,9,11,13,19,22,34,42,48,51,56,57,],[14,-10,-8,14,14,14,-9,-10,14,14,-11,14,14,14,]),'$end':([1,2,3,4,5,6,7,8,9,10,13,15,16,18,19,21,29,31,33,36,45,48,49,52,54,58,61,62,],[0,-1,-2,-3,-8,-4,-5,-6,-15,-16,-13,-7,-33,-14,-9,-23,-12,-32,-22,-31,-30,-11,-34,-21,-20,-19,-18,-17,]),'RPAREN':([5,9,10,11,13,18,19,20,22,29,34,40,44,48,50,55,59,60,],[-8,-15,-16,21,-13,-14,-9,33,-10,-12,43,48,52,-11,54,58,61,62,]),'OLD_MORPHEME_GRAMMATICAL_CLASS':([12,],[23,]),'EXCLAMATION_MARK':([12,23,37,],[25,25,46,]),'USL_PATH':([17,],[32,]),'RBRACKET':([21,24,26,28,33,35,38,39,41,47,52,53,54,58,61,62,],[-23,36,-29,-25,-22,45,-28,-24,49,-27,-21,-26,-20,-19,-18,-17,]),'RCHEVRON':([21,24,26,28,33,35,38,39,47,52,53,54,58,61,62,],[-23,37,-29,-25,-22,37,-28,-24,-27,-21,-26,-20,-19,-18,-17,]),'DECORATION_VALUE':([32,],[41,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'proposition':([0,],[1,]),'morpheme':([0,9,11,12,23,25,27,30,34,37,40,42,46,51,56,57,],[2,19,22,22,22,22,19,22,22,22,19,22,22,22,22,22,]),'usl':([0,],[3,]),'instanced_usl':([0,],[4,]),'poly_morpheme':([0,11,34,42,51,56,57,],[6,20,44,50,55,59,60,]),'lexeme':([0,12,23,25,27,37,46,],[7,28,28,28,39,28,28,]),'word':([0,],[8,]),'morpheme_sum':([0,11,12,23,25,30,34,37,42,46,51,56,57,],[9,9,27,27,27,40,9,27,9,27,9,9,9,]),'group_list':([0,9,11,13,34,42,51,56,57,],[10,18,10,29,10,10,10,10,10,]),'group':([0,9,11,13,34,42,51,56,57,],[13,13,13,13,13,13,13,13,13,]),'decoration_list':([3,],[15,]),'decoration':([3,15,],[16,31,]),'lexeme_list':([12,23,],[24,35,]),'positioned_lexeme':([12,23,25,37,46,],[26,26,38,47,53,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> proposition","S'",1,None,None,None),
+  ('proposition -> morpheme','proposition',1,'p_ieml_proposition','parser.py',183),
+  ('proposition -> usl','proposition',1,'p_ieml_proposition','parser.py',184),
+  ('proposition -> instanced_usl','proposition',1,'p_ieml_proposition','parser.py',185),
+  ('usl -> poly_morpheme','usl',1,'p_usl','parser.py',190),
+  ('usl -> lexeme','usl',1,'p_usl','parser.py',191),
+  ('usl -> word','usl',1,'p_usl','parser.py',192),
+  ('instanced_usl -> usl decoration_list','instanced_usl',2,'p_instanced_usl','parser.py',197),
+  ('morpheme -> MORPHEME','morpheme',1,'p_morpheme','parser.py',202),
+  ('morpheme_sum -> morpheme_sum morpheme','morpheme_sum',2,'p_morpheme_sum','parser.py',212),
+  ('morpheme_sum -> morpheme','morpheme_sum',1,'p_morpheme_sum','parser.py',213),
+  ('group -> GROUP_MULTIPLICITY LPAREN morpheme_sum RPAREN','group',4,'p_group','parser.py',221),
+  ('group_list -> group group_list','group_list',2,'p_group_list','parser.py',225),
+  ('group_list -> group','group_list',1,'p_group_list','parser.py',226),
+  ('poly_morpheme -> morpheme_sum group_list','poly_morpheme',2,'p_poly_morpheme','parser.py',233),
+  ('poly_morpheme -> morpheme_sum','poly_morpheme',1,'p_poly_morpheme','parser.py',234),
+  ('poly_morpheme -> group_list','poly_morpheme',1,'p_poly_morpheme','parser.py',235),
+  ('lexeme -> LPAREN poly_morpheme RPAREN LPAREN poly_morpheme RPAREN LPAREN poly_morpheme RPAREN','lexeme',9,'p_lexeme','parser.py',245),
+  ('lexeme -> LPAREN RPAREN LPAREN poly_morpheme RPAREN LPAREN poly_morpheme RPAREN','lexeme',8,'p_lexeme','parser.py',246),
+  ('lexeme -> LPAREN RPAREN LPAREN RPAREN LPAREN poly_morpheme RPAREN','lexeme',7,'p_lexeme','parser.py',247),
+  ('lexeme -> LPAREN poly_morpheme RPAREN LPAREN poly_morpheme RPAREN','lexeme',6,'p_lexeme','parser.py',248),
+  ('lexeme -> LPAREN RPAREN LPAREN poly_morpheme RPAREN','lexeme',5,'p_lexeme','parser.py',249),
+  ('lexeme -> LPAREN poly_morpheme RPAREN','lexeme',3,'p_lexeme','parser.py',250),
+  ('lexeme -> LPAREN RPAREN','lexeme',2,'p_lexeme','parser.py',251),
+  ('positioned_lexeme -> morpheme_sum lexeme','positioned_lexeme',2,'p_positioned_lexeme','parser.py',270),
+  ('positioned_lexeme -> lexeme','positioned_lexeme',1,'p_positioned_lexeme','parser.py',271),
+  ('lexeme_list -> lexeme_list RCHEVRON EXCLAMATION_MARK positioned_lexeme','lexeme_list',4,'p_lexeme_list','parser.py',278),
+  ('lexeme_list -> lexeme_list RCHEVRON positioned_lexeme','lexeme_list',3,'p_lexeme_list','parser.py',279),
+  ('lexeme_list -> EXCLAMATION_MARK positioned_lexeme','lexeme_list',2,'p_lexeme_list','parser.py',280),
+  ('lexeme_list -> positioned_lexeme','lexeme_list',1,'p_lexeme_list','parser.py',281),
+  ('word -> LBRACKET OLD_MORPHEME_GRAMMATICAL_CLASS lexeme_list RBRACKET','word',4,'p_word','parser.py',296),
+  ('word -> LBRACKET lexeme_list RBRACKET','word',3,'p_word','parser.py',297),
+  ('decoration_list -> decoration_list decoration','decoration_list',2,'p_decoration_list','parser.py',320),
+  ('decoration_list -> decoration','decoration_list',1,'p_decoration_list','parser.py',321),
+  ('decoration -> LBRACKET USL_PATH DECORATION_VALUE RBRACKET','decoration',4,'p_decoration','parser.py',330),
+]
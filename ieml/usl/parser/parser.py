@@ -1,19 +1,64 @@
-import logging, os
-import ply.yacc as yacc
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 
-from ieml.constants import PARSER_FOLDER
+from ieml.commons import LazyPlyParser, build_ply_parser
 from ieml.dictionary.script import script, Script, NullScript
 from ieml.usl import Word, PolyMorpheme, USL
 from ieml.exceptions import CannotParse
 from ieml.usl.word import Lexeme
 from ieml.usl.syntagmatic_function import SyntagmaticFunction, SyntagmaticRole
+from .cache import parse_cache
 from .lexer import get_lexer, tokens
-import threading
 
 from ..decoration.instance import Decoration, InstancedUSL
 from ..decoration.parser.parser import PathParser
 
 
+# the module of the parse tables, generated by scripts/build_parser_tables.py
+TABLES_MODULE = 'ieml.usl.parser.ieml_parsetab'
+
+# under this number of strings to parse, parse_many does not start a process pool
+PARSE_MANY_PARALLEL_MIN_SIZE = 2000
+
+# the parser of a parse_many worker
+_parse_worker = {}
+
+
+def _init_parse_worker(dictionary, factorize_script):
+    _parse_worker['parser'] = IEMLParser(dictionary=dictionary, cache=None)
+    _parse_worker['factorize_script'] = factorize_script
+
+
+def _parse_chunk(strings):
+    parser = _parse_worker['parser']
+    res = []
+    for s in strings:
+        try:
+            res.append(parser.parse(s, factorize_script=_parse_worker['factorize_script']))
+        except CannotParse as e:
+            res.append(e)
+    return res
+
+
+# the parser without dictionary shared by usl() and the database
+_default_parser = None
+_default_parser_lock = threading.Lock()
+
+
+def default_parser() -> 'IEMLParser':
+    """
+    :return: the IEMLParser without dictionary shared in the process, built at the first call
+    """
+    global _default_parser
+    if _default_parser is None:
+        with _default_parser_lock:
+            if _default_parser is None:
+                _default_parser = IEMLParser()
+    return _default_parser
+
+
 class IEMLParserSingleton(type):
     _instance = None
 
@@ -26,18 +71,19 @@ class IEMLParserSingleton(type):
 
 class IEMLParser():
     tokens = tokens
-    lock = threading.Lock()
-
-    def __init__(self, dictionary=None):
-        # Build the lexer and parser
-        self.lexer = get_lexer()
-        self.parser = yacc.yacc(module=self, errorlog=logging, start='proposition',
-                                # debug=True,
-                                optimize=False,
-                                picklefile=os.path.join(PARSER_FOLDER, "ieml_parser.pickle"))
+
+    def __init__(self, dictionary=None, cache=parse_cache):
+        """
+        :param dictionary: if set, the morphemes must be defined in this dictionary
+        :param cache: the ParseCache of the parsed usls, shared by default by all the parsers. None to disable.
+        """
+        # the lexer and parser are built at the first parse, then each thread parses with its own copy of them
+        # and its own parse options
+        self._ply = LazyPlyParser(lambda: (get_lexer(), build_ply_parser(self, 'proposition', TABLES_MODULE)))
         self._ieml = None
         self.path_parser = PathParser()
         self.dictionary = dictionary
+        self.cache = cache
 
     def parse(self, s, factorize_script=False):
         """Parses the input string, and returns a reference to the created AST's root"""
@@ -47,16 +93,90 @@ class IEMLParser():
         if isinstance(s, (USL, Script)):
             s = str(s)
 
-        with self.lock:
-            self.factorize_script = factorize_script
-            try:
-                return self.parser.parse(s, lexer=self.lexer)
-            except ValueError as e:
-                raise CannotParse(s, str(e))
-            except CannotParse as e:
-                e.s = s
-                raise e
+        if self.cache is not None:
+            res = self.cache.get(s, factorize_script, self.dictionary)
+            if res is not None:
+                return res
+
+        local = self._ply.local
+        local.factorize_script = factorize_script
+        try:
+            res = local.parser.parse(s, lexer=local.lexer)
+        except ValueError as e:
+            raise CannotParse(s, str(e))
+        except CannotParse as e:
+            e.s = s
+            raise e
+
+        if self.cache is not None:
+            self.cache.put(s, factorize_script, self.dictionary, res)
+        return res
+
+    def parse_many(self, strings, factorize_script=False, workers=None, on_error='raise'):
+        """
+        Parse a list of strings. The repeated strings are parsed once and the strings in the cache are not parsed
+        again, the others are parsed in a process pool and added to the cache.
+
+        :param strings: the strings to parse
+        :param factorize_script: as in parse
+        :param workers: the number of processes, default to the number of cpus. The strings are parsed in the
+        current process if workers is 1 or if there are only a few strings to parse.
+        :param on_error: 'raise' to raise the first CannotParse in the input order once all the strings are
+        parsed, 'return' to put the CannotParse in place of the result of the string, 'ignore' to put None.
+        :return: the list of the results, in the order of the input strings
+        """
+        if on_error not in ('raise', 'return', 'ignore'):
+            raise ValueError("Invalid on_error value {}, expected 'raise', 'return' or 'ignore'".format(on_error))
+
+        strings = [str(s) if isinstance(s, (USL, Script)) else s for s in strings]
+
+        parsed = {}
+        missing = []
+        for s in dict.fromkeys(strings):
+            res = None
+            if s == '':
+                res = NullScript(0)
+            elif self.cache is not None:
+                res = self.cache.get(s, factorize_script, self.dictionary)
+
+            if res is not None:
+                parsed[s] = res
+            else:
+                missing.append(s)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(missing) < PARSE_MANY_PARALLEL_MIN_SIZE:
+            results = []
+            for s in missing:
+                try:
+                    results.append(self.parse(s, factorize_script=factorize_script))
+                except CannotParse as e:
+                    results.append(e)
+        else:
+            chunk_size = -(-len(missing) // (workers * 4))
+            chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                                     initargs=(self.dictionary, factorize_script)) as executor:
+                results = list(chain.from_iterable(executor.map(_parse_chunk, chunks)))
+
+            if self.cache is not None:
+                for s, res in zip(missing, results):
+                    if not isinstance(res, CannotParse):
+                        self.cache.put(s, factorize_script, self.dictionary, res)
+
+        parsed.update(zip(missing, results))
+
+        res = [parsed[s] for s in strings]
+        if on_error == 'raise':
+            for r in res:
+                if isinstance(r, CannotParse):
+                    raise r
+        elif on_error == 'ignore':
+            res = [None if isinstance(r, CannotParse) else r for r in res]
 
+        return res
 
     # Parsing rules
     def p_ieml_proposition(self, p):
@@ -81,7 +201,7 @@ class IEMLParser():
     def p_morpheme(self, p):
         """morpheme : MORPHEME"""
 
-        morpheme = script(p[1], factorize=self.factorize_script)
+        morpheme = script(p[1], factorize=self._ply.local.factorize_script)
 
         if self.dictionary is not None and morpheme not in self.dictionary:
             raise ValueError("Morpheme {} not defined in dictionary".format(morpheme))
@@ -1,6 +1,7 @@
 from itertools import product, combinations, chain, count
 
 from collections import defaultdict
+from operator import attrgetter
 from typing import List
 
 from ieml.commons import LastUpdatedOrderedDict
@@ -12,6 +13,13 @@ from ieml.usl import USL
 from ieml.usl.variation import PolyMorphemeVariation
 
 
+_script_key = attrgetter('sort_key')
+
+
+def _group_key(group):
+    return tuple(s.sort_key for s in group[0]), group[1]
+
+
 def check_polymorpheme(ms):
     from ieml.usl.decoration.instance import InstancedUSL
     if isinstance(ms, InstancedUSL):
@@ -24,10 +32,10 @@ def check_polymorpheme(ms):
                and isinstance(g[1], int) for g in ms.groups):
         raise ValueError("A trait group must be made of a list of (Morpheme list, multiplicity)")
 
-    if sorted(ms.groups) != list(ms.groups):
+    if sorted(ms.groups, key=_group_key) != list(ms.groups):
         raise ValueError("Invalid ordering of the polymorpheme groups")
 
-    if any(sorted(g[0]) != list(g[0]) for g in ms.groups):
+    if any(sorted(g[0], key=_script_key) != list(g[0]) for g in ms.groups):
         raise ValueError("Invalid ordering of the morphemes in a polymorpheme groups")
 
     if any(g[0] and (int(g[1]) != g[1] or g[1] <= 0 or g[1] > POLYMORPHEME_MAX_MULTIPLICITY) for g in ms.groups):
@@ -36,7 +44,7 @@ def check_polymorpheme(ms):
     if any(g[0] and g[1] > len(g[0]) for g in ms.groups):
         raise ValueError("Multiplicity is greater than the number of morphemes in the group.")
 
-    if sorted(ms.constant) != list(ms.constant):
+    if sorted(ms.constant, key=_script_key) != list(ms.constant):
         raise ValueError("Invalid ordering of the polymorpheme constants")
 
     # compare the intersection except empty "E:"
@@ -154,9 +162,10 @@ class PolyMorpheme(USL):
     def __init__(self, constant: List[Script]=(), groups=()):
         super().__init__()
 
-        self.constant = tuple(sorted(_filter_empty(constant)))
+        self.constant = tuple(sorted(_filter_empty(constant), key=_script_key))
 
-        self.groups = tuple(sorted((tuple(sorted(_filter_empty(g[0]))), g[1]) for g in groups))
+        self.groups = tuple(sorted(((tuple(sorted(_filter_empty(g[0]), key=_script_key)), g[1]) for g in groups),
+                                   key=_group_key))
 
         # self.groups_paradigms = [PolyMorpheme(groups=[g]) for g in groups]
 
@@ -206,7 +215,7 @@ class PolyMorpheme(USL):
 
     @property
     def morphemes(self):
-        return sorted(set(list(self.constant) + [m for g in self.groups for m in g[0]]))
+        return sorted(set(list(self.constant) + [m for g in self.groups for m in g[0]]), key=_script_key)
 
     def _compute_singular_sequences(self):
         res = compute_PM_singular_sequences(self.constant, self.groups)
@@ -2,6 +2,7 @@ from collections import defaultdict
 from itertools import chain, product
 from typing import List, Any, Dict, Type, Tuple, Union
 
+from ieml.commons import FreezableComponent
 from ieml.dictionary.script import Script
 from ieml.usl import PolyMorpheme
 from ieml.usl.constants import SYNTAGMATIC_FUNCTION_SCRIPT, INDEPENDANT_QUALITY, DEPENDANT_QUALITY, ACTANTS_SCRIPTS, \
@@ -14,7 +15,7 @@ from ieml.usl.constants import SYNTAGMATIC_FUNCTION_SCRIPT, INDEPENDANT_QUALITY,
 X = Any
 
 
-class SyntagmaticRole:
+class SyntagmaticRole(FreezableComponent):
     def __init__(self, constant: List[Script]=()):
 
         self.constant = tuple(constant)
@@ -49,7 +50,7 @@ class SyntagmaticRole:
                  len(role.constant) == len(self.constant) + 2
 
 
-class SyntagmaticFunction:
+class SyntagmaticFunction(FreezableComponent):
     def __init__(self, actor: X, _actors: Dict[List[Script], 'SyntagmaticFunction']):
         self.actor = actor
         self.actors = {SyntagmaticRole(constant=role): f for role, f in _actors.items()}
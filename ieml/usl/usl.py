@@ -1,12 +1,14 @@
 from typing import Iterable, Tuple, Union, List, Set
 
-from ieml.commons import DecoratedComponent
+from ieml.commons import DecoratedComponent, FreezableComponent
 from ieml.dictionary.script import Script
 # from ieml.usl.decoration.path import UslPath
 
 
-class USL(DecoratedComponent):
+class USL(FreezableComponent, DecoratedComponent):
     syntactic_level = 0
+
+    LAZY_ATTRIBUTES = frozenset(('_singular_sequences', '_singular_sequences_set'))
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -120,8 +122,8 @@ def usl(arg: Union[str, Script, USL, Iterable[Tuple['UslPath', Union[USL, Script
     :return: an ieml.usl.usl.USL
     """
     if isinstance(arg, str):
-        from ieml.usl.parser import IEMLParser
-        return IEMLParser().parse(arg)
+        from ieml.usl.parser import default_parser
+        return default_parser().parse(arg)
 
     if isinstance(arg, Script):
         from ieml.usl import PolyMorpheme
@@ -0,0 +1,75 @@
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+from time import time
+
+import pandas
+from pandas.errors import EmptyDataError
+
+from ieml.ieml_database.loader import CONTENT_FOLDERS, read_descriptors
+
+# Compare the find | xargs cat | pandas.read_csv pipeline with the native loader of
+# ieml.ieml_database.loader on a synthetic database tree.
+
+
+def make_tree(folder, n_files):
+    for i in range(n_files):
+        type = CONTENT_FOLDERS[i % len(CONTENT_FOLDERS)]
+        ieml = "{}.-{}.-'".format(type, i)
+        p = os.path.join(folder, type, 'paradigm' if i % 3 else 'singular', str(i % 97))
+        os.makedirs(p, exist_ok=True)
+
+        with open(os.path.join(p, ieml + '.desc'), 'w', encoding='utf8') as fp:
+            fp.write('"{}" fr translations "traduction {}"\n'.format(ieml, i))
+            fp.write('"{}" en translations "translation {}"\n'.format(ieml, i))
+            fp.write('"{}" en comments "a ""quoted"" comment"\n'.format(ieml))
+
+
+def subprocess_descriptors(folder):
+    p1 = subprocess.Popen("find -path *.desc -print0".split(), stdout=subprocess.PIPE, cwd=folder)
+    p2 = subprocess.Popen("xargs -0 cat".split(), stdin=p1.stdout, stdout=subprocess.PIPE, cwd=folder)
+    try:
+        r = pandas.read_csv(p2.stdout, sep=' ', header=None)
+        r.columns = ['ieml', 'language', 'descriptor', 'value']
+    except EmptyDataError:
+        r = pandas.DataFrame(columns=['ieml', 'language', 'descriptor', 'value'])
+    return r
+
+
+def timeit(name, f, repeat):
+    best = None
+    for _ in range(repeat):
+        before = time()
+        res = f()
+        t = time() - before
+        best = t if best is None else min(best, t)
+
+    print("{:<30} {:>8.3f}s  ({} rows)".format(name, best, len(res)))
+    return res
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the descriptors loading")
+    parser.add_argument('--files', type=int, default=100000, help="number of synthetic .desc files")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--folder', default=None, help="use an existing database folder instead")
+    args = parser.parse_args()
+
+    folder = args.folder
+    if folder is None:
+        folder = tempfile.mkdtemp(prefix='ieml-bench-')
+        print("Generating {} files in {}".format(args.files, folder))
+        make_tree(folder, args.files)
+
+    try:
+        ref = timeit("subprocess + read_csv", lambda: subprocess_descriptors(folder), args.repeat)
+        timeit("native, 1 thread", lambda: read_descriptors(folder, workers=0), args.repeat)
+        timeit("native, thread pool", lambda: read_descriptors(folder), args.repeat)
+        res = timeit("native, process pool", lambda: read_descriptors(folder, processes=True), args.repeat)
+
+        assert len(ref) == len(res)
+    finally:
+        if args.folder is None:
+            shutil.rmtree(folder)
@@ -0,0 +1,74 @@
+import argparse
+import operator
+import random
+from collections import defaultdict
+from functools import reduce
+from time import time
+
+import pandas
+
+from ieml.constants import LANGUAGES, DESCRIPTORS_CLASS
+from ieml.ieml_database.descriptors import Descriptors
+
+# Compare the descriptor lookups on the pandas MultiIndex with the hash index of Descriptors.
+
+
+def pandas_get_values(df, ieml, language, descriptor):
+    try:
+        res = df.loc(axis=0)[(ieml, language, descriptor)]
+        if isinstance(res, pandas.Series):
+            return res.to_list()
+        else:
+            return res.to_dict('list')['value']
+    except KeyError:
+        return []
+
+
+def pandas_get_descriptor(df, ieml):
+    key = reduce(operator.and_, [df.index.get_level_values('ieml') == ieml], True)
+    res = {d: {l: [] for l in LANGUAGES} for d in DESCRIPTORS_CLASS}
+    values = defaultdict(list)
+    for (_, l, d), (v,) in df[key].iterrows():
+        values[(d, l)].append(v)
+    for (d, l), v in values.items():
+        res[d][l] = v
+    return res
+
+
+def make_descriptors(n):
+    rows = []
+    for i in range(n):
+        ieml = "s.-{}.-'".format(i)
+        rows.append((ieml, 'fr', 'translations', 'traduction {}'.format(i)))
+        rows.append((ieml, 'en', 'translations', 'translation {}'.format(i)))
+        rows.append((ieml, 'en', 'comments', 'comment {}'.format(i)))
+    return Descriptors(pandas.DataFrame(rows, columns=['ieml', 'language', 'descriptor', 'value']))
+
+
+def timeit(name, f, n):
+    before = time()
+    for _ in range(n):
+        f()
+    t = (time() - before) / n
+    print("{:<40} {:>10.1f}us".format(name, t * 1e6))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the descriptors lookups")
+    parser.add_argument('--iemls', type=int, default=50000)
+    parser.add_argument('--page', type=int, default=200, help="number of iemls fetched per page")
+    args = parser.parse_args()
+
+    desc = make_descriptors(args.iemls)
+    page = ["s.-{}.-'".format(random.randrange(args.iemls)) for _ in range(args.page)]
+
+    before = time()
+    desc.index
+    print("{:<40} {:>10.3f}s".format("index build", time() - before))
+
+    timeit("pandas get_values", lambda: pandas_get_values(desc.df, page[0], 'fr', 'translations'), 200)
+    timeit("indexed get_values", lambda: desc.get_values(page[0], 'fr', 'translations'), 200)
+    timeit("pandas get_descriptor", lambda: pandas_get_descriptor(desc.df, page[0]), 20)
+    timeit("indexed get_descriptor", lambda: desc.get_descriptor(page[0]), 200)
+    timeit("pandas page of {}".format(args.page), lambda: [pandas_get_descriptor(desc.df, i) for i in page], 1)
+    timeit("get_descriptors_bulk page of {}".format(args.page), lambda: desc.get_descriptors_bulk(page), 20)
@@ -0,0 +1,69 @@
+import argparse
+from time import time
+
+import pandas
+
+from ieml.dictionary import Dictionary
+from ieml.dictionary.script.parser import ScriptParser
+from ieml.ieml_database.ieml_database import Structure
+
+# Build time of a Dictionary on a synthetic set of root paradigms, with the sets of singular sequences of the scripts
+# against the bitsets of a SingularSequenceIndex. The script parse cache is cleared before each build. With --stages,
+# the Dictionary.timings of the fastest bitsets build are printed for each size. --workers sets the number of processes
+# of the bitsets builds.
+
+MULTIPLICATIONS = ['y', 'o', 'e', 'u', 'a', 'i', 'j', 'g', 's', 'b', 't', 'h', 'c', 'k', 'm', 'n', 'p', 'x', 'd',
+                   'f', 'l']
+
+
+def dictionary_input(n_roots):
+    paradigms, rows = [], []
+    for i in range(n_roots):
+        x, y = MULTIPLICATIONS[i // len(MULTIPLICATIONS) % len(MULTIPLICATIONS)], \
+               MULTIPLICATIONS[i % len(MULTIPLICATIONS)]
+        z = MULTIPLICATIONS[i // len(MULTIPLICATIONS) ** 2]
+        root = "{}.{}.M:M:.-{}.-'".format(x, y, z)
+        paradigms.append(root)
+        rows.append((root, 'is_root', 'True'))
+        for sub in ('M:S:.', 'M:B:.', 'M:T:.', 'S:M:.', 'B:M:.', 'T:M:.'):
+            paradigms.append("{}.{}.{}-{}.-'".format(x, y, sub, z))
+        # out of the roots
+        paradigms.append("{}.{}.O:O:.-{}.-'".format(x, y, z))
+
+    return paradigms, Structure(pandas.DataFrame(rows, columns=['ieml', 'key', 'value']))
+
+
+def timeit(paradigms, structure, bitsets, repeat, workers=1):
+    best, timings = None, None
+    for _ in range(repeat):
+        ScriptParser().parse.cache_clear()
+        before = time()
+        dictionary = Dictionary(paradigms, structure, bitsets=bitsets, workers=workers)
+        t = time() - before
+        if best is None or t < best:
+            best, timings = t, dictionary.timings
+    return best, timings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the construction of a Dictionary")
+    parser.add_argument('--roots', type=int, nargs='+', default=[100, 200, 400])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stages', action='store_true')
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    print("{:>8} {:>10} {:>10} {:>10}".format("roots", "scripts", "sets", "bitsets"))
+    stages = {}
+    for n in args.roots:
+        paradigms, structure = dictionary_input(n)
+        sets, _ = timeit(paradigms, structure, False, args.repeat)
+        bitsets, stages[n] = timeit(paradigms, structure, True, args.repeat, args.workers)
+        print("{:>8} {:>10} {:>9.3f}s {:>9.3f}s".format(n, len(paradigms), sets, bitsets))
+
+    if args.stages:
+        names = list(stages[args.roots[0]])
+        print()
+        print("{:>8} ".format("roots") + " ".join("{:>18}".format(name) for name in names))
+        for n in args.roots:
+            print("{:>8} ".format(n) + " ".join("{:>17.3f}s".format(stages[n][name]) for name in names))
@@ -0,0 +1,54 @@
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+from ieml.usl.parser import IEMLParser
+
+# Throughput of IEMLParser.parse with 1..N threads sharing a parser. Each thread parses with its own copy of the
+# ply lexer and parser, the global lock serialized all the threads on a single lexer and parser. The scaling is
+# bounded by the GIL on a standard CPython build and tracks the number of cores on a free threaded build.
+
+USLS = [
+    "U: wo. wa.",
+    "U: m2(wo. wa.)",
+    "m1(U:) m1(S:)",
+    "o. m1(U: S:) m2(t. m.)",
+    "o. m2(A: S: B: T:) m2(y. t.)",
+    "[! E:A:.  ()(b.-S:.A:.-'S:.-'S:.-',) > E:A:. E:A:. ()(k.a.-k.a.-')]",
+]
+
+
+def run(parser, threads, n, lock=None):
+    def work(_):
+        for s in USLS:
+            if lock is not None:
+                with lock:
+                    parser.parse(s)
+            else:
+                parser.parse(s)
+
+    before = time()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(work, range(n)))
+    return n * len(USLS) / (time() - before)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the concurrent parsing of usls")
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--n', type=int, default=500, help="number of times the examples are parsed")
+    args = parser.parse_args()
+
+    ieml_parser = IEMLParser()
+    # warm up the script cache
+    run(ieml_parser, 1, 1)
+
+    global_lock = threading.Lock()
+    print("{:>8} {:>16} {:>16}".format("threads", "global lock/s", "per thread/s"))
+    threads = 1
+    while threads <= args.threads:
+        print("{:>8} {:>16.0f} {:>16.0f}".format(threads,
+                                                 run(ieml_parser, threads, args.n, lock=global_lock),
+                                                 run(ieml_parser, threads, args.n)))
+        threads *= 2
@@ -0,0 +1,51 @@
+import argparse
+import gc
+import tracemalloc
+from time import time
+
+from ieml.dictionary import Dictionary
+from ieml.dictionary.script import Script
+from ieml.usl.parser import IEMLParser
+from scripts.benchmarks.dictionary_build import dictionary_input
+
+# Memory footprint of a synthetic Dictionary and of a list of polymorphemes parsed from its scripts: the memory
+# traced by tracemalloc, the number of Script objects alive and the number of distinct scripts among them.
+
+
+def usls(dictionary, n):
+    singulars = [str(s) for s in dictionary.scripts if len(s) == 1 and s.layer > 1]
+    return ["{} m1({} {})".format(singulars[i % len(singulars)], singulars[(7 * i + 1) % len(singulars)],
+                                  singulars[(13 * i + 2) % len(singulars)]) for i in range(n)]
+
+
+def scripts_alive():
+    scripts = [o for o in gc.get_objects() if isinstance(o, Script)]
+    return len(scripts), len({(type(s), str(s)) for s in scripts})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report the memory used by the scripts of a dictionary and usls")
+    parser.add_argument('--roots', type=int, default=200)
+    parser.add_argument('--usls', type=int, default=20000)
+    args = parser.parse_args()
+
+    paradigms, structure = dictionary_input(args.roots)
+
+    tracemalloc.start()
+    before = time()
+    dictionary = Dictionary(paradigms, structure)
+    built = time() - before
+    dictionary_memory, _ = tracemalloc.get_traced_memory()
+
+    # no usl parse cache, each string is parsed and kept
+    usl_parser = IEMLParser(cache=None)
+    parsed = [usl_parser.parse(s) for s in usls(dictionary, args.usls)]
+    total_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    alive, distinct = scripts_alive()
+    print("{:<28} {:>10.1f}s".format("dictionary build", built))
+    print("{:<28} {:>10.1f}MB".format("dictionary", dictionary_memory / 2 ** 20))
+    print("{:<28} {:>10.1f}MB".format("dictionary + {} usls".format(len(parsed)), total_memory / 2 ** 20))
+    print("{:<28} {:>10}".format("scripts alive", alive))
+    print("{:<28} {:>10}".format("distinct scripts", distinct))
@@ -0,0 +1,41 @@
+import argparse
+import random
+import re
+from time import time
+
+from ieml.dictionary.script.parser import ScriptParser, fast_parser
+from ieml.usl import constants
+
+# Throughput of the script parsing, ply parser against the hand written parser that ScriptParser tries first. The
+# ScriptParser lru cache is bypassed, each string is parsed from scratch.
+
+
+def scripts(n, seed=0):
+    rng = random.Random(seed)
+    known = sorted(set(re.findall(r"script\(['\"](.+?)['\"]\)", open(constants.__file__).read())))
+    res = []
+    while len(res) < n:
+        s = rng.choice(known)
+        if fast_parser.parse(s) is not None:
+            res.append(s)
+    return res
+
+
+def run(parse, strings):
+    before = time()
+    for s in strings:
+        parse(s)
+    return len(strings) / (time() - before)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the script parsers")
+    parser.add_argument('--n', type=int, default=20000, help="number of scripts parsed")
+    args = parser.parse_args()
+
+    strings = scripts(args.n)
+    script_parser = ScriptParser()
+
+    print("{:>8} {:>16}".format("parser", "scripts/s"))
+    print("{:>8} {:>16.0f}".format("ply", run(script_parser.ply_parse, strings)))
+    print("{:>8} {:>16.0f}".format("fast", run(fast_parser.parse, strings)))
@@ -0,0 +1,47 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Time from a cold interpreter to the first successful parse of a usl, with the parse tables loaded from the modules
+# shipped in the package, against tables generated at the start of the process (the table modules are made
+# unimportable, as with a fresh parser cache folder before the tables were shipped).
+
+PROGRAM = """
+import sys
+from time import perf_counter
+start = perf_counter()
+import ieml
+imported = perf_counter()
+if {generate}:
+    for m in {tables}:
+        sys.modules[m] = None
+from ieml.usl.usl import usl
+usl("[! E:A:.  ()(b.-S:.A:.-'S:.-'S:.-',) > E:A:. E:A:. ()(k.a.-k.a.-')]")
+print(imported - start, perf_counter() - start)
+"""
+
+
+TABLES = ['ieml.dictionary.script.parser.morpheme_parsetab', 'ieml.usl.parser.ieml_parsetab',
+          'ieml.usl.decoration.parser.path_parsetab']
+
+
+def run(generate, n):
+    imports, firsts = [], []
+    for _ in range(n):
+        out = subprocess.run([sys.executable, '-c', PROGRAM.format(generate=generate, tables=TABLES)], check=True,
+                             capture_output=True, text=True).stdout
+        i, f = map(float, out.split())
+        imports.append(i)
+        firsts.append(f)
+    return statistics.median(imports), statistics.median(firsts)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the time from import ieml to the first parse")
+    parser.add_argument('--n', type=int, default=5, help="number of runs, the median is reported")
+    args = parser.parse_args()
+
+    print("{:>20} {:>14} {:>20}".format("tables", "import ieml", "first parse"))
+    for name, generate in (("shipped", False), ("generated", True)):
+        print("{:>20} {:>13.3f}s {:>19.3f}s".format(name, *run(generate, args.n)))
@@ -0,0 +1,48 @@
+import argparse
+import importlib
+import os
+import sys
+
+from ieml.commons import build_ply_parser, ply_tables_up_to_date
+from ieml.dictionary.script.parser import parser as script_parser
+from ieml.usl.decoration.parser import parser as path_parser
+from ieml.usl.parser import parser as ieml_parser
+
+# Generate the LR tables of the script, usl and path parsers as python modules of the ieml package. The tables are
+# shipped with the package and loaded by the parsers instead of being generated at their first use. Run it after a
+# change of a grammar: the parsers generate their tables in memory at each start while the modules are outdated.
+
+PARSERS = [
+    (script_parser.ScriptParser, 'term', script_parser.TABLES_MODULE),
+    (ieml_parser.IEMLParser, 'proposition', ieml_parser.TABLES_MODULE),
+    (path_parser.PathParser, 'path', path_parser.TABLES_MODULE),
+]
+
+
+def table_file(tabmodule):
+    package, name = tabmodule.rsplit('.', 1)
+    return os.path.join(os.path.dirname(importlib.import_module(package).__file__), name + '.py')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate the parse tables of the ieml parsers")
+    parser.add_argument('--check', action='store_true', help="only check that the tables are up to date")
+    args = parser.parse_args()
+
+    outdated = [table_file(tabmodule) for cls, start, tabmodule in PARSERS
+                if not ply_tables_up_to_date(cls(), start, tabmodule)]
+
+    if args.check:
+        print("Outdated tables:", *outdated, sep='\n') if outdated else print("The tables are up to date")
+        sys.exit(1 if outdated else 0)
+
+    for cls, start, tabmodule in PARSERS:
+        path = table_file(tabmodule)
+        if path not in outdated:
+            continue
+
+        if os.path.isfile(path):
+            os.remove(path)
+        sys.modules.pop(tabmodule, None)
+        build_ply_parser(cls(), start, tabmodule, write_tables=True)
+        print("Generated", path)
@@ -8,33 +8,23 @@ with open(FILE) as fp:
     lines = fp.readlines()
 
 import re
-from ieml.usl.usl import usl
+from ieml.usl.parser import IEMLParser
 
 spliter = re.compile(r'^(\[.*\])\s*#\s*(.*)$')
 
 
-def process_line(l):
+def split_line(l):
     match = spliter.match(l)
     ieml, trans_fr = match.groups()
     ieml = ieml.replace('X', 'wa.')
+    return ieml, trans_fr
 
-    print(ieml, trans_fr)
-
-    try:
-        u = usl(ieml)
-    except Exception as e:
-        # print(e.args[0])
-        raise
-
-    check_word(u)
-    return str(u), trans_fr
 
+entries = [split_line(l) for l in lines if not l.startswith('//')]
+usls = IEMLParser().parse_many([ieml for ieml, _ in entries])
 
 with open(OUTFILE, 'w') as fp:
-    for l in tqdm(lines):
-        if l.startswith('//'):
-            continue
-        fp.write("{} # {}\n".format(*process_line(l)))
-
-
-
+    for u, (ieml, trans_fr) in tqdm(zip(usls, entries), total=len(entries)):
+        print(ieml, trans_fr)
+        check_word(u)
+        fp.write("{} # {}\n".format(str(u), trans_fr))